@@ -0,0 +1,73 @@
+import pickle
+import unittest
+
+from ufpy import AggregateStack, Stack
+
+
+class AggregateStackTestCase(unittest.TestCase):
+    def test_init(self):
+        s = AggregateStack(3, 1, 4, 1, 5)
+        self.assertEqual(s, Stack(3, 1, 4, 1, 5))
+        self.assertEqual((s.min(), s.max(), s.sum(), s.mean()), (1, 5, 14, 2.8))
+
+        e = AggregateStack()
+        self.assertEqual((e.min(), e.max(), e.sum(), e.mean()), (None, None, 0, None))
+        self.assertFalse(hasattr(e, '__dict__'))
+
+    def test_push_pop(self):
+        s = AggregateStack(2)
+        s.push(5, 1).push(1)
+        self.assertEqual((s.min(), s.max(), s.sum()), (1, 5, 9))
+        s.pop()
+        self.assertEqual(s.min(), 1)
+        s.pop()
+        self.assertEqual((s.min(), s.max(), s.sum()), (2, 5, 7))
+        s.pop()
+        self.assertEqual((s.min(), s.max(), s.mean()), (2, 2, 2))
+
+        with self.assertRaises(TypeError):
+            s.push(3, 'x')
+        self.assertEqual(s, Stack(2))
+        self.assertEqual(s.sum(), 2)
+
+    def test_top(self):
+        s = AggregateStack(3, 1, 4)
+        s.top = 0
+        self.assertEqual((s.min(), s.max(), s.sum()), (0, 3, 4))
+        del s.top
+        self.assertEqual((s.min(), s.max(), s.sum()), (1, 3, 4))
+
+        with self.assertRaises(TypeError):
+            s.top = 'x'
+        self.assertEqual(s, Stack(3, 1))
+
+    def test_other_changes(self):
+        s = AggregateStack(3, 1, 4, 1, 5)
+        s.remove(5)
+        s -= [1, 1]
+        self.assertEqual((s.min(), s.max(), s.sum()), (3, 4, 7))
+        s *= 2
+        self.assertEqual(s.max(), 8)
+        s.elements = [10, 20]
+        self.assertEqual(s.mean(), 15)
+        s.clear()
+        self.assertIsNone(s.max())
+
+        s = AggregateStack(1, 2)
+        self.assertEqual((s + 3).max(), 3)
+        self.assertEqual((s * 10).sum(), 30)
+        self.assertEqual((s / 2).max(), 1)
+        self.assertEqual(s.copy().min(), 1)
+        self.assertEqual(pickle.loads(pickle.dumps(s)).sum(), 3)
+
+    def test_typed(self):
+        s = AggregateStack(1, 2, typecode='d')
+        s.push(3)
+        self.assertEqual((s.max(), s.sum()), (3.0, 6.0))
+        with self.assertRaises(TypeError):
+            s.push('x')
+        self.assertEqual(len(s), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
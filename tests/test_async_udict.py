@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+from ufpy import AsyncUDict, UDict
+
+
+class AsyncUDictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def load(self, key):
+        self.calls.append(key)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if key == 'missing':
+            raise KeyError(key)
+        if key == 'error':
+            raise RuntimeError(key)
+        return f'value of {key}'
+
+    def test_init(self):
+        d = AsyncUDict(UDict(a=1), loader=self.load, default=0)
+        self.assertEqual(d, UDict(a=1))
+        self.assertEqual(d['b'], 0)
+        self.assertEqual(d.max_concurrency, 16)
+        self.assertEqual(repr(d), "au{'a': 1}")
+
+        with self.assertRaises(ValueError):
+            AsyncUDict(loader=self.load, max_concurrency=0)
+
+    def test_aget(self):
+        d = AsyncUDict(a=1, loader=self.load, default=0)
+
+        async def main():
+            self.assertEqual(await d.aget('a'), 1)
+            self.assertEqual(await d.aget(1), 'value of 1')
+            self.assertEqual(await d.aget('missing'), 0)
+            self.assertEqual(await d.aget('missing', 'default'), 'default')
+            with self.assertRaises(RuntimeError):
+                await d.aget('error')
+
+        asyncio.run(main())
+        self.assertEqual(d, {'a': 1, 1: 'value of 1'})
+        self.assertEqual(self.calls, [1, 'missing', 'missing', 'error'])
+        self.assertEqual(d.loading, [])
+
+    def test_single_flight(self):
+        d = AsyncUDict(loader=self.load)
+
+        async def main():
+            tasks = [asyncio.create_task(d.aget('k')) for _ in range(10)]
+            await asyncio.sleep(0)
+            tasks[0].cancel()
+            return await asyncio.gather(*tasks[1:])
+
+        self.assertEqual(asyncio.run(main()), ['value of k'] * 9)
+        self.assertEqual(self.calls, ['k'])
+
+    def test_aget_many(self):
+        d = AsyncUDict(a=1, loader=self.load, max_concurrency=3)
+        keys = ['a', 'missing', *range(10), 5, 'a']
+
+        values = asyncio.run(d.aget_many(keys))
+        self.assertEqual(values, [1, None, *(f'value of {i}' for i in range(10)), 'value of 5', 1])
+        self.assertEqual(sorted(self.calls, key=str), sorted(['missing', *range(10)], key=str))
+        self.assertEqual(self.max_running, 3)
+        self.assertEqual(asyncio.run(d.aget_many([1, 2])), ['value of 1', 'value of 2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+
+from ufpy import CacheUDict, UDict
+
+
+class FakeTimer:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class CacheUDictTestCase(unittest.TestCase):
+    def test_init(self):
+        d = CacheUDict(UDict(a=1, b=2, c=3), maxsize=2)
+        self.assertEqual(d, UDict(b=2, c=3))
+        self.assertEqual(d.evictions, 1)
+
+        with self.assertRaises(ValueError):
+            CacheUDict(maxsize=0)
+        with self.assertRaises(ValueError):
+            CacheUDict(policy='mru')
+        with self.assertRaises(ValueError):
+            CacheUDict(policy='ttl')
+
+    def test_lru(self):
+        evicted = []
+        d = CacheUDict(maxsize=2, on_evict=lambda k, v: evicted.append((k, v)))
+        d[1] = 'a'
+        d[2] = 'b'
+        self.assertEqual(d[1], 'a')
+        d[3] = 'c'
+
+        self.assertEqual(d.dictionary, {1: 'a', 3: 'c'})
+        self.assertEqual(evicted, [(2, 'b')])
+        self.assertEqual(d[2], None)
+        self.assertEqual((d.hits, d.misses, d.evictions), (1, 1, 1))
+
+    def test_lfu(self):
+        d = CacheUDict(maxsize=3, policy='lfu')
+        d['a'] = 1
+        d['b'] = 2
+        d['c'] = 3
+        for _ in range(3):
+            d.get(key='a')
+        d.get(key='c')
+
+        d['d'] = 4
+        self.assertEqual(d.keys, ['a', 'c', 'd'])
+        d['e'] = 5
+        self.assertEqual(d.keys, ['a', 'c', 'e'])
+
+        del d['c']
+        d['f'] = 6
+        d['g'] = 7
+        self.assertEqual(d.keys, ['a', 'f', 'g'])
+
+    def test_ttl(self):
+        timer = FakeTimer()
+        evicted = []
+        d = CacheUDict(
+            maxsize=2, policy='ttl', ttl=10, timer=timer, on_evict=lambda k, v: evicted.append(k), default='missing'
+        )
+        d['a'] = 1
+        timer.time = 5
+        d['b'] = 2
+        self.assertEqual(d['a'], 1)
+
+        timer.time = 8
+        d['c'] = 3
+        self.assertEqual(evicted, ['a'])
+
+        timer.time = 15
+        self.assertFalse('b' in d)
+        self.assertEqual(d['b'], 'missing')
+        self.assertEqual(d['c'], 3)
+        self.assertEqual(evicted, ['a', 'b'])
+
+        timer.time = 100
+        d['d'] = 4
+        self.assertEqual(d.dictionary, {'d': 4})
+
+    def test_udict_api(self):
+        d = CacheUDict(a=1, b=2, maxsize=3)
+        d += {'c': 3, 'd': 4}
+        self.assertEqual(d.keys, ['b', 'c', 'd'])
+        self.assertEqual(d[1:2], [2, 3])
+        self.assertEqual(d.get(index=3), 4)
+
+        d.dictionary = {'x': 1}
+        d['y'] = 2
+        d['z'] = 3
+        d['w'] = 4
+        self.assertEqual(d.keys, ['y', 'z', 'w'])
+        self.assertEqual(repr(d), "cu{'y': 2, 'z': 3, 'w': 4}")
+
+        d.values = [5]
+        self.assertEqual(d.items, [('y', 5)])
+        d['a'] = 1
+        d['b'] = 2
+        d['c'] = 3
+        self.assertEqual(d.keys, ['a', 'b', 'c'])
+
+    def test_bulk_operations(self):
+        for policy in ('lru', 'lfu'):
+            d = CacheUDict(a=1, b=2, maxsize=3, policy=policy)
+            d.update_many(['c', 'd'], [3, 4])
+            self.assertEqual(d.keys, ['b', 'c', 'd'])
+            d.update_many(UDict(e=5))
+            self.assertEqual(len(d), 3)
+
+            self.assertEqual(d.pop_many(['c']), [3])
+            self.assertEqual(d.pop_many(['x'], default=None), [None])
+            with self.assertRaises(KeyError):
+                d.pop_many(['x'])
+            d['f'] = 6
+            d['g'] = 7
+            self.assertEqual(len(d), 3)
+
+            self.assertEqual(d.setdefault_many(['f', 'h'], 8), [6, 8])
+            self.assertEqual(len(d), 3)
+            self.assertEqual(d['h'], 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full
+
+from ufpy import AsyncStack, ConcurrentStack
+from ufpy.ustl import Stack
+
+
+class ConcurrentStackTestCase(unittest.TestCase):
+    def test_init(self):
+        s = ConcurrentStack(1, 2, maxsize=3)
+        self.assertEqual(s.to_stack(), Stack(1, 2))
+        self.assertEqual(s.elements, [1, 2])
+        self.assertEqual(s.top, 2)
+        self.assertEqual(s.maxsize, 3)
+        self.assertEqual(len(s), 2)
+        self.assertIsNone(ConcurrentStack().top)
+
+        with self.assertRaises(ValueError):
+            ConcurrentStack(maxsize=-1)
+        with self.assertRaises(ValueError):
+            ConcurrentStack(1, 2, maxsize=1)
+
+    def test_push_pop(self):
+        s = ConcurrentStack()
+        s.push(1, 2).push_many(range(3, 6))
+        self.assertEqual(s.pop(), 5)
+        self.assertEqual(s.pop_many(3), [4, 3, 2])
+        self.assertEqual(s.pop_many(3), [1])
+        self.assertTrue(s.is_empty())
+
+        with self.assertRaises(Empty):
+            s.pop(block=False)
+        with self.assertRaises(Empty):
+            s.pop_many(2, timeout=0.01)
+        with self.assertRaises(ValueError):
+            s.pop_many(0)
+
+        threading.Timer(0.05, s.push, args=(7,)).start()
+        self.assertEqual(s.pop(timeout=5), 7)
+
+    def test_bounded(self):
+        s = ConcurrentStack(1, 2, maxsize=2)
+        self.assertTrue(s.is_full())
+        with self.assertRaises(Full):
+            s.push(3, block=False)
+        with self.assertRaises(Full):
+            s.push(3, timeout=0.01)
+
+        threading.Timer(0.05, s.pop).start()
+        s.push(3, timeout=5)
+        self.assertEqual(s.elements, [1, 3])
+
+        s.pop()
+        with self.assertRaises(Full):
+            s.push_many([4, 5], block=False)
+        self.assertEqual(s.elements, [1, 4])
+
+    def test_threads(self):
+        s = ConcurrentStack(maxsize=10)
+        n = 1000
+
+        def produce(k):
+            s.push_many(range(k * n, (k + 1) * n))
+
+        def consume(_):
+            return [s.pop(timeout=10) for _ in range(n)]
+
+        with ThreadPoolExecutor(8) as executor:
+            consumed = executor.map(consume, range(4))
+            list(executor.map(produce, range(4)))
+            values = sorted(v for c in consumed for v in c)
+        self.assertEqual(values, list(range(4 * n)))
+        self.assertTrue(s.is_empty())
+
+
+class AsyncStackTestCase(unittest.TestCase):
+    def test_push_pop(self):
+        async def main():
+            s = AsyncStack(1)
+            await s.push(2, 3)
+            self.assertEqual(await s.pop(), 3)
+            self.assertEqual(await s.pop_many(5), [2, 1])
+            self.assertEqual(s.to_stack(), Stack())
+
+            with self.assertRaises(asyncio.QueueEmpty):
+                s.pop_nowait()
+            with self.assertRaises(TimeoutError):
+                await s.pop(timeout=0.01)
+
+            task = asyncio.create_task(s.pop())
+            await asyncio.sleep(0)
+            s.push_nowait(4)
+            self.assertEqual(await task, 4)
+
+        asyncio.run(main())
+
+    def test_bounded(self):
+        async def main():
+            s = AsyncStack(maxsize=2)
+
+            async def consume():
+                return [await s.pop() for _ in range(5)]
+
+            task = asyncio.create_task(consume())
+            await s.push_many(range(5))
+            self.assertEqual(sorted(await task), [0, 1, 2, 3, 4])
+
+            s.push_nowait(1, 2)
+            self.assertTrue(s.is_full())
+            with self.assertRaises(asyncio.QueueFull):
+                s.push_nowait(3)
+            with self.assertRaises(TimeoutError):
+                await s.push(3, timeout=0.01)
+
+        asyncio.run(main())
+
+    def test_cancel(self):
+        async def main():
+            s = AsyncStack()
+            t1 = asyncio.create_task(s.pop())
+            t2 = asyncio.create_task(s.pop())
+            await asyncio.sleep(0)
+            s.push_nowait(1)
+            t1.cancel()
+            self.assertEqual(await t2, 1)
+
+        asyncio.run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
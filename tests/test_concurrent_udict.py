@@ -0,0 +1,60 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ufpy import ConcurrentUDict, UDict
+
+
+class ConcurrentUDictTestCase(unittest.TestCase):
+    def test_init(self):
+        d = ConcurrentUDict(UDict(a=1, b=2), shards=4)
+        d2 = ConcurrentUDict(a=1, b=2, default=0)
+
+        self.assertEqual(d, d2)
+        self.assertEqual(d, {'a': 1, 'b': 2})
+        self.assertEqual(d.shards, 4)
+        self.assertEqual(d2['c'], 0)
+        self.assertEqual(d.to_udict(), UDict(a=1, b=2))
+
+        with self.assertRaises(ValueError):
+            ConcurrentUDict(shards=0)
+
+    def test_get_set_del_item(self):
+        d = ConcurrentUDict()
+        d[1] = 'a'
+        d['b'] = 2
+        self.assertEqual(d[1], 'a')
+        self.assertEqual(d.get('c', 'missing'), 'missing')
+        self.assertTrue(('b', 2) in d)
+        self.assertEqual(len(d), 2)
+
+        del d[1]
+        self.assertEqual(d.pop('b'), 2)
+        self.assertEqual(d.pop('b', None), None)
+        self.assertTrue(d.is_empty())
+
+    def test_atomic_operations(self):
+        d = ConcurrentUDict(default=0)
+        self.assertEqual(d.get_or_set('a', 1), 1)
+        self.assertEqual(d.get_or_set('a', 2), 1)
+        self.assertEqual(d.compute('b', lambda k, v: v + 10), 10)
+
+        d.update_many({'c': 3, 'd': 4})
+        self.assertEqual(sorted(d.keys), ['a', 'b', 'c', 'd'])
+        d.clear()
+        self.assertEqual(len(d), 0)
+
+    def test_threads(self):
+        d = ConcurrentUDict(default=0, shards=4)
+
+        def work(i: int) -> None:
+            for _ in range(200):
+                d.compute(i % 8, lambda k, v: v + 1)
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(work, range(32)))
+
+        self.assertEqual(d.dictionary, {i: 800 for i in range(8)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import pickle
+import unittest
+from copy import copy
+
+from ufpy import FrozenStack
+from ufpy.ustl import Stack
+
+
+class FrozenStackTestCase(unittest.TestCase):
+    def test_init(self):
+        s = FrozenStack(1, 2, 3)
+        self.assertEqual(s.elements, [1, 2, 3])
+        self.assertEqual(s, FrozenStack(iterable=[1, 2, 3]))
+        self.assertEqual(s.top, 3)
+        self.assertEqual(len(s), 3)
+        self.assertEqual(list(s), [3, 2, 1])
+        self.assertEqual(Stack(1, 2, 3).freeze(), s)
+        self.assertEqual(s.to_stack(), Stack(1, 2, 3))
+        self.assertIsNone(FrozenStack().top)
+        self.assertFalse(hasattr(s, '__dict__'))
+
+    def test_versions(self):
+        s = FrozenStack(1, 2)
+        s2 = s.push(3, 4)
+        s3 = s2.pop()
+        self.assertEqual(s, FrozenStack(1, 2))
+        self.assertEqual(s2, FrozenStack(1, 2, 3, 4))
+        self.assertEqual(s3, FrozenStack(1, 2, 3))
+        self.assertEqual(s3.pop(), s)
+        self.assertEqual(s + [5], FrozenStack(1, 2, 5))
+        self.assertEqual(s + 5, FrozenStack(1, 2, 5))
+        self.assertTrue(s.clear().is_empty())
+        self.assertNotEqual(s, s3)
+
+        with self.assertRaises(IndexError):
+            FrozenStack().pop()
+
+        s4 = s
+        s4 += 3
+        self.assertEqual(s, FrozenStack(1, 2))
+
+    def test_hash_and_copy(self):
+        s = FrozenStack(1, 2)
+        self.assertEqual({s: 'a'}[FrozenStack(1).push(2)], 'a')
+        self.assertIs(copy(s), s)
+        self.assertIs(s.copy(), s)
+        self.assertEqual(pickle.loads(pickle.dumps(s)), s)
+
+        big = FrozenStack(iterable=range(100_000))
+        self.assertEqual(len(pickle.loads(pickle.dumps(big))), 100_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+from ufpy import NumericUDict, UDict
+
+
+class NumericUDictTestCase(unittest.TestCase):
+    def test_init(self):
+        d = NumericUDict(a=1, b=2, default=0)
+        d2 = NumericUDict({'a': 1, 'b': 2})
+        d3 = NumericUDict(UDict(a=1, b=2))
+
+        self.assertEqual(d.default, 0)
+        self.assertEqual(d, d2)
+        self.assertEqual(d, d3)
+        self.assertEqual(d, {'a': 1, 'b': 2})
+        self.assertEqual(d.to_udict(), UDict(a=1, b=2))
+        self.assertTrue(np.array_equal(d.array, [1, 2]))
+        self.assertEqual(NumericUDict(UDict(a=1, b=2) * 2), {'a': 2, 'b': 4})
+
+    def test_eq(self):
+        a = NumericUDict(a=1, b=2)
+        b = NumericUDict(b=2, a=1)
+        self.assertEqual(a, {'b': 2, 'a': 1})
+        self.assertEqual(a, b)
+        self.assertEqual(a, UDict(b=2, a=1))
+        self.assertNotEqual(a, NumericUDict(b=1, a=2))
+        self.assertNotEqual(a, NumericUDict(a=1, c=2))
+        self.assertNotEqual(a, NumericUDict(a=1))
+
+    def test_get_set_del_item(self):
+        d = NumericUDict(a=1, b=2, c=3)
+        self.assertEqual(d['b'], 2)
+        self.assertEqual(d[1], 1)
+        self.assertEqual(d[2:], [2, 3])
+        self.assertEqual(d['x'], None)
+
+        d['d'] = 4.5
+        self.assertEqual(d.dictionary, {'a': 1, 'b': 2, 'c': 3, 'd': 4.5})
+        d[1:2] = 0
+        self.assertEqual(d.values, [0, 0, 3, 4.5])
+
+        del d['b']
+        del d[1]
+        self.assertEqual(d.dictionary, {'c': 3, 'd': 4.5})
+
+    def test_get(self):
+        d = NumericUDict(a=1, b=2, c=2)
+        self.assertEqual(d.get(key='a'), 1)
+        self.assertEqual(d.get(index=2), 2)
+        self.assertEqual(d.get(value=2), 'b')
+        self.assertEqual(d.get(value=5, default='missing'), 'missing')
+
+        with self.assertRaises(ValueError):
+            d.get(key='a', value=1)
+        with self.assertRaises(IndexError):
+            d.get(index=4)
+        with self.assertRaises(ValueError):
+            d.get(index=0)
+
+        d['d'] = 3 # array has free space after this
+        self.assertEqual(d.get(index=-1), UDict(a=1, b=2, c=2, d=3).get(index=-1))
+
+    def test_contains(self):
+        d = NumericUDict(a=1, b=2)
+        self.assertTrue('a' in d)
+        self.assertTrue(('a', 1) in d)
+        self.assertFalse(('a', 2) in d)
+
+    def test_reductions(self):
+        d = NumericUDict(a=1, b=5, c=-3)
+        self.assertEqual(d.sum(), 3)
+        self.assertEqual(d.mean(), 1)
+        self.assertEqual(d.min(), -3)
+        self.assertEqual(d.max(), 5)
+        self.assertEqual(d.argmin(), 'c')
+        self.assertEqual(d.argmax(), 'b')
+
+    def test_math_operations(self):
+        d = NumericUDict(hello=1, hi=2)
+
+        self.assertEqual(d + {'world': 3}, UDict(hello=1, hi=2, world=3))
+        self.assertEqual(d + UDict(hi=5), {'hello': 1, 'hi': 5})
+        self.assertEqual(d - {'hi': 2}, UDict(hello=1))
+        self.assertEqual(d - NumericUDict(hello=1, hi=3), {'hi': 2})
+
+        self.assertEqual(d * 2, UDict(hello=2, hi=4))
+        self.assertEqual(d * {'hi': 0.5}, {'hello': 1, 'hi': 1})
+        self.assertEqual(d * d, {'hello': 1, 'hi': 4})
+        self.assertEqual(d / 2, UDict(hello=0.5, hi=1))
+        self.assertEqual(1 / d, {'hello': 1, 'hi': 0.5})
+
+        self.assertEqual(d + 1, {'hello': 2, 'hi': 3})
+        self.assertEqual(3 - d, {'hello': 2, 'hi': 1})
+        self.assertEqual(d * np.array([3, 4]), {'hello': 3, 'hi': 8})
+        self.assertEqual(-d, {'hello': -1, 'hi': -2})
+
+        with self.assertRaises(KeyError):
+            _ = d * {'world': 2}
+
+    def test_reflected_operations_with_dicts(self):
+        d = NumericUDict(hello=1, hi=2)
+
+        self.assertEqual({'world': 3} + d, {'hello': 1, 'hi': 2, 'world': 3})
+        self.assertEqual({'hi': 2} - d, {'hello': 1})
+        self.assertEqual({'hi': 3} * d, {'hello': 1, 'hi': 6})
+        self.assertEqual({'hi': 2} / d, {'hello': 1, 'hi': 1})
+        self.assertEqual((d + {}).dtype, d.dtype)
+        self.assertEqual(({} + d).dtype, d.dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+
+from ufpy import PersistentUDict, UDict
+
+
+class PersistentUDictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'data')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_init(self):
+        with PersistentUDict(self.path, UDict(a=1, b=2), default=0) as d:
+            self.assertEqual(d, {'a': 1, 'b': 2})
+            self.assertEqual(d['c'], 0)
+            self.assertEqual(d.to_udict(), UDict(a=1, b=2))
+            self.assertEqual(d.path, self.path)
+            self.assertTrue(os.path.exists(f'{self.path}.index'))
+
+        with open(self.path + '2', 'wb') as f:
+            f.write(b'hello, world')
+        with self.assertRaises(ValueError):
+            PersistentUDict(self.path + '2')
+
+    def test_persistence(self):
+        with PersistentUDict(self.path) as d:
+            for i in range(500):
+                d[f'key{i}'] = {'id': i}
+            d['key1'] = 'changed'
+            del d['key2']
+
+        with PersistentUDict(self.path, default=None) as d:
+            self.assertEqual(len(d), 499)
+            self.assertEqual(d['key1'], 'changed')
+            self.assertEqual(d['key499'], {'id': 499})
+            self.assertIsNone(d['key2'])
+            self.assertEqual(d.keys[:3], ['key0', 'key1', 'key3'])
+
+    def test_get_set_del_item(self):
+        with PersistentUDict(self.path, a=1, b=2, c=3) as d:
+            self.assertEqual(d[1], 1)
+            self.assertEqual(d[2:], [2, 3])
+            d[1] = 10
+            d[(1, 2)] = 'tuple'
+            self.assertEqual(d['a'], 10)
+            self.assertEqual(d[(1, 2)], 'tuple')
+
+            del d[2]
+            self.assertEqual(d.keys, ['a', 'c', (1, 2)])
+            self.assertEqual(d.get(index=3), 'tuple')
+            self.assertEqual(d.get(value=3), 'c')
+            self.assertEqual(d.get(key='b', default='missing'), 'missing')
+            self.assertTrue(('c', 3) in d)
+            self.assertFalse('b' in d)
+
+            with self.assertRaises(KeyError):
+                del d['b']
+
+    def test_keys_equality(self):
+        s = ''.join(['ab'] * 10)
+        with PersistentUDict(self.path) as d:
+            d[(s, s)] = 1
+            self.assertEqual(d[(s, ''.join(['ab'] * 10))], 1)
+            d[1.0] = 'one'
+            self.assertEqual(d[1], 'one')
+            self.assertEqual(len(d), 2)
+
+            with self.assertRaises(TypeError):
+                d[object()] = 1
+
+        # Hash of frozenset's items is different in other process, so order of its items is different too
+        code = (
+            'import sys; from ufpy import PersistentUDict\n'
+            'with PersistentUDict(sys.argv[1]) as d: d[frozenset(f"key{i}" for i in range(20))] = "set"'
+        )
+        for seed in ('1', '2'):
+            subprocess.run(
+                [sys.executable, '-c', code, self.path], check=True,
+                env={**os.environ, 'PYTHONHASHSEED': seed, 'PYTHONPATH': os.getcwd()}
+            )
+        with PersistentUDict(self.path) as d:
+            self.assertEqual(len(d), 3)
+            self.assertEqual(d[frozenset(f'key{i}' for i in range(20))], 'set')
+
+    def test_compact(self):
+        with PersistentUDict(self.path) as d:
+            for i in range(100):
+                d['key'] = i
+            d['other'] = 1
+            self.assertGreater(d.garbage, 0)
+
+            d.compact()
+            self.assertEqual(d.garbage, 0)
+            self.assertEqual(d.items, [('key', 99), ('other', 1)])
+
+    def test_math_operations(self):
+        with PersistentUDict(self.path, a=1, b=2) as d:
+            self.assertEqual(d + {'c': 3}, UDict(a=1, b=2, c=3))
+            self.assertEqual(d * 2, UDict(a=2, b=4))
+            self.assertEqual(-d, UDict(a=-1, b=-2))
+
+            d *= {'a': 10}
+            d -= {'b': 2}
+            d += {'c': 3}
+            self.assertEqual(d, {'a': 10, 'c': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import multiprocessing
+import pickle
+import subprocess
+import sys
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+from ufpy import SharedUDict, UDict
+
+
+def _read(d, queue):
+    queue.put((d.readonly, d.keys, d['b']))
+    d.close()
+
+
+def _write(name, lock, n):
+    d = SharedUDict.attach(name, lock=lock)
+    for i in range(50):
+        d[f'{n}-{i}'] = i
+    with d.lock:
+        d['total'] += 50
+    d.close()
+
+
+class SharedUDictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.d = SharedUDict(UDict(a=1, b=2), default=0)
+
+    def tearDown(self):
+        self.d.close()
+        self.d.unlink()
+
+    def test_init(self):
+        d = self.d
+        self.assertEqual(d, {'a': 1, 'b': 2})
+        self.assertEqual(d['c'], 0)
+        self.assertEqual(d.to_udict(), UDict(a=1, b=2))
+        self.assertFalse(d.readonly)
+        self.assertGreaterEqual(d.capacity, 64)
+
+        with self.assertRaises(ValueError):
+            SharedUDict(capacity=0)
+
+    def test_get_set_del_item(self):
+        d = self.d
+        self.assertEqual(d[1], 1)
+        self.assertEqual(d[1:], [1, 2])
+        d[1] = 10
+        d['c'] = 3
+        self.assertEqual(d['a'], 10)
+
+        del d[2]
+        self.assertEqual(d.keys, ['a', 'c'])
+        self.assertEqual(d.get(index=2), 3)
+        self.assertEqual(d.get(value=3), 'c')
+        self.assertTrue(('c', 3) in d)
+        self.assertFalse('b' in d)
+
+        with self.assertRaises(KeyError):
+            del d['b']
+
+    def test_keys_equality(self):
+        d = self.d
+        s = ''.join(['ab'] * 10)
+        d[(s, s)] = 1
+        self.assertEqual(d[(s, ''.join(['ab'] * 10))], 1)
+        d[frozenset({'x', 'y'})] = 2
+        self.assertEqual(d[frozenset({'y', 'x'})], 2)
+        d[2.0] = 'two'
+        self.assertEqual(d.get(key=2), 'two')
+
+        with self.assertRaises(TypeError):
+            d[object()] = 1
+
+    def test_attach(self):
+        d = self.d
+        r = SharedUDict.attach(d.name)
+        d['c'] = 3
+        self.assertTrue(r.readonly)
+        self.assertEqual(r.keys, ['a', 'b', 'c'])
+        with self.assertRaises(TypeError):
+            r['d'] = 4
+        r.close()
+
+        r = pickle.loads(pickle.dumps(d))
+        self.assertEqual(r, d)
+        self.assertEqual(r['missing'], 0)
+        r.close()
+
+        memory = SharedMemory(create=True, size=64)
+        with self.assertRaises(ValueError):
+            SharedUDict.attach(memory.name)
+        memory.close()
+        memory.unlink()
+
+    def test_processes(self):
+        context = multiprocessing.get_context('spawn')
+        d = SharedUDict(self.d, capacity=200, lock=context.RLock())
+        self.addCleanup(d.unlink)
+        self.addCleanup(d.close)
+        d['total'] = 0
+
+        queue = context.Queue()
+        process = context.Process(target=_read, args=(d, queue))
+        process.start()
+        self.assertEqual(queue.get(timeout=30), (True, ['a', 'b', 'total'], 2))
+        process.join()
+
+        processes = [context.Process(target=_write, args=(d.name, d.lock, n)) for n in range(3)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        self.assertEqual(d['total'], 150)
+        self.assertEqual(len(d), 153)
+
+    def test_attach_from_other_program(self):
+        # Other program has its own resource tracker, which mustn't unlink memory when program exits
+        code = f'from ufpy import SharedUDict; print(SharedUDict.attach({self.d.name!r})["b"])'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, timeout=60)
+        self.assertEqual(result.stdout.strip(), '2')
+        self.assertEqual(result.stderr, '')
+        r = SharedUDict.attach(self.d.name)
+        self.assertEqual(r['a'], 1)
+        r.close()
+
+    def test_full(self):
+        with SharedUDict(capacity=4, size=1024) as d:
+            for i in range(100):
+                d['key'] = i
+                d[f'tmp{i}'] = i
+                del d[f'tmp{i}']
+            self.assertEqual(d.keys, ['key'])
+            self.assertLess(d.garbage, 1024)
+
+            for i in range(d.capacity - 1):
+                d[f'key{i}'] = i
+            with self.assertRaises(MemoryError):
+                d['one more'] = 1
+            with self.assertRaises(MemoryError):
+                d['key'] = 'x' * 2048
+
+    def test_math_operations(self):
+        d = self.d
+        self.assertEqual(d + {'c': 3}, UDict(a=1, b=2, c=3))
+        self.assertEqual(d * 2, UDict(a=2, b=4))
+
+        d *= {'a': 10}
+        d -= {'b': 2}
+        d += {'c': 3}
+        self.assertEqual(d, {'a': 10, 'c': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
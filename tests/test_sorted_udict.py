@@ -0,0 +1,81 @@
+import unittest
+
+from ufpy import SortedUDict, UDict
+
+
+class SortedUDictTestCase(unittest.TestCase):
+    def test_init(self):
+        d = SortedUDict(c=3, a=1, b=2)
+        self.assertEqual(d.keys, ['a', 'b', 'c'])
+        self.assertEqual(d.values, [1, 2, 3])
+        self.assertEqual(d, UDict(a=1, b=2, c=3))
+        self.assertEqual(repr(d), "su{'a': 1, 'b': 2, 'c': 3}")
+
+    def test_key_and_reverse(self):
+        d = SortedUDict({'bb': 1, 'a': 2, 'ccc': 3}, key=len, reverse=True)
+        self.assertEqual(d.keys, ['ccc', 'bb', 'a'])
+        self.assertEqual(d[1], 3)
+
+        d['dddd'] = 4
+        self.assertEqual(d.keys, ['dddd', 'ccc', 'bb', 'a'])
+        self.assertEqual(d.reversed().keys, ['a', 'bb', 'ccc', 'dddd'])
+        self.assertTrue(d.is_reversed)
+
+        self.assertIs(d.reverse(), d)
+        self.assertFalse(d.is_reversed)
+        self.assertEqual(d.keys, ['a', 'bb', 'ccc', 'dddd'])
+        d['ee'] = 5
+        self.assertEqual(d[2:3], [1, 5])
+
+    def test_get_set_del_item(self):
+        d = SortedUDict(b=2, d=4)
+        d['c'] = 3
+        d['a'] = 1
+        self.assertEqual(d.items, [('a', 1), ('b', 2), ('c', 3), ('d', 4)])
+        self.assertEqual(d[2:3], [2, 3])
+        self.assertEqual(d.get(index=4), 4)
+        self.assertEqual(d.get(value=3), 'c')
+
+        d[1] = 0
+        self.assertEqual(d['a'], 0)
+
+        del d['b']
+        del d[1]
+        self.assertEqual(d.keys, ['c', 'd'])
+        self.assertEqual(d['x'], None)
+
+    def test_irange_rank_select(self):
+        d = SortedUDict({i: i * 10 for i in range(10, 0, -1)})
+        self.assertEqual(list(d.irange(3, 6)), [3, 4, 5, 6])
+        self.assertEqual(list(d.irange(3, 6, inclusive=(False, False))), [4, 5])
+        self.assertEqual(list(d.irange(hi=2)), [1, 2])
+
+        self.assertEqual(d.rank(4), 3)
+        self.assertEqual(d.rank(4.5), 4)
+        self.assertEqual(d.select(3), 4)
+
+        r = d.reversed()
+        self.assertEqual(list(r.irange(3, 6)), [6, 5, 4, 3])
+        self.assertEqual(r.rank(4), 6)
+        self.assertEqual(r.select(6), 4)
+
+    def test_update(self):
+        d = SortedUDict({i: i for i in range(0, 40, 2)})
+        d.update({i: i for i in range(1, 40, 2)})
+        self.assertEqual(d.keys, list(range(40)))
+
+        d += {-1: -1, 100: 100}
+        self.assertEqual(d.select(0), -1)
+        self.assertEqual(d.select(-1), 100)
+
+    def test_math_operations(self):
+        d = SortedUDict(hi=2, hello=1)
+        self.assertEqual((d + {'a': 3}).keys, ['a', 'hello', 'hi'])
+        self.assertEqual(d - {'hi': 2}, UDict(hello=1))
+        self.assertEqual(d * 2, {'hello': 2, 'hi': 4})
+        self.assertEqual(d / {'hi': 2}, {'hello': 1, 'hi': 1})
+        self.assertEqual(-d, {'hello': -1, 'hi': -2})
+
+
+if __name__ == '__main__':
+    unittest.main()
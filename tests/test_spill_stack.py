@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+
+from ufpy import SpillStack
+from ufpy.ustl import Stack
+
+
+class SpillStackTestCase(unittest.TestCase):
+    def test_init(self):
+        with SpillStack(iterable=range(10), capacity=4, segment=2) as s:
+            self.assertEqual(len(s), 10)
+            self.assertEqual(s.spilled, 6)
+            self.assertEqual(s.top, 9)
+            self.assertEqual(s.elements, list(range(10)))
+            self.assertEqual(s, Stack(iterable=range(10)))
+            self.assertEqual(s, SpillStack(iterable=range(10)))
+
+        with self.assertRaises(ValueError):
+            SpillStack(capacity=0)
+        with self.assertRaises(ValueError):
+            SpillStack(capacity=1)
+        with self.assertRaises(ValueError):
+            SpillStack(capacity=2, segment=3)
+        with self.assertRaises(ValueError):
+            SpillStack(capacity=4, segment=3)
+        with self.assertRaises(ValueError):
+            SpillStack(capacity=4, segment=0)
+
+    def test_push_pop(self):
+        with SpillStack(capacity=4, segment=2) as s:
+            for i in range(100):
+                s.push(i)
+            self.assertLessEqual(len(s) - s.spilled, 4)
+            self.assertEqual([s.pop() for _ in range(100)], list(range(99, -1, -1)))
+            self.assertTrue(s.is_empty())
+            self.assertIsNone(s.top)
+            with self.assertRaises(IndexError):
+                s.pop()
+
+    def test_top(self):
+        with SpillStack(1, 2, 3, capacity=2, segment=1) as s:
+            s.pop()
+            self.assertEqual(s.top, 2)
+            s.top = 5
+            del s.top
+            s.top = 4
+            self.assertEqual(s, Stack(4))
+
+    def test_types(self):
+        elements = ['a', {'b': 1}, 3.5, None, 2 ** 80, (1, 2)]
+        with SpillStack(iterable=elements, capacity=2, directory=tempfile.gettempdir()) as s:
+            self.assertEqual(s.spilled, 4)
+            self.assertEqual(s.elements, elements)
+            self.assertEqual([s.pop() for _ in range(6)], elements[::-1])
+
+    def test_clear(self):
+        s = SpillStack(iterable=range(10), capacity=2)
+        s.clear()
+        self.assertEqual((len(s), s.spilled), (0, 0))
+        s.push(1, 2, 3)
+        self.assertEqual(s.elements, [1, 2, 3])
+        s.close()
+        self.assertTrue(s.is_empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
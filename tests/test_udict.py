@@ -1,6 +1,13 @@
+from fractions import Fraction
+import pickle
 import unittest
 
-from ufpy import UDict
+from ufpy import UDict, FrozenUDict, CacheUDict, MISSING, from_bytes
+from ufpy.ustl import Stack
+
+
+def _concat(k, v):
+    return f'{k}{v}'
 
 
 class UDictTestCase(unittest.TestCase):
@@ -19,6 +26,10 @@ class UDictTestCase(unittest.TestCase):
         self.assertNotEqual(d, d3)
         self.assertNotEqual(d2, d3)
 
+    def test_slots(self):
+        self.assertFalse(hasattr(UDict(hello=1), '__dict__'))
+        self.assertFalse(hasattr(FrozenUDict(hello=1), '__dict__'))
+
     def test_keys_values_items(self):
         d = UDict(hello=1, hi=2)
 
@@ -26,11 +37,34 @@ class UDictTestCase(unittest.TestCase):
         self.assertEqual(d.values, list(d.dictionary.values()))
         self.assertEqual(d.items, list(d.dictionary.items()))
 
+    def test_views(self):
+        d = UDict(hello=1, hi=2)
+        keys, values, items = d.keys_view, d.values_view, d.items_view
+
+        self.assertEqual(keys, d.keys)
+        self.assertEqual(values, d.values)
+        self.assertEqual(items, d.items)
+
+        d['world'] = 3
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(keys[2], 'world')
+        self.assertEqual(values[-1], 3)
+        self.assertEqual(items[1:], [('hi', 2), ('world', 3)])
+
+        self.assertTrue('hi' in keys)
+        self.assertTrue(3 in values)
+        self.assertTrue(('hello', 1) in items)
+        self.assertFalse(('hello', 2) in items)
+
+        d.reverse()
+        self.assertEqual(list(keys), ['world', 'hi', 'hello'])
+        self.assertEqual(list(reversed(values)), [1, 2, 3])
+
     def test_call(self):
         d = {'hello': 1, 'hi': 2}
         ud = UDict(d)
 
-        d2 = d
+        d2 = d.copy()
 
         for k, v in d2.items():
             d2[k] = v * 2
@@ -38,6 +72,36 @@ class UDictTestCase(unittest.TestCase):
         ud2 = ud(lambda k, v: v * 2)
 
         self.assertDictEqual(d2, ud2.dictionary)
+        self.assertDictEqual(d, ud.dictionary)
+        self.assertDictEqual(d, {'hello': 1, 'hi': 2})
+
+    def test_map(self):
+        ud = UDict(hello=1, hi=2, default=0)
+        expected = UDict(hello='hello1', hi='hi2')
+
+        self.assertEqual(ud.map(_concat), expected)
+        self.assertEqual(ud.map(_concat, mode='thread', workers=2), expected)
+        self.assertEqual(ud.map(_concat, mode='process', workers=2, chunksize=1), expected)
+        self.assertEqual(ud.map(_concat).default, 0)
+        self.assertEqual(ud, UDict(hello=1, hi=2))
+
+        calls = []
+
+        def f(k, v):
+            calls.append(k)
+            return v * 10
+
+        lazy = ud.map(f, mode='lazy')
+        self.assertEqual(calls, [])
+        self.assertEqual(lazy['hi'], 20)
+        self.assertEqual(lazy[1], 10)
+        self.assertEqual(lazy['hi'], 20)
+        self.assertEqual(calls, ['hi', 'hello'])
+        self.assertEqual(lazy, UDict(hello=10, hi=20))
+        self.assertEqual(lazy.reversed(), UDict(hi=20, hello=10))
+
+        with self.assertRaises(ValueError):
+            ud.map(f, mode='gpu')
 
     def test_reverse(self):
         d = {'hello': 1, 'hi': 2}
@@ -92,6 +156,70 @@ class UDictTestCase(unittest.TestCase):
         del d[:]
         self.assertDictEqual(d.dictionary, {})
 
+    def test_positional_index(self):
+        d = UDict(a=1, b=2, c=3)
+        self.assertEqual(d[2], 2)
+
+        d['d'] = 4
+        self.assertEqual(d[4], 4)
+
+        del d['b']
+        self.assertEqual(d[2:], [3, 4])
+        del d[3]
+        self.assertEqual(d.keys, ['a', 'c'])
+
+        d.reverse()
+        self.assertEqual(d[1], 3)
+        self.assertEqual(d.get(index=2), 1)
+
+        d['b'] = 2
+        d.sort()
+        self.assertEqual(d[:], [1, 2, 3])
+
+        d.dictionary['e'] = 5
+        self.assertEqual(d[4], 5)
+
+        # keys are set while index is dropped after deleting of not last key
+        d = UDict(a=1, b=2, c=3)
+        self.assertEqual(d[1], 1)
+        del d['a']
+        d['d'] = 4
+        del d['b']
+        d['e'] = 5
+        self.assertEqual(d[:], [3, 4, 5])
+
+    def test_dictionary_isnt_aliased(self):
+        d = {'a': 1, 'b': 2}
+        ud = UDict(d)
+        self.assertEqual(ud[2], 2)
+        del d['a']
+        d['c'] = 3
+        self.assertEqual(ud[1], 1)
+        self.assertEqual(ud[2], 2)
+
+        exposed = ud.dictionary
+        del exposed['a']
+        exposed['c'] = 3
+        self.assertEqual(ud[1], 2)
+        self.assertEqual(ud[2], 3)
+
+        del ud['b']
+        self.assertEqual(ud[1], 3)
+        self.assertEqual(exposed, {'c': 3})
+
+    def test_values_index_after_outside_change(self):
+        d = UDict(a=1, b=2, index_values=True)
+        exposed = d.dictionary
+        self.assertEqual(d.get(value=1), 'a')
+        exposed['a'] = 5
+        self.assertIsNone(d.get(value=1))
+        self.assertEqual(d.get(value=5), 'a')
+
+        d['c'] = 1
+        self.assertEqual(d.get(value=1), 'c')
+        exposed.pop('c')
+        self.assertIsNone(d.get(value=1))
+
     def test_get(self):
         d = UDict({2: 1, 4: 91, 1: 12}, default=None)
         self.assertEqual(d.get(index=1), d.get(key=2))
@@ -120,6 +248,66 @@ class UDictTestCase(unittest.TestCase):
         with self.assertRaises(IndexError):
             d.get(index=4)
 
+    def test_get_with_values_index(self):
+        d = UDict(a=1, b=91, c=12, d=[1], index_values=True)
+        self.assertEqual(d.get(value=91), 'b')
+        self.assertEqual(d.get(value=[1]), 'd')
+
+        d['e'] = 1
+        self.assertEqual(d.get(value=1), 'a')
+        del d['a']
+        self.assertEqual(d.get(value=1), 'e')
+
+        d['b'] = 7
+        self.assertEqual(d.get(value=91, default='missing'), 'missing')
+        self.assertEqual(d.get(value=7), 'b')
+
+        d.reverse()
+        d[1] = 7
+        self.assertEqual(d.get(value=7), 'e')
+
+    def test_bulk_operations(self):
+        d = UDict(a=1, b=2, default=0)
+        d.update_many(['c', 'd'], (3, 4))
+        d.update_many({'a': 10})
+        d.update_many(UDict(e=5))
+        self.assertEqual(d, UDict(a=10, b=2, c=3, d=4, e=5))
+        self.assertEqual(d[5], 5)
+
+        self.assertEqual(d.get_many(['a', 'c']), [10, 3])
+        self.assertEqual(d.get_many(iter(['a', 'x'])), [10, 0])
+        self.assertEqual(d.get_many(['x'], default=None), [None])
+
+        self.assertEqual(d.pop_many(('d', 'e')), [4, 5])
+        self.assertEqual(d.pop_many(['x'], default=None), [None])
+        with self.assertRaises(KeyError):
+            d.pop_many(['x'])
+        self.assertEqual(d.keys, ['a', 'b', 'c'])
+
+        self.assertEqual(d.setdefault_many(['a', 'f'], 6), [10, 6])
+        self.assertEqual(d.setdefault_many({'b': 20, 'g': 7}), [2, 7])
+        self.assertEqual(d.items[-1], ('g', 7))
+
+        with self.assertRaises(ValueError):
+            d.update_many(['x', 'y'], [1])
+        self.assertEqual(d[len(d)], 1) # index includes keys which were set before error
+
+        with self.assertRaises(TypeError):
+            d.setdefault_many(['z', []])
+        self.assertEqual(d[len(d)], None)
+
+    def test_bulk_operations_with_numpy(self):
+        try:
+            import numpy as np # pylint: disable=import-outside-toplevel
+        except ImportError:
+            self.skipTest('NumPy is not installed')
+
+        d = UDict()
+        d.update_many(np.arange(3), np.array([1.5, 2.5, 3.5]))
+        self.assertEqual(d.keys, [0, 1, 2])
+        self.assertEqual(d.get_many(np.array([2, 0])), [3.5, 1.5])
+        self.assertEqual(d.pop_many(np.array([1])), [2.5])
+
     def test_len_and_iter(self):
         d = UDict(hello=1, hi=2)
         self.assertEqual(len(d), 2)
@@ -153,6 +341,50 @@ class UDictTestCase(unittest.TestCase):
 
         self.assertEqual(repr(ud), f'u{repr(d)}')
 
+    def test_frozen(self):
+        d = UDict(hello=1, hi=2)
+        fd = d.freeze()
+        fd2 = FrozenUDict(hi=2, hello=1)
+
+        self.assertEqual(fd, d)
+        self.assertEqual(fd, fd2)
+        self.assertEqual(hash(fd), hash(fd2))
+        self.assertNotEqual(fd, FrozenUDict(hello=1, hi=3))
+        self.assertEqual({fd: 'value'}[fd2], 'value')
+        self.assertEqual(fd[1], 1)
+
+        d['hi'] = 3
+        self.assertEqual(fd['hi'], 2)
+
+        with self.assertRaises(TypeError):
+            fd['hi'] = 3
+        with self.assertRaises(TypeError):
+            del fd['hi']
+        with self.assertRaises(TypeError):
+            fd.dictionary['hi'] = 3
+        with self.assertRaises(TypeError):
+            fd.update_many({'world': 3})
+        with self.assertRaises(TypeError):
+            fd.pop_many(['hi'])
+        with self.assertRaises(TypeError):
+            fd.setdefault_many(['world'])
+        with self.assertRaises(AttributeError):
+            fd.keys = ['a', 'b']
+
+        fd3 = fd
+        fd3 *= 2
+        self.assertIsInstance(fd3, FrozenUDict)
+        self.assertEqual(fd3, UDict(hello=2, hi=4))
+        self.assertEqual(fd, UDict(hello=1, hi=2))
+        self.assertEqual(-fd, FrozenUDict(hello=-1, hi=-2))
+
+        self.assertEqual(FrozenUDict(a=[1]), FrozenUDict(a=[1]))
+        self.assertNotEqual(FrozenUDict(a=[1]), FrozenUDict(a=[2]))
+
+        ud = UDict(fd)
+        ud['hi'] = 5
+        self.assertEqual(fd['hi'], 2)
+
     def test_cmp_and_eq(self):
         d = {'hello': 1, 'hi': 2}
         ud = UDict(d)
@@ -167,6 +399,34 @@ class UDictTestCase(unittest.TestCase):
 
         self.assertEqual(d, ud)
 
+    def test_diff(self):
+        d = UDict(a=1, b=2, c=UDict(x=1, y=2))
+        d2 = {'b': 3, 'c': UDict(x=1, y=3), 'd': 4}
+
+        diff = d.diff(d2)
+        self.assertEqual(diff.added, UDict(d=4))
+        self.assertEqual(diff.removed, UDict(a=1))
+        self.assertEqual(diff.changed['b'], (2, 3))
+        self.assertEqual(diff.changed['c'].changed, UDict(y=(2, 3)))
+        self.assertTrue(diff)
+
+        self.assertTrue(d.diff(UDict(d)).is_empty())
+        self.assertFalse(UDict(a=1).diff({'a': 1}))
+
+    def test_merge(self):
+        base = UDict(a=1, b=2, c=3, n=UDict(x=1))
+        ours = UDict(a=10, b=2, n=UDict(x=1, y=2))
+        theirs = UDict(a=1, b=20, c=3, d=4, n=UDict(x=5))
+
+        self.assertEqual(ours.merge(base, theirs), UDict(a=10, b=20, n=UDict(x=5, y=2), d=4))
+        self.assertEqual(ours, UDict(a=10, b=2, n=UDict(x=1, y=2)))
+
+        with self.assertRaises(ValueError):
+            UDict(a=1).merge({'a': 0}, {'a': 2})
+        self.assertEqual(UDict(a=1).merge({'a': 0}, {'a': 2}, lambda k, b, o, t: o + t), UDict(a=3))
+        self.assertEqual(UDict(a=1).merge({'a': 0}, {}, lambda k, b, o, t: t), UDict())
+        self.assertEqual(UDict(a=1).merge({}, {'a': 2}, lambda k, b, o, t: MISSING if b is MISSING else o), UDict())
+
     def test_math_operations(self):
         d = UDict(hello=1, hi=2)
 
@@ -176,10 +436,159 @@ class UDictTestCase(unittest.TestCase):
         self.assertEqual(d * 2, UDict(hello=2, hi=4))
         self.assertEqual(d / 2, UDict(hello=0.5, hi=1))
 
+    def test_inplace_math_operations(self):
+        d = UDict(hello=1, hi=2)
+        d2 = d
+
+        d += {'world': 3}
+        self.assertIs(d, d2)
+        self.assertEqual(d, UDict(hello=1, hi=2, world=3))
+        self.assertEqual(d[3], 3)
+
+        d -= UDict(hi=2, world=4)
+        self.assertEqual(d2, UDict(hello=1, world=3))
+        self.assertEqual(d[2], 3)
+
+        d *= 2
+        d /= {'world': 3}
+        self.assertIs(d, d2)
+        self.assertEqual(d2, UDict(hello=2, world=2))
+
+        d *= Fraction(1, 2)
+        self.assertEqual(d, UDict(hello=1, world=1))
+        with self.assertRaises(KeyError):
+            d *= {'hello': 5, 'x': 2}
+        with self.assertRaises(ZeroDivisionError):
+            d /= {'hello': 5, 'world': 0}
+        with self.assertRaises(TypeError):
+            d *= 'a'
+        self.assertEqual(d, UDict(hello=1, world=1))
+
+    def test_copy_on_write(self):
+        a = UDict(hello=1, hi=2)
+        b = {'world': 3}
+        c = UDict(hello=2)
+        r = (a + b) * 2 - c
+
+        a['hello'] = 10
+        b['world'] = 30
+        c['hello'] = 20
+        self.assertEqual(r, UDict(hi=4, world=6))
+        self.assertEqual(a, UDict(hello=10, hi=2))
+
+        r['hi'] = 5
+        self.assertEqual(a, UDict(hello=10, hi=2))
+
+        s = a.sorted()
+        r2 = ~a
+        a2 = UDict(a)
+        a2['hey'] = 0
+        a['hello'] = 1
+        self.assertEqual(s.keys, ['hello', 'hi'])
+        self.assertEqual(r2.keys, ['hi', 'hello'])
+        self.assertEqual(s['hello'], 10)
+        self.assertEqual(a2, UDict(hello=10, hi=2, hey=0))
+        self.assertEqual(a, UDict(hello=1, hi=2))
+
+        with self.assertRaises(KeyError):
+            _ = a * {'world': 2}
+
+    def test_math_operations_with_exposed_dictionary(self):
+        d = {'a': 1, 'b': 2}
+        ud = UDict(d)
+        r = ud * 2
+        d['a'] = 100
+        self.assertEqual(r, UDict(a=2, b=4))
+
+        exposed = ud.dictionary
+        r = ud + {'b': 3}
+        r2 = UDict(ud)
+        exposed['a'] = 99
+        self.assertEqual(r, UDict(a=1, b=3))
+        self.assertEqual(r2, UDict(a=1, b=2))
+
+    def test_math_operations_errors(self):
+        d = UDict(a=1)
+        with self.assertRaises(ZeroDivisionError):
+            _ = d / 0
+        with self.assertRaises(ZeroDivisionError):
+            _ = d / {'a': 0}
+        with self.assertRaises(KeyError):
+            _ = (d * 2) * {'missing': 3}
+        with self.assertRaises(TypeError):
+            _ = d * 'a'
+        with self.assertRaises(TypeError):
+            _ = d + [('b', 2)]
+        self.assertEqual((d + {'b': 2}) * {'b': 3}, UDict(a=1, b=6))
+
+        s = UDict(a='x', b=2)
+        with self.assertRaises(TypeError):
+            _ = s / 2
+        with self.assertRaises(TypeError):
+            _ = s * {'a': 'y'}
+        with self.assertRaises(TypeError):
+            s *= {'b': [1]}
+        self.assertEqual(s * {'a': 2}, UDict(a='xx', b=2))
+
+    def test_fused_math_operations(self):
+        calls = []
+
+        def func(k, v):
+            calls.append(k)
+            return v + 1
+
+        d = UDict(hello=1, hi=2)
+        r = d.map(func, mode='lazy') * 2 / 4
+        self.assertEqual(calls, [])
+        self.assertEqual(r, UDict(hello=1, hi=1.5))
+        self.assertEqual(calls, ['hello', 'hi'])
+        self.assertEqual(-(d * 3), UDict(hello=-3, hi=-6))
+
     def test_neg(self):
         d = UDict(hello=1, hi=2)
         self.assertEqual((-d).dictionary, {'hello': -1, 'hi': -2})
 
+    def test_pickle(self):
+        d = UDict(hello=1, hi=2, default=0, index_values=True)
+        for o in (d, d * 2, FrozenUDict(hello=1), CacheUDict(d, maxsize=2)):
+            r = pickle.loads(pickle.dumps(o))
+            self.assertIs(type(r), type(o))
+            self.assertEqual(r, o)
+
+        r = pickle.loads(pickle.dumps(d))
+        self.assertEqual(r.default, 0)
+        self.assertEqual(r.get(value=2), 'hi')
+        r['hey'] = 3
+        self.assertEqual(d, UDict(hello=1, hi=2))
+        self.assertEqual(hash(pickle.loads(pickle.dumps(FrozenUDict(hello=1)))), hash(FrozenUDict(hello=1)))
+
+        c = pickle.loads(pickle.dumps(CacheUDict(d, maxsize=2)))
+        c['hey'] = 3
+        self.assertEqual(c.keys, ['hi', 'hey'])
+
+    def test_bytes(self):
+        d = UDict({
+            'ints': [1, -2, 300, 2 ** 40], 'floats': [0.5, 1.5], 'mixed': [1, 'a', None, True, b'b'],
+            'big': -2 ** 100, 'tuple': (1.0, 2), 'dict': {1: 2}, 'udict': UDict(a=1, default=5),
+            'stack': Stack(1, 2), 'frozen': FrozenUDict(a=1), 'empty': [], 'text': 'привет',
+        }, default=-1)
+        r = UDict.from_bytes(d.to_bytes())
+        self.assertEqual(r, d)
+        self.assertEqual(r.default, -1)
+        self.assertEqual(r['udict'].default, 5)
+        self.assertIsInstance(r['tuple'], tuple)
+        self.assertIsInstance(r['frozen'], FrozenUDict)
+
+        numbers = UDict({i: i / 2 for i in range(1000)})
+        self.assertEqual(UDict.from_bytes(numbers.to_bytes()), numbers)
+        self.assertLess(len(numbers.to_bytes()), len(pickle.dumps(numbers)))
+        self.assertEqual(UDict.from_bytes((numbers * 2).to_bytes()), numbers * 2)
+
+        with self.assertRaises(TypeError):
+            UDict.from_bytes(Stack(1).to_bytes())
+        with self.assertRaises(ValueError):
+            from_bytes(b'hello')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from copy import copy
 
@@ -14,6 +15,40 @@ class UStackTestCase(unittest.TestCase):
         self.assertEqual(s, s3)
         self.assertEqual(s2, s3)
 
+    def test_slots(self):
+        self.assertFalse(hasattr(Stack(1, 2), '__dict__'))
+
+    def test_typed(self):
+        s = Stack(1, 2, 3, typed=True)
+        self.assertEqual(s.typecode, 'q')
+        self.assertEqual(s, Stack(1, 2, 3))
+        self.assertEqual(Stack(0.5, 1, typed=True).typecode, 'd')
+        self.assertEqual(Stack(iterable=range(3), typecode='i').elements.tolist(), [0, 1, 2])
+        self.assertIsNone(Stack(1, 2).typecode)
+
+        s.push(4)
+        self.assertEqual(s.pop(), 4)
+        s.top = 10
+        self.assertEqual(s.top, 10)
+        del s.top
+        self.assertEqual(repr(s), 's[1, 2]')
+        self.assertEqual(s.copy().typecode, 'q')
+
+        self.assertEqual((s * 2).typecode, 'q')
+        self.assertEqual((s / 2).typecode, 'd')
+        s /= 2
+        self.assertEqual(s, Stack(0.5, 1.0))
+        self.assertEqual(s.typecode, 'd')
+
+        del s.elements
+        self.assertEqual(s.typecode, 'd')
+        with self.assertRaises(TypeError):
+            s.push('a')
+        with self.assertRaises(ValueError):
+            Stack(typed=True)
+        with self.assertRaises(ValueError):
+            Stack('a', typed=True)
+
     def test_elements(self):
         s = Stack(1, 1, 2, 3, 5, 8)
         self.assertEqual(s.elements, [1, 1, 2, 3, 5, 8])
@@ -43,11 +78,42 @@ class UStackTestCase(unittest.TestCase):
         s = Stack(1, 1, 2, 3, 5, 8)
         self.assertEqual(s.push(2, 1), Stack(1, 1, 2, 3, 5, 8, 2, 1))
         self.assertEqual(s, Stack(1, 1, 2, 3, 5, 8, 2, 1))
+        self.assertIs(s.push(0), s)
+        self.assertIs(s.extend(range(3)).extend([5]), s)
+        self.assertEqual(s, Stack(1, 1, 2, 3, 5, 8, 2, 1, 0, 0, 1, 2, 5))
 
     def test_remove(self):
         s = Stack(1, 1, 2, 3, 5, 8)
         self.assertEqual(s.remove(1), Stack(1, 2, 3, 5, 8))
         self.assertEqual(s, Stack(1, 2, 3, 5, 8))
+        self.assertIs(s.remove(2, 3), s)
+        self.assertEqual(s, Stack(1, 5, 8))
+        self.assertIs(s.remove(), s)
+
+        elements = s.elements
+        s.remove(1, 5)
+        self.assertEqual(elements, [8])
+
+    def test_remove_many(self):
+        s = Stack(1, 2, 1, 3, 1, 2)
+        self.assertIs(s.remove_many([1, 2, 1]), s)
+        self.assertEqual(s, Stack(3, 1, 2))
+
+        with self.assertRaises(ValueError):
+            s.remove_many([3, 4])
+        self.assertEqual(s, Stack(3, 1, 2))
+
+        s = Stack([1], [2], 3)
+        s.remove_many([[2], 3])
+        self.assertEqual(s, Stack([1]))
+        with self.assertRaises(ValueError):
+            s.remove_many([[1], [1]])
+        self.assertEqual(s, Stack([1]))
+
+        s = Stack(1, 2, 1, typed=True)
+        s.remove_many([1])
+        self.assertEqual(s.typecode, 'q')
+        self.assertEqual(s, Stack(2, 1))
 
     def test_clear(self):
         s = Stack(1, 1, 2, 3, 5, 8)
@@ -92,6 +158,73 @@ class UStackTestCase(unittest.TestCase):
         self.assertEqual(s - 1, Stack(1, 2, 3, 5, 8))
         self.assertEqual(s * 2, Stack(2, 2, 4, 6, 10, 16))
         self.assertEqual(s / 2, Stack(0.5, 0.5, 1, 1.5, 2.5, 4))
+        self.assertEqual(s * [1, 2, 3, 4, 5, 6, 7], Stack(1, 2, 6, 12, 25, 48))
+        self.assertEqual(Stack('a', 'b') * 2, Stack('aa', 'bb'))
+        with self.assertRaises(IndexError):
+            _ = s * [1, 2]
+
+    def test_typed_math_operations(self):
+        s = Stack(1, 2, 3, typed=True)
+        self.assertEqual(s * 2, Stack(2, 4, 6))
+        self.assertEqual((s * 2).typecode, 'q')
+        self.assertEqual(s * Stack(1, 2, 3), Stack(1, 4, 9))
+        self.assertEqual((s / 2).typecode, 'd')
+        self.assertEqual(s / [1, 2, 4], Stack(1, 1, 0.75))
+        with self.assertRaises(IndexError):
+            _ = s / [1, 2]
+
+        elements = s.elements
+        s *= 2
+        self.assertIs(s.elements, elements)
+        s /= 4
+        self.assertEqual(s, Stack(0.5, 1, 1.5))
+        self.assertEqual(s.typecode, 'd')
+
+    def test_typed_math_overflow(self):
+        s = Stack(2 ** 62, 3, typed=True)
+        with self.assertRaises(OverflowError):
+            _ = s * 4
+        with self.assertRaises(OverflowError):
+            s *= 4
+        self.assertEqual(s, Stack(2 ** 62, 3))
+
+        b = Stack(1, 2, typecode='B')
+        with self.assertRaises(OverflowError):
+            _ = b * 200
+        with self.assertRaises(OverflowError):
+            b.push(400)
+        b *= 100
+        self.assertEqual(b, Stack(100, 200))
+        self.assertEqual(b.typecode, 'B')
+
+    def test_typed_division_by_zero(self):
+        for s in (Stack(1, 2, typed=True), Stack(1.5, 0.0, typed=True), Stack(1, 2)):
+            with self.assertRaises(ZeroDivisionError):
+                _ = s / 0
+            with self.assertRaises(ZeroDivisionError):
+                _ = s / [1, 0.0]
+            with self.assertRaises(ZeroDivisionError):
+                s /= 0
+        s = Stack(1, 2, typed=True)
+        with self.assertRaises(ZeroDivisionError):
+            s /= Stack(0, 0)
+        self.assertEqual(s, Stack(1, 2))
+        self.assertEqual(s * 0, Stack(0, 0))
+
+    def test_inplace_math_operations(self):
+        s = Stack(1, 2, 3)
+        s2 = s
+
+        s += 4
+        s -= [1]
+        self.assertIs(s, s2)
+        self.assertEqual(s, Stack(2, 3, 4))
+
+        s *= 2
+        self.assertEqual(s2, Stack(4, 6, 8))
+        s /= [2, 3, 4]
+        self.assertIs(s, s2)
+        self.assertEqual(s2, Stack(2, 2, 2))
 
     def test_len_and_empty(self):
         s = Stack(1, 1, 2, 3, 5, 8)
@@ -99,6 +232,28 @@ class UStackTestCase(unittest.TestCase):
         self.assertFalse(s.is_empty())
         self.assertTrue(bool(s))
 
+    def test_serialization(self):
+        for s in (Stack(), Stack(1, 2, 3), Stack(0.5, 'a', None)):
+            self.assertEqual(pickle.loads(pickle.dumps(s)), s)
+            self.assertEqual(type(s).from_bytes(s.to_bytes()), s)
+
+        s = Stack(*range(1000))
+        self.assertLess(len(s.to_bytes()), len(pickle.dumps(s)))
+
+        for typecode in ('B', 'q', 'f'):
+            s = Stack(1, 2, 3, typecode=typecode)
+            r = type(s).from_bytes(s.to_bytes())
+            self.assertEqual(r.typecode, typecode)
+            self.assertEqual(r, s)
+        self.assertIsNone(type(s).from_bytes(Stack(1, 2).to_bytes()).typecode)
+
+        data = Stack(1, 'a', None).to_bytes()
+        for size in range(4, len(data)):
+            with self.assertRaises(ValueError):
+                type(s).from_bytes(data[:size])
+        with self.assertRaises(ValueError):
+            type(s).from_bytes(data + b'N')
+
     def test_repr(self):
         s = Stack(1, 1, 2, 3, 5, 8)
         self.assertEqual(repr(s), 's[1, 1, 2, 3, 5, 8]')
@@ -7,6 +7,14 @@ Online docs: https://honey-team.ru/ufpy-website
 from ufpy.cmp import *
 from ufpy.math_op import *
 from ufpy.udict import *
+from ufpy.numeric_udict import *
+from ufpy.sorted_udict import *
+from ufpy.cache_udict import *
+from ufpy.async_udict import *
+from ufpy.concurrent_udict import *
+from ufpy.persistent_udict import *
+from ufpy.shared_udict import *
+from ufpy.serialize import *
 from ufpy.utils import *
 from ufpy.typ import *
 from ufpy.ustl import *
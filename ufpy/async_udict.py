@@ -0,0 +1,135 @@
+"""
+AsyncUDict is a UDict which loads missing values with a coroutine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict, _ClassDefault, MISSING
+
+__all__ = (
+    'AsyncUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+
+class AsyncUDict(UDict[KT, VT, CDV]):
+    """
+    UDict which loads values of missing keys with `loader` coroutine in `aget()` and `aget_many()`.
+    Loaded values are saved in dict.
+
+    If several tasks request the same missing key at once, it is loaded only once and all tasks get the same value.
+    Count of loads which run at once is limited with `max_concurrency`.
+    If loader raises `KeyError`, key is considered missing and default value is returned (it isn't saved in dict).
+
+    Other methods work like in UDict and don't call loader.
+    """
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] = None, *,
+            loader: Callable[[KT], Awaitable[VT]], max_concurrency: int = 16, default: CDV = None, **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for AsyncUDict (optional, you can use kwargs instead of it)
+        loader: Coroutine function which returns value of missing key or raises `KeyError`
+        max_concurrency: Maximal count of loads which run at once (optional)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: max_concurrency isn't positive
+        """
+        if max_concurrency <= 0:
+            raise ValueError('max_concurrency must be positive.')
+
+        super().__init__(dictionary or kwargs, default=default)
+        self.__loader = loader
+        self.__max_concurrency = max_concurrency
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__loads: dict[KT, asyncio.Future[VT]] = {} # key -> running load
+
+    # properties
+    @property
+    def loader(self) -> Callable[[KT], Awaitable[VT]]:
+        """
+        Coroutine function which loads values of missing keys
+        """
+        return self.__loader
+
+    @property
+    def max_concurrency(self) -> int:
+        """
+        Maximal count of loads which run at once
+        """
+        return self.__max_concurrency
+
+    @property
+    def loading(self) -> list[KT]:
+        """
+        Keys which are being loaded now
+        """
+        return list(self.__loads)
+
+    # loading
+    async def __load(self, key: KT) -> VT:
+        try:
+            async with self.__semaphore:
+                value = await self.__loader(key)
+            self.update_many({key: value})
+            return value
+        except KeyError:
+            return MISSING
+        finally:
+            del self.__loads[key]
+
+    async def __load_once(self, key: KT, default: DV) -> VT | DV:
+        future = self.__loads.get(key)
+        if future is None:
+            future = self.__loads[key] = asyncio.ensure_future(self.__load(key))
+        # Cancellation of one waiting task doesn't cancel load, which other tasks wait for
+        value = await asyncio.shield(future)
+        return default if value is MISSING else value
+
+    async def aget(self, key: KT, default: DV = _ClassDefault) -> VT | CDV | DV:
+        """
+        Returns value of key. If key is missing, loads it with loader.
+        Integers are always keys (not indexes).
+
+        Parameters:
+        key: Key
+        default: Value which is returned if loader raises `KeyError` (if none -> AsyncUDict.default) (optional)
+        """
+        value = self.get_many((key,), MISSING)[0]
+        if value is not MISSING:
+            return value
+        return await self.__load_once(key, self.default if default == _ClassDefault else default)
+
+    async def aget_many(self, keys: Iterable[KT], default: DV = _ClassDefault) -> list[VT | CDV | DV]:
+        """
+        Returns values of several keys. Missing keys are loaded at once (every key is loaded only once).
+        Integers are always keys (not indexes).
+
+        Parameters:
+        keys: Keys (any iterable, for example, list or NumPy array)
+        default: Value which is returned for keys, for which loader raises `KeyError`
+        (if none -> AsyncUDict.default) (optional)
+        """
+        keys = list(keys)
+        values = self.get_many(keys, MISSING)
+        missing = list(dict.fromkeys(k for k, v in zip(keys, values) if v is MISSING))
+        if not missing:
+            return values
+
+        if default == _ClassDefault:
+            default = self.default
+        loaded = dict(zip(missing, await asyncio.gather(*(self.__load_once(k, default) for k in missing))))
+        return [loaded[k] if v is MISSING else v for k, v in zip(keys, values)]
+
+    def __repr__(self) -> str:
+        return f'a{super().__repr__()}'
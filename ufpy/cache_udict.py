@@ -0,0 +1,400 @@
+"""
+CacheUDict is a UDict with limited size. It can be used as a memo table.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from itertools import repeat
+from time import monotonic
+from typing import Any, Callable, Iterable, Literal, TypeVar
+
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict, _ClassDefault
+
+__all__ = (
+    'CacheUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+type EvictionPolicy = Literal['lru', 'lfu', 'ttl']
+
+
+class CacheUDict(UDict[KT, VT, CDV]): # pylint: disable=too-many-instance-attributes
+    """
+    UDict with limited size. When it is full, one item is evicted before adding new one:
+    - `'lru'` policy evicts least recently used item
+    - `'lfu'` policy evicts least frequently used item (least recently used of them, if there are several)
+    - `'ttl'` policy evicts the oldest item
+
+    If `ttl` is defined, items expire after `ttl` seconds with any policy.
+    All operations with keys are O(1) amortised.
+
+    Unlike UDict, integer keys are always keys (not indexes) in `[]` operator,
+    so you can use `CacheUDict` for memoization of functions with integer arguments.
+    Slices and `get(index=...)` still work with indexes.
+    """
+    def __init__( # pylint: disable=too-many-arguments
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] = None, *, maxsize: int = 128,
+            policy: EvictionPolicy = 'lru', ttl: float = None, on_evict: Callable[[KT, VT], Any] = None,
+            timer: Callable[[], float] = monotonic, default: CDV = None, **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for CacheUDict (optional, you can use kwargs instead of it)
+        maxsize: Maximal count of items (optional)
+        policy: Eviction policy: `'lru'`, `'lfu'` or `'ttl'` (optional)
+        ttl: Time to live of items in seconds. It is required for `'ttl'` policy (optional)
+        on_evict: Function which is called with key and value of every evicted or expired item (optional)
+        timer: Function which returns current time in seconds (optional)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: maxsize isn't positive / unknown policy / `'ttl'` policy without ttl
+        """
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive.')
+        if policy not in ('lru', 'lfu', 'ttl'):
+            raise ValueError(f"Unknown eviction policy: {policy!r}. Use 'lru', 'lfu' or 'ttl'.")
+        if policy == 'ttl' and ttl is None:
+            raise ValueError("You must define ttl for 'ttl' eviction policy.")
+
+        super().__init__({}, default=default)
+        self.__maxsize = maxsize
+        self.__policy = policy
+        self.__ttl = ttl
+        self.__on_evict = on_evict
+        self.__timer = timer
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+        self.__order: dict[KT, None] = {} # lru: order of usage, other policies: order of adding
+        self.__deadlines: dict[KT, float] = {} # ordered by deadline, because ttl is the same for all items
+        self.__counts: dict[KT, int] = {} # lfu: count of usages of key
+        self.__buckets: dict[int, dict[KT, None]] = {} # lfu: count of usages -> keys in order of usage
+        self.__min_count = 0
+
+        if isinstance(dictionary, UDict):
+            dictionary = dictionary.dictionary
+        for k, v in (dictionary or kwargs).items():
+            self.__store(k, v)
+
+    # properties
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximal count of items
+        """
+        return self.__maxsize
+
+    @property
+    def policy(self) -> EvictionPolicy:
+        """
+        Eviction policy
+        """
+        return self.__policy
+
+    @property
+    def ttl(self) -> float | None:
+        """
+        Time to live of items in seconds
+        """
+        return self.__ttl
+
+    @property
+    def hits(self) -> int:
+        """
+        Count of successful lookups of keys
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Count of lookups of missing or expired keys
+        """
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Count of evicted and expired items
+        """
+        return self.__evictions
+
+    @property
+    def dictionary(self) -> dict[KT, VT]:
+        """
+        CacheUDict's dictionary. Don't change it directly, otherwise CacheUDict can't track usage of keys
+        """
+        return UDict.dictionary.fget(self)
+
+    @dictionary.setter
+    def dictionary(self, value: AnyDict[KT, VT]):
+        UDict.dictionary.fset(self, value)
+        self.__sync()
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys
+        """
+        return UDict.keys.fget(self)
+
+    @keys.setter
+    def keys(self, value: list[KT]):
+        UDict.keys.fset(self, value)
+        self.__sync()
+
+    @property
+    def values(self) -> list[VT]:
+        """
+        All dict's values
+        """
+        return UDict.values.fget(self)
+
+    @values.setter
+    def values(self, value: list[VT]):
+        UDict.values.fset(self, value)
+        self.__sync()
+
+    @property
+    def items(self) -> list[tuple[KT, VT]]:
+        """
+        All dict's items
+        """
+        return UDict.items.fget(self)
+
+    @items.setter
+    def items(self, value: list[tuple[KT, VT]]):
+        UDict.items.fset(self, value)
+        self.__sync()
+
+    def __raw(self) -> dict[KT, VT]:
+        # Changing dictionary directly doesn't update UDict's positional index (it will be rebuilt lazily),
+        # so adding and evicting of items is O(1)
+        return UDict.dictionary.fget(self)
+
+    # usage tracking
+    def __count(self, key: KT, count: int) -> None:
+        self.__counts[key] = count
+        self.__buckets.setdefault(count, {})[key] = None
+
+    def __uncount(self, key: KT) -> None:
+        count = self.__counts.pop(key)
+        bucket = self.__buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[count]
+
+    def __touch(self, key: KT) -> None:
+        if self.__policy == 'lru':
+            self.__order[key] = self.__order.pop(key)
+        elif self.__policy == 'lfu':
+            count = self.__counts[key]
+            self.__uncount(key)
+            self.__count(key, count + 1)
+            if count == self.__min_count and count not in self.__buckets:
+                self.__min_count = count + 1
+
+    def __track(self, key: KT) -> None:
+        self.__order[key] = None
+        if self.__ttl is not None:
+            self.__deadlines[key] = self.__timer() + self.__ttl
+        if self.__policy == 'lfu':
+            self.__count(key, 1)
+            self.__min_count = 1
+
+    def __untrack(self, key: KT) -> None:
+        del self.__order[key]
+        self.__deadlines.pop(key, None)
+        if self.__policy == 'lfu':
+            self.__uncount(key)
+
+    def __sync(self) -> None:
+        # Dictionary was replaced, so keys which aren't in it anymore are forgotten and new keys are tracked
+        keys = self.keys_view
+        for k in [k for k in self.__order if k not in keys]:
+            self.__untrack(k)
+        for k in keys:
+            if k not in self.__order:
+                self.__track(k)
+        while len(self.__order) > self.__maxsize:
+            self.__evict(self.__victim())
+
+    # eviction
+    def __expired(self, key: KT) -> bool:
+        return self.__ttl is not None and self.__deadlines[key] <= self.__timer()
+
+    def __purge_expired(self) -> None:
+        now = self.__timer()
+        while self.__deadlines:
+            key, deadline = next(iter(self.__deadlines.items()))
+            if deadline > now:
+                break
+            self.__evict(key)
+
+    def __victim(self) -> KT:
+        if self.__policy == 'lfu':
+            if self.__min_count not in self.__buckets: # keys with minimal count were deleted
+                self.__min_count = min(self.__buckets)
+            return next(iter(self.__buckets[self.__min_count]))
+        if self.__policy == 'ttl':
+            return next(iter(self.__deadlines))
+        return next(iter(self.__order))
+
+    def __evict(self, key: KT) -> None:
+        value = self.__raw().pop(key)
+        self.__untrack(key)
+        self.__evictions += 1
+        if self.__on_evict:
+            self.__on_evict(key, value)
+
+    # get/set/del items
+    def __lookup(self, key: KT, default: DV) -> VT | DV:
+        if key in self.__order and self.__expired(key):
+            self.__evict(key)
+        if key not in self.__order:
+            self.__misses += 1
+            return default
+        self.__hits += 1
+        self.__touch(key)
+        return self.__raw()[key]
+
+    def __store(self, key: KT, value: VT) -> None:
+        if self.__ttl is not None:
+            self.__purge_expired()
+        if key in self.__order:
+            self.__touch(key)
+            if self.__ttl is not None:
+                del self.__deadlines[key]
+                self.__deadlines[key] = self.__timer() + self.__ttl
+        else:
+            if len(self.__order) >= self.__maxsize:
+                self.__evict(self.__victim())
+            self.__track(key)
+        self.__raw()[key] = value
+
+    def __getitem__(self, key: KT | slice) -> VT | list[VT] | CDV:
+        if isinstance(key, slice):
+            return super().__getitem__(key)
+        return self.__lookup(key, self.default)
+
+    def __setitem__(self, key: KT | slice, value: VT | list[VT]) -> None:
+        if isinstance(key, slice):
+            super().__setitem__(key, value)
+        else:
+            self.__store(key, value)
+
+    def __delitem__(self, key: KT | slice) -> None:
+        if isinstance(key, slice):
+            super().__delitem__(key)
+            self.__sync()
+            return
+        if key not in self.__order:
+            raise KeyError(key)
+        self.__untrack(key)
+        del self.__raw()[key]
+
+    def get(
+            self, *, key: KT = None, index: int = None, value: VT = None,
+            default: DV | CDV = _ClassDefault
+    ) -> KT | VT | CDV | DV:
+        """
+        Get a value with key or it's index (see `UDict.get()`). Getting with key is counted in CacheUDict's stats
+        """
+        if key is not None and index is None and value is None:
+            return self.__lookup(key, self.default if default == _ClassDefault else default)
+        return super().get(key=key, index=index, value=value, default=default)
+
+    def __contains__(self, item: tuple[KT, VT] | list[KT | VT] | KT) -> bool:
+        key = item[0] if isinstance(item, (list, tuple)) else item
+        if key in self.__order and self.__expired(key):
+            return False
+        return super().__contains__(item)
+
+    # bulk operations
+    def update_many(
+            self, keys: Iterable[KT] | AnyDict[KT, VT] | UDict[KT, VT, Any] | Iterable[tuple[KT, VT]],
+            values: Iterable[VT] = None
+    ) -> None:
+        """
+        Sets values of several keys at once (see `UDict.update_many()`). Items are added one by one like with `[]`,
+        so CacheUDict doesn't become bigger than maxsize
+
+        Raises:
+        ValueError: Count of keys isn't equal to count of values
+        """
+        if values is not None:
+            items = zip(keys, values, strict=True)
+        elif isinstance(keys, Mapping):
+            items = keys.items()
+        else:
+            items = keys # UDict is iterated by items too
+        for k, v in items:
+            self.__store(k, v)
+
+    def pop_many(self, keys: Iterable[KT], default: DV = _ClassDefault) -> list[VT | DV]:
+        """
+        Deletes several keys and returns their values (see `UDict.pop_many()`)
+
+        Raises:
+        KeyError: Key is missing and default isn't defined
+        """
+        result = []
+        for k in keys:
+            if k in self.__order and self.__expired(k):
+                self.__evict(k)
+            if k in self.__order:
+                self.__untrack(k)
+                result.append(self.__raw().pop(k))
+            elif default == _ClassDefault:
+                raise KeyError(k)
+            else:
+                result.append(default)
+        return result
+
+    def setdefault_many(
+            self, keys: Iterable[KT] | AnyDict[KT, VT] | UDict[KT, VT, Any], default: VT = None
+    ) -> list[VT]:
+        """
+        Sets values of several keys if they are missing and returns values of all keys (see `UDict.setdefault_many()`).
+        Getting of every key is counted in CacheUDict's stats
+        """
+        if isinstance(keys, Mapping):
+            items = keys.items()
+        elif isinstance(keys, UDict):
+            items = keys
+        else:
+            items = zip(keys, repeat(default))
+
+        result = []
+        for k, v in items:
+            value = self.__lookup(k, _ClassDefault)
+            if value is _ClassDefault:
+                self.__store(k, v)
+                value = v
+            result.append(value)
+        return result
+
+    # In-place math operations
+    def __iadd__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> CacheUDict[KT, VT, CDV]:
+        if isinstance(other, UDict):
+            other = other.dictionary
+        for k, v in other.items():
+            self.__store(k, v)
+        return self
+
+    def __isub__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> CacheUDict[KT, VT, CDV]:
+        super().__isub__(other)
+        self.__sync()
+        return self
+
+    def __repr__(self) -> str:
+        return f'c{super().__repr__()}'
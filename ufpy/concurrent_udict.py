@@ -0,0 +1,236 @@
+"""
+ConcurrentUDict is a thread-safe UDict-like class. Its keys are sharded across several partitions
+and every partition has its own lock.
+"""
+
+from __future__ import annotations
+
+from threading import RLock
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict, _ClassDefault
+
+__all__ = (
+    'ConcurrentUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+
+class ConcurrentUDict(Generic[KT, VT, CDV]):
+    """
+    Thread-safe UDict. Keys are sharded across `shards` partitions by their hash, every partition has its own lock,
+    so threads which work with different keys don't wait for each other.
+
+    Reading of one key doesn't use locks. Operations with one key (`[]`, `get_or_set()`, `compute()`, `pop()`)
+    are atomic. `update_many()` is atomic for every partition, but not for all dict.
+
+    ConcurrentUDict doesn't have keys order, so integer keys are always keys (not indexes).
+    """
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] = None, *, shards: int = 16,
+            default: CDV = None, **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for ConcurrentUDict (optional, you can use kwargs instead of it)
+        shards: Count of partitions (optional)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: shards isn't positive
+        """
+        if shards <= 0:
+            raise ValueError('shards must be positive.')
+
+        self.__default = default
+        self.__shards: tuple[dict[KT, VT], ...] = tuple({} for _ in range(shards))
+        self.__locks: tuple[RLock, ...] = tuple(RLock() for _ in range(shards))
+
+        if isinstance(dictionary, UDict):
+            dictionary = dictionary.dictionary
+        self.update_many(dictionary or kwargs)
+
+    def __shard(self, key: KT) -> int:
+        return hash(key) % len(self.__shards)
+
+    # properties
+    @property
+    def shards(self) -> int:
+        """
+        Count of partitions
+        """
+        return len(self.__shards)
+
+    @property
+    def dictionary(self) -> dict[KT, VT]:
+        """
+        Copy of all ConcurrentUDict's items in a regular Python dictionary
+        """
+        d = {}
+        for shard, lock in zip(self.__shards, self.__locks):
+            with lock:
+                d.update(shard)
+        return d
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys
+        """
+        return list(self.dictionary.keys())
+
+    @property
+    def values(self) -> list[VT]:
+        """
+        All dict's values
+        """
+        return list(self.dictionary.values())
+
+    @property
+    def items(self) -> list[tuple[KT, VT]]:
+        """
+        All dict's items
+        """
+        return list(self.dictionary.items())
+
+    @property
+    def default(self) -> CDV:
+        """
+        The value that will be returned when .get() function or the [] operator are called
+        if the entered key is not in the ConcurrentUDict
+        """
+        return self.__default
+
+    @default.setter
+    def default(self, value: CDV):
+        self.__default = value
+
+    def to_udict(self) -> UDict[KT, VT, CDV]:
+        """
+        Converts ConcurrentUDict to UDict (snapshot of items)
+        """
+        return UDict(self.dictionary, default=self.__default)
+
+    # atomic operations
+    def get_or_set(self, key: KT, value: VT) -> VT:
+        """
+        Returns value of key. If key is missing, sets it to `value` and returns `value`
+        """
+        i = self.__shard(key)
+        with self.__locks[i]:
+            return self.__shards[i].setdefault(key, value)
+
+    def compute(self, key: KT, func: Callable[[KT, VT | CDV], VT]) -> VT:
+        """
+        Atomically sets value of key to result of `func` and returns it
+
+        Args:
+            func: First argument of function is key, second is current value (or default, if key is missing).
+            Returns new value
+        """
+        i = self.__shard(key)
+        with self.__locks[i]:
+            shard = self.__shards[i]
+            value = func(key, shard.get(key, self.__default))
+            shard[key] = value
+            return value
+
+    def update_many(self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any]) -> None:
+        """
+        Updates ConcurrentUDict with items of other dict. Every partition is locked only once
+        """
+        if isinstance(dictionary, UDict):
+            dictionary = dictionary.dictionary
+
+        groups: list[dict[KT, VT]] = [{} for _ in self.__shards]
+        for k, v in dictionary.items():
+            groups[self.__shard(k)][k] = v
+        for shard, lock, group in zip(self.__shards, self.__locks, groups):
+            if group:
+                with lock:
+                    shard.update(group)
+
+    def pop(self, key: KT, default: DV = _ClassDefault) -> VT | DV:
+        """
+        Deletes key and returns its value. If key is missing, returns default
+        (or raises KeyError, if default isn't defined)
+        """
+        i = self.__shard(key)
+        with self.__locks[i]:
+            if default == _ClassDefault:
+                return self.__shards[i].pop(key)
+            return self.__shards[i].pop(key, default)
+
+    def clear(self) -> None:
+        """
+        Deletes all items
+        """
+        for shard, lock in zip(self.__shards, self.__locks):
+            with lock:
+                shard.clear()
+
+    # get/set/del items
+    def __getitem__(self, key: KT) -> VT | CDV:
+        return self.__shards[self.__shard(key)].get(key, self.__default)
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        i = self.__shard(key)
+        with self.__locks[i]:
+            self.__shards[i][key] = value
+
+    def __delitem__(self, key: KT) -> None:
+        i = self.__shard(key)
+        with self.__locks[i]:
+            del self.__shards[i][key]
+
+    def get(self, key: KT, default: DV = _ClassDefault) -> VT | CDV | DV:
+        """
+        Get a value with key. If key is missing, returns default (if none -> ConcurrentUDict.default)
+        """
+        if default == _ClassDefault:
+            default = self.__default
+        return self.__shards[self.__shard(key)].get(key, default)
+
+    # Len, iterator, booleans
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.__shards)
+
+    def __iter__(self) -> Iterator[tuple[KT, VT]]:
+        """
+        Iterates snapshot of items, so dict can be changed while iterating
+        """
+        return iter(self.items)
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if `len(self)` equals `0`
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __contains__(self, item: tuple[KT, VT] | list[KT | VT] | KT) -> bool:
+        if isinstance(item, (list, tuple)):
+            k, v = item
+            i = self.__shard(k)
+            with self.__locks[i]:
+                return k in self.__shards[i] and self.__shards[i][k] == v
+        return item in self.__shards[self.__shard(item)]
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'ccu{self.dictionary}'
+
+    def __eq__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | ConcurrentUDict[KT, VT, Any]) -> bool:
+        if isinstance(other, (UDict, ConcurrentUDict)):
+            other = other.dictionary
+        return self.dictionary == other
+
+    def __ne__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | ConcurrentUDict[KT, VT, Any]) -> bool:
+        return not self == other
@@ -0,0 +1,420 @@
+"""
+NumericUDict is a UDict-like class for numeric values. Values are stored in a NumPy array,
+so math operations and reductions are vectorised.
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Iterator, overload, TypeVar
+
+import numpy as np
+
+from ufpy.cmp import cmp_generator
+from ufpy.math_op import i_generator
+from ufpy.typ import AnyDict, NumberLiteral
+from ufpy.udict import UDict
+from ufpy.utils import get_positions_from_slice_or_int
+
+__all__ = (
+    'NumericUDict',
+)
+
+KT = TypeVar('KT')
+DV = TypeVar('DV')
+
+type _NumericOperand = NumericUDict | UDict | dict | np.ndarray | NumberLiteral
+
+
+# pylint: disable=protected-access
+@cmp_generator
+@i_generator
+class NumericUDict(Generic[KT]):
+    """
+    UDict for numeric values. Keys are stored in an index and values are stored in a contiguous NumPy array.
+
+    Like in UDict, first index is 1 and `+`/`-` with dicts combine/subtract dicts,
+    while `*`/`/` with dicts multiply/divide values with the same keys.
+    Also, you can use all math operators with numbers and NumPy arrays of the same length.
+    """
+    @overload
+    def __init__(self, dictionary: AnyDict[KT, NumberLiteral] | UDict | NumericUDict): ...
+    @overload
+    def __init__(self, dictionary: AnyDict[KT, NumberLiteral] | UDict | NumericUDict, *, default: DV, dtype=None): ...
+    @overload
+    def __init__(self, **kwargs: NumberLiteral): ...
+    @overload
+    def __init__(self, *, default: DV, dtype=None, **kwargs: NumberLiteral): ...
+
+    def __init__(
+            self, dictionary: AnyDict[KT, NumberLiteral] | UDict | NumericUDict = None, *, default: DV = None,
+            dtype=None, **kwargs: NumberLiteral
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for NumericUDict (optional, you can use kwargs instead of it)
+        default: Value that is returned for missing keys (optional)
+        dtype: NumPy dtype of values. If it is not defined, NumPy chooses it (optional)
+        """
+        if isinstance(dictionary, NumericUDict):
+            keys, values = dictionary.keys, dictionary.array
+        else:
+            if isinstance(dictionary, UDict): # public lists don't change storage of UDict
+                keys, values = dictionary.keys, dictionary.values
+            else:
+                d = dictionary or kwargs
+                keys, values = list(d.keys()), list(d.values())
+
+        self.__default = default
+        self.__set_storage(keys, np.array(values, dtype=dtype))
+
+    def __set_storage(self, keys: list[KT], values: np.ndarray) -> None:
+        self.__keys = keys
+        self.__positions = {k: i for i, k in enumerate(keys)}
+        self.__values = values
+        self.__size = len(keys)
+
+    @classmethod
+    def __from_storage(cls, keys: list[KT], values: np.ndarray, default: DV) -> NumericUDict[KT]:
+        new = cls.__new__(cls)
+        new.__default = default
+        new.__set_storage(keys, values)
+        return new
+
+    # properties
+    @property
+    def array(self) -> np.ndarray:
+        """
+        NumPy array with values. It isn't a copy, so changes of it change NumericUDict
+        (until new keys are added to NumericUDict)
+        """
+        return self.__values[:self.__size]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        NumPy dtype of values
+        """
+        return self.__values.dtype
+
+    @property
+    def dictionary(self) -> dict[KT, NumberLiteral]:
+        """
+        NumericUDict's dictionary. A regular Python Dictionary (copy of NumericUDict's data)
+        """
+        return dict(zip(self.__keys, self.array.tolist()))
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys
+        """
+        return self.__keys.copy()
+
+    @property
+    def values(self) -> list[NumberLiteral]:
+        """
+        All dict's values
+        """
+        return self.array.tolist()
+
+    @property
+    def items(self) -> list[tuple[KT, NumberLiteral]]:
+        """
+        All dict's items
+        """
+        return list(zip(self.__keys, self.array.tolist()))
+
+    @property
+    def default(self) -> DV:
+        """
+        The value that will be returned when .get() function or the [] operator are called
+        if the entered key is not in the NumericUDict
+        """
+        return self.__default
+
+    @default.setter
+    def default(self, value: DV):
+        self.__default = value
+
+    def to_udict(self) -> UDict[KT, NumberLiteral, DV]:
+        """
+        Converts NumericUDict to UDict
+        """
+        return UDict(self.dictionary, default=self.__default)
+
+    def copy(self) -> NumericUDict[KT]:
+        """
+        Returns copy of NumericUDict
+        """
+        return self.__from_storage(self.__keys.copy(), self.array.copy(), self.__default)
+
+    def __copy__(self) -> NumericUDict[KT]:
+        return self.copy()
+
+    # get/set/del items
+    def __getitem__(self, key: KT | int | slice) -> NumberLiteral | list[NumberLiteral] | DV:
+        positions = get_positions_from_slice_or_int(key, self.__positions, 'NumericUDict')
+        if positions is None:
+            if key not in self.__positions:
+                return self.__default
+            return self.__values[self.__positions[key]].item()
+
+        l = self.array[positions].tolist()
+        return l if len(l) > 1 else l[0]
+
+    def __ensure_dtype(self, values: np.ndarray | NumberLiteral) -> None:
+        dtype = np.result_type(self.__values, values)
+        if dtype != self.__values.dtype:
+            self.__values = self.__values.astype(dtype)
+
+    def __append(self, key: KT, value: NumberLiteral) -> None:
+        if self.__size == len(self.__values): # amortised growth of array
+            new_values = np.empty(max(8, self.__size * 2), dtype=self.__values.dtype)
+            new_values[:self.__size] = self.array
+            self.__values = new_values
+        self.__keys.append(key)
+        self.__positions[key] = self.__size
+        self.__values[self.__size] = value
+        self.__size += 1
+
+    def __setitem__(self, key: KT | int | slice, value: NumberLiteral | list[NumberLiteral] | np.ndarray) -> None:
+        positions = get_positions_from_slice_or_int(key, self.__positions, 'NumericUDict')
+        values = np.asarray(value)
+        self.__ensure_dtype(values)
+
+        if positions is None:
+            if key in self.__positions:
+                self.__values[self.__positions[key]] = values
+            else:
+                self.__append(key, values)
+            return
+
+        if values.ndim and len(values) < len(positions):
+            values = np.concatenate((values, np.repeat(values[-1:], len(positions) - len(values))))
+        self.__values[:self.__size][positions] = values[:len(positions)] if values.ndim else values
+
+    def __delitem__(self, key: KT | int | slice) -> None:
+        positions = get_positions_from_slice_or_int(key, self.__positions, 'NumericUDict')
+        if positions is None:
+            positions = [self.__positions[key]]
+
+        values = np.delete(self.array, positions)
+        deleted = {i % self.__size for i in positions}
+        keys = [k for i, k in enumerate(self.__keys) if i not in deleted]
+        self.__set_storage(keys, values)
+
+    # get
+    def get(
+            self, *, key: KT = None, index: int = None, value: NumberLiteral = None, default: DV = None
+    ) -> KT | NumberLiteral | DV:
+        """
+        Get a value with key or it's index.
+
+        If value is defined, returns key
+
+        Parameters:
+        key: Key of value in dict (optional)
+        index: Index of value in dict (optional)
+        value: Value in dict (optional)
+        default: Default value (if none -> NumericUDict.default) (optional)
+
+        Raises:
+        ValueError: You defined 0 or 2 or 3 params (from `key`, `index` and `value`)
+        IndexError: index is bigger that length of dict
+        """
+        if [key, index, value].count(None) != 2:
+            raise ValueError('Please define one of key, index and value params.')
+
+        if default is None:
+            default = self.__default
+
+        if value is not None:
+            found = np.flatnonzero(self.array == value)
+            return self.__keys[found[0]] if len(found) else default
+        if index is not None:
+            if index == 0:
+                raise ValueError("You can't use 0 as index in NumericUDict. Use 1 index instead.")
+            if index > len(self):
+                raise IndexError('Index is bigger that length of NumericUDict.')
+            return self.array[index - 1].item()
+        return self.__values[self.__positions[key]].item() if key in self.__positions else default
+
+    # Len, iterator, booleans
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self) -> Iterator[tuple[KT, NumberLiteral]]:
+        return zip(self.__keys, self.array.tolist())
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if `len(self)` equals `0`
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __contains__(self, item: tuple[KT, NumberLiteral] | list[KT | NumberLiteral] | KT) -> bool:
+        if isinstance(item, (list, tuple)):
+            k, v = item
+            return k in self.__positions and bool(self.__values[self.__positions[k]] == v)
+        return item in self.__positions
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'nu{self.dictionary}'
+
+    # Comparing
+    def __cmp__(self, other: NumericUDict[KT] | UDict | dict) -> int:
+        return len(self) - len(other)
+
+    def __eq__(self, other: NumericUDict[KT] | UDict | dict) -> bool:
+        # Order of keys isn't compared, like in dicts
+        if isinstance(other, NumericUDict):
+            if self.__positions.keys() != other.__positions.keys():
+                return False
+            if self.__keys == other.__keys:
+                return np.array_equal(self.array, other.array)
+            return np.array_equal(self.array, other.array[[other.__positions[k] for k in self.__keys]])
+        if isinstance(other, UDict):
+            other = dict(other.items)
+        return self.dictionary == other
+
+    def __ne__(self, other: NumericUDict[KT] | UDict | dict) -> bool:
+        return not self == other
+
+    # Reductions
+    def sum(self) -> NumberLiteral:
+        """
+        Sum of all values
+        """
+        return self.array.sum().item()
+
+    def mean(self) -> NumberLiteral:
+        """
+        Average value
+        """
+        return self.array.mean().item()
+
+    def min(self) -> NumberLiteral:
+        """
+        Minimal value
+        """
+        return self.array.min().item()
+
+    def max(self) -> NumberLiteral:
+        """
+        Maximal value
+        """
+        return self.array.max().item()
+
+    def argmin(self) -> KT:
+        """
+        Key of minimal value
+        """
+        return self.__keys[self.array.argmin()]
+
+    def argmax(self) -> KT:
+        """
+        Key of maximal value
+        """
+        return self.__keys[self.array.argmax()]
+
+    # Math operations
+    def __align(self, other: NumericUDict | UDict | dict) -> tuple[list[KT], np.ndarray, np.ndarray | None]:
+        # Returns other's keys, other's values and positions of other's keys in self (None if keys are the same)
+        if isinstance(other, NumericUDict):
+            keys, values = other.__keys, other.array
+            if keys == self.__keys:
+                return keys, values, None
+        else:
+            if isinstance(other, UDict):
+                keys, values = other.keys, other.values
+            else:
+                keys, values = list(other.keys()), list(other.values())
+            # NumPy creates float array for empty list, so empty dict gets dtype of NumericUDict
+            values = np.array(values) if values else np.empty(0, dtype=self.dtype)
+        positions = np.fromiter((self.__positions.get(k, -1) for k in keys), dtype=np.intp, count=len(keys))
+        return keys, values, positions
+
+    def __apply(self, other: _NumericOperand, ufunc: np.ufunc) -> NumericUDict[KT]:
+        if not isinstance(other, (NumericUDict, UDict, dict)):
+            return self.__from_storage(self.__keys.copy(), ufunc(self.array, other), self.__default)
+
+        keys, values, positions = self.__align(other)
+        if positions is None:
+            return self.__from_storage(self.__keys.copy(), ufunc(self.array, values), self.__default)
+        if (positions < 0).any():
+            raise KeyError(keys[np.argmin(positions)])
+
+        result = ufunc(self.array[positions], values)
+        new_values = self.array.astype(np.result_type(result, self.array))
+        new_values[positions] = result
+        return self.__from_storage(self.__keys.copy(), new_values, self.__default)
+
+    def __add__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        """
+        Combines NumericUDict with dict / adds number or array to all values
+        """
+        if not isinstance(other, (NumericUDict, UDict, dict)):
+            return self.__apply(other, np.add)
+
+        keys, values, positions = self.__align(other)
+        if positions is None:
+            return self.__from_storage(self.__keys.copy(), values.copy(), self.__default)
+
+        new_keys = [k for k, i in zip(keys, positions) if i < 0]
+        new_values = np.concatenate((self.array, values[positions < 0]))
+        new_values[positions[positions >= 0]] = values[positions >= 0]
+        return self.__from_storage(self.__keys + new_keys, new_values, self.__default)
+
+    def __sub__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        """
+        Subtracts dict from NumericUDict / subtracts number or array from all values
+        """
+        if not isinstance(other, (NumericUDict, UDict, dict)):
+            return self.__apply(other, np.subtract)
+
+        _, values, positions = self.__align(other)
+        if positions is None:
+            positions = np.arange(self.__size)
+        found = positions >= 0
+        positions = positions[found]
+        deleted = positions[self.array[positions] == values[found]]
+
+        deleted_set = set(deleted.tolist())
+        keys = [k for i, k in enumerate(self.__keys) if i not in deleted_set]
+        return self.__from_storage(keys, np.delete(self.array, deleted), self.__default)
+
+    def __mul__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        """
+        Multiplies each value by another value with the same key or all values by number or array
+        """
+        return self.__apply(other, np.multiply)
+
+    def __truediv__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        """
+        Divides each value by another value with the same key or all values by number or array
+        """
+        return self.__apply(other, np.true_divide)
+
+    # Like in UDict, reflected operations with dicts are the same as usual ones
+    def __radd__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        return self + other
+
+    def __rsub__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        if isinstance(other, (UDict, dict)):
+            return self - other
+        return self.__from_storage(self.__keys.copy(), np.subtract(other, self.array), self.__default)
+
+    def __rmul__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        return self * other
+
+    def __rtruediv__(self, other: _NumericOperand) -> NumericUDict[KT]:
+        if isinstance(other, (UDict, dict)):
+            return self / other
+        return self.__from_storage(self.__keys.copy(), np.true_divide(other, self.array), self.__default)
+
+    def __neg__(self) -> NumericUDict[KT]:
+        return self.__from_storage(self.__keys.copy(), -self.array, self.__default)
@@ -0,0 +1,582 @@
+"""
+PersistentUDict is a UDict-like class which keeps its items in memory-mapped files, so they survive restarts.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from hashlib import blake2b
+from mmap import mmap
+from struct import Struct
+from typing import Any, BinaryIO, Generic, Iterator, TypeVar
+
+from ufpy.cmp import cmp_generator
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict, _ClassDefault
+from ufpy.utils import expand_values_for_several_keys, get_positions_from_slice_or_int
+
+__all__ = (
+    'PersistentUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+# Index file: header and hash table with open addressing (linear probing)
+_INDEX_MAGIC = b'UFPYPIDX'
+_INDEX_HEADER = Struct('<8sQQQQQQ') # magic, capacity, count, used slots, next seq, end of data, garbage bytes
+_SLOT = Struct('<QQQ') # hash of key, offset of record in data file, seq (order of adding)
+_EMPTY = 0
+_DELETED = 2 ** 64 - 1
+_MIN_CAPACITY = 64
+
+# Data file: magic and records (key length, value length, key, value). Records are only appended
+_DATA_MAGIC = b'UFPYPDAT'
+_RECORD = Struct('<II')
+_MIN_DATA_SIZE = 4096
+
+_PROTOCOL = 5
+
+
+def _dump(o: Any) -> bytes:
+    return pickle.dumps(o, _PROTOCOL)
+
+
+def _canonical(key: Any) -> bytes:
+    # Equal keys have equal canonical form. Pickled bytes can't be used instead of it: they depend on order of
+    # frozenset's items and on shared references in tuples
+    if key is None:
+        tag, data = b'n', b''
+    elif isinstance(key, (bool, int)) or isinstance(key, float) and key.is_integer():
+        tag, data = b'i', str(int(key)).encode() # 1 == 1.0 == True
+    elif isinstance(key, float):
+        tag, data = b'f', key.hex().encode()
+    elif isinstance(key, str):
+        tag, data = b's', key.encode('utf-8', 'surrogatepass')
+    elif isinstance(key, bytes):
+        tag, data = b'b', key
+    elif isinstance(key, tuple):
+        tag, data = b't', b''.join(map(_canonical, key))
+    elif isinstance(key, frozenset):
+        tag, data = b'z', b''.join(sorted(map(_canonical, key)))
+    else:
+        raise TypeError(
+            f"Unsupported key type: '{type(key).__name__}'. "
+            "Keys can be None, bool, int, float, str, bytes and tuples or frozensets of them."
+        )
+    return tag + len(data).to_bytes(8, 'little') + data
+
+
+def _hash(key: Any) -> int:
+    # hash() of str is different in every process, so stable hash of canonical form of key is used
+    return int.from_bytes(blake2b(_canonical(key), digest_size=8).digest(), 'little')
+
+
+def _create(path: str, capacity: int) -> None:
+    with open(path, 'wb') as f:
+        f.write(_DATA_MAGIC)
+        f.truncate(_MIN_DATA_SIZE)
+    with open(f'{path}.index', 'wb') as f:
+        f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, capacity, 0, 0, 0, len(_DATA_MAGIC), 0))
+        f.truncate(_INDEX_HEADER.size + capacity * _SLOT.size)
+
+
+# pylint: disable=protected-access
+@cmp_generator
+class PersistentUDict(Generic[KT, VT, CDV]): # pylint: disable=too-many-instance-attributes
+    """
+    UDict which keeps its items in two memory-mapped files: `path` (records with keys and values)
+    and `path + '.index'` (hash index of keys). Opening doesn't read all files, values are loaded on access.
+
+    Changing of one item is O(1): new record is appended to data file and index points to it.
+    Old records stay in file until `compact()` is called.
+
+    Values must be picklable. Keys are compared like in dict (`1` and `1.0` are the same key), but their hashes must be
+    the same in every process, so keys can be only None, bool, int, float, str, bytes and tuples or frozensets
+    of them. Like in UDict, first index is 1.
+    """
+    def __init__(
+            self, path: str | os.PathLike[str], dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] = None, *,
+            default: CDV = None, **kwargs: VT
+    ):
+        """
+        Parameters:
+        path: Path to data file. If files don't exist, they are created
+        dictionary: Items which are added to PersistentUDict (optional, you can use kwargs instead of it)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: Files aren't PersistentUDict's files
+        TypeError: Unsupported type of key
+        """
+        self.__path = os.fspath(path)
+        self.__default = default
+        self.__keys: list[KT] | None = None # positional index, built lazily
+        self.__open()
+
+        if isinstance(dictionary, (UDict, PersistentUDict)):
+            dictionary = dictionary.dictionary
+        self.update(dictionary or kwargs)
+
+    # files
+    def __open(self) -> None:
+        index_path = f'{self.__path}.index'
+        if not os.path.exists(self.__path) and not os.path.exists(index_path):
+            _create(self.__path, _MIN_CAPACITY)
+        elif not (
+                os.path.exists(self.__path) and os.path.getsize(self.__path) >= len(_DATA_MAGIC)
+                and os.path.exists(index_path) and os.path.getsize(index_path) >= _INDEX_HEADER.size
+        ):
+            raise ValueError(f"{self.__path} isn't PersistentUDict's file.")
+
+        self.__data_file: BinaryIO = open(self.__path, 'r+b') # pylint: disable=consider-using-with
+        self.__index_file: BinaryIO = open(index_path, 'r+b') # pylint: disable=consider-using-with
+        self.__data = mmap(self.__data_file.fileno(), 0)
+        self.__index = mmap(self.__index_file.fileno(), 0)
+
+        magic, self.__capacity, self.__count, self.__used, self.__seq, self.__end, self.__garbage = \
+            _INDEX_HEADER.unpack_from(self.__index)
+        if magic != _INDEX_MAGIC or self.__data[:len(_DATA_MAGIC)] != _DATA_MAGIC:
+            self.close()
+            raise ValueError(f"{self.__path} isn't PersistentUDict's file.")
+
+    def __write_header(self) -> None:
+        _INDEX_HEADER.pack_into(
+            self.__index, 0, _INDEX_MAGIC, self.__capacity, self.__count, self.__used, self.__seq, self.__end,
+            self.__garbage
+        )
+
+    @staticmethod
+    def __remap(file: BinaryIO, old: mmap, size: int) -> mmap:
+        old.close()
+        file.truncate(size)
+        return mmap(file.fileno(), 0)
+
+    def flush(self) -> None:
+        """
+        Writes all changes to disk
+        """
+        self.__data.flush()
+        self.__index.flush()
+
+    def close(self) -> None:
+        """
+        Writes all changes to disk and closes files. PersistentUDict can't be used after closing
+        """
+        if not self.__data.closed:
+            self.flush()
+            self.__data.close()
+            self.__index.close()
+        self.__data_file.close()
+        self.__index_file.close()
+
+    def __enter__(self) -> PersistentUDict[KT, VT, CDV]:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def compact(self) -> None:
+        """
+        Rewrites files without old records of changed and deleted items
+        """
+        path = f'{self.__path}.tmp'
+        capacity = _MIN_CAPACITY
+        while len(self) * 3 >= capacity:
+            capacity *= 2
+        _create(path, capacity)
+
+        new = PersistentUDict(path)
+        for _, key_hash, offset in sorted((seq, key_hash, offset) for key_hash, offset, seq in self.__slots()):
+            new.__insert(new.__free_slot(key_hash), key_hash, new.__append(*self.__raw_record(offset)))
+        new.__write_header()
+        new.close()
+
+        self.close()
+        os.replace(f'{path}.index', f'{self.__path}.index')
+        os.replace(path, self.__path)
+        self.__open()
+
+    # records
+    def __append(self, key: bytes, value: bytes) -> int:
+        offset = self.__end
+        size = _RECORD.size + len(key) + len(value)
+        if offset + size > len(self.__data):
+            self.__data = self.__remap(self.__data_file, self.__data, max(len(self.__data) * 2, offset + size))
+
+        _RECORD.pack_into(self.__data, offset, len(key), len(value))
+        start = offset + _RECORD.size
+        self.__data[start:start + len(key)] = key
+        self.__data[start + len(key):offset + size] = value
+        self.__end += size
+        return offset
+
+    def __record_size(self, offset: int) -> int:
+        key_size, value_size = _RECORD.unpack_from(self.__data, offset)
+        return _RECORD.size + key_size + value_size
+
+    def __raw_record(self, offset: int) -> tuple[bytes, bytes]:
+        key_size, value_size = _RECORD.unpack_from(self.__data, offset)
+        start = offset + _RECORD.size
+        return self.__data[start:start + key_size], self.__data[start + key_size:start + key_size + value_size]
+
+    def __record_key(self, offset: int) -> bytes:
+        key_size, _ = _RECORD.unpack_from(self.__data, offset)
+        return self.__data[offset + _RECORD.size:offset + _RECORD.size + key_size]
+
+    def __record_value(self, offset: int) -> VT:
+        key_size, value_size = _RECORD.unpack_from(self.__data, offset)
+        start = offset + _RECORD.size + key_size
+        return pickle.loads(self.__data[start:start + value_size])
+
+    def __record_item(self, offset: int) -> tuple[KT, VT]:
+        key, value = self.__raw_record(offset)
+        return pickle.loads(key), pickle.loads(value)
+
+    # hash index
+    @staticmethod
+    def __slot_position(slot: int) -> int:
+        return _INDEX_HEADER.size + slot * _SLOT.size
+
+    def __find(self, key: KT, key_hash: int) -> tuple[int, bool]:
+        # Returns slot of key and True or slot where key can be inserted and False.
+        # Equal keys can have different pickled bytes, so keys with the same hash are unpickled and compared
+        slot = key_hash % self.__capacity
+        free = -1
+        while True:
+            slot_hash, offset, _ = _SLOT.unpack_from(self.__index, self.__slot_position(slot))
+            if offset == _EMPTY:
+                return (slot if free < 0 else free), False
+            if offset == _DELETED:
+                if free < 0:
+                    free = slot
+            elif slot_hash == key_hash and pickle.loads(self.__record_key(offset)) == key:
+                return slot, True
+            slot = (slot + 1) % self.__capacity
+
+    def __free_slot(self, key_hash: int) -> int:
+        # Empty slot for key which isn't in hash table
+        slot = key_hash % self.__capacity
+        while _SLOT.unpack_from(self.__index, self.__slot_position(slot))[1] != _EMPTY:
+            slot = (slot + 1) % self.__capacity
+        return slot
+
+    def __insert(self, slot: int, key_hash: int, offset: int) -> None:
+        # Adds new key to free slot
+        position = self.__slot_position(slot)
+        if _SLOT.unpack_from(self.__index, position)[1] == _EMPTY:
+            self.__used += 1
+        _SLOT.pack_into(self.__index, position, key_hash, offset, self.__seq)
+        self.__seq += 1
+        self.__count += 1
+
+    def __slots(self) -> Iterator[tuple[int, int, int]]:
+        end = self.__slot_position(self.__capacity)
+        return (
+            slot for slot in _SLOT.iter_unpack(self.__index[_INDEX_HEADER.size:end])
+            if slot[1] not in (_EMPTY, _DELETED)
+        )
+
+    def __offsets(self) -> list[int]:
+        # Offsets of records of all items in order of adding
+        return [offset for _, offset in sorted((seq, offset) for _, offset, seq in self.__slots())]
+
+    def __resize(self) -> None:
+        # Rebuilds hash table. It is called when there are too few empty slots
+        slots = list(self.__slots())
+        capacity = _MIN_CAPACITY
+        while (len(slots) + 1) * 3 >= capacity:
+            capacity *= 2
+
+        self.__index.close()
+        self.__index_file.truncate(_INDEX_HEADER.size) # all slots become empty
+        self.__index_file.truncate(self.__slot_position(capacity))
+        self.__index = mmap(self.__index_file.fileno(), 0)
+        self.__capacity = capacity
+        self.__used = len(slots)
+        for key_hash, offset, seq in slots:
+            _SLOT.pack_into(self.__index, self.__slot_position(self.__free_slot(key_hash)), key_hash, offset, seq)
+        self.__write_header()
+
+    # items
+    def __lookup(self, key: KT) -> int | None:
+        slot, found = self.__find(key, _hash(key))
+        return _SLOT.unpack_from(self.__index, self.__slot_position(slot))[1] if found else None
+
+    def __load(self, key: KT, default: DV) -> VT | DV:
+        offset = self.__lookup(key)
+        return default if offset is None else self.__record_value(offset)
+
+    def __value(self, key: KT) -> VT:
+        offset = self.__lookup(key)
+        if offset is None:
+            raise KeyError(key)
+        return self.__record_value(offset)
+
+    def __store(self, key: KT, value: VT) -> None:
+        if (self.__used + 1) * 3 >= self.__capacity * 2:
+            self.__resize()
+
+        key_hash = _hash(key)
+        slot, found = self.__find(key, key_hash)
+        offset = self.__append(_dump(key), _dump(value))
+        if found:
+            position = self.__slot_position(slot)
+            _, old, seq = _SLOT.unpack_from(self.__index, position)
+            self.__garbage += self.__record_size(old)
+            _SLOT.pack_into(self.__index, position, key_hash, offset, seq)
+        else:
+            self.__insert(slot, key_hash, offset)
+            if self.__keys is not None:
+                self.__keys.append(key)
+        self.__write_header()
+
+    def __remove(self, key: KT) -> None:
+        slot, found = self.__find(key, _hash(key))
+        if not found:
+            raise KeyError(key)
+
+        position = self.__slot_position(slot)
+        self.__garbage += self.__record_size(_SLOT.unpack_from(self.__index, position)[1])
+        _SLOT.pack_into(self.__index, position, 0, _DELETED, 0)
+        self.__count -= 1
+        self.__write_header()
+
+        if self.__keys is not None:
+            if self.__keys[-1] == key:
+                self.__keys.pop()
+            else:
+                self.__keys.remove(key)
+
+    def update(self, other: AnyDict[KT, VT] | UDict[KT, VT, Any] | PersistentUDict[KT, VT, Any]) -> None:
+        """
+        Updates PersistentUDict with items of other dict
+        """
+        if isinstance(other, (UDict, PersistentUDict)):
+            other = other.dictionary
+        for k, v in other.items():
+            self.__store(k, v)
+
+    # properties
+    @property
+    def path(self) -> str:
+        """
+        Path to data file
+        """
+        return self.__path
+
+    @property
+    def garbage(self) -> int:
+        """
+        Size of old records in bytes. They are deleted by `compact()`
+        """
+        return self.__garbage
+
+    @property
+    def dictionary(self) -> dict[KT, VT]:
+        """
+        Copy of all PersistentUDict's items in a regular Python dictionary (all values are loaded)
+        """
+        return {k: v for k, v in self} # pylint: disable=unnecessary-comprehension
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys
+        """
+        return self.__key_index().copy()
+
+    @property
+    def values(self) -> list[VT]:
+        """
+        All dict's values
+        """
+        return [self.__record_value(offset) for offset in self.__offsets()]
+
+    @property
+    def items(self) -> list[tuple[KT, VT]]:
+        """
+        All dict's items
+        """
+        return list(self)
+
+    @property
+    def default(self) -> CDV:
+        """
+        The value that will be returned when .get() function or the [] operator are called
+        if the entered key is not in the PersistentUDict
+        """
+        return self.__default
+
+    @default.setter
+    def default(self, value: CDV):
+        self.__default = value
+
+    def to_udict(self) -> UDict[KT, VT, CDV]:
+        """
+        Loads all items to UDict
+        """
+        return UDict(self.dictionary, default=self.__default)
+
+    # get/set/del items
+    def __key_index(self) -> list[KT]:
+        if self.__keys is None:
+            self.__keys = [pickle.loads(self.__record_key(offset)) for offset in self.__offsets()]
+        return self.__keys
+
+    def __get_keys_from_slice_or_int(self, key: KT | int | slice) -> list[KT]:
+        positions = get_positions_from_slice_or_int(key, self, 'PersistentUDict')
+        if positions is None:
+            return [key]
+        keys = self.__key_index()
+        return [keys[i] for i in positions]
+
+    def __getitem__(self, key: KT | int | slice) -> VT | list[VT] | CDV:
+        l = [self.__load(k, self.__default) for k in self.__get_keys_from_slice_or_int(key)]
+        return l if len(l) > 1 else l[0]
+
+    def __setitem__(self, key: KT | int | slice, value: VT | list[VT]) -> None:
+        keys = self.__get_keys_from_slice_or_int(key)
+        values = expand_values_for_several_keys(value, len(keys))
+
+        for k, v in zip(keys, values):
+            self.__store(k, v)
+
+    def __delitem__(self, key: KT | int | slice) -> None:
+        for k in self.__get_keys_from_slice_or_int(key):
+            self.__remove(k)
+
+    def get(
+            self, *, key: KT = None, index: int = None, value: VT = None, default: DV = _ClassDefault
+    ) -> KT | VT | CDV | DV:
+        """
+        Get a value with key or it's index.
+
+        If value is defined, returns key
+
+        Parameters:
+        key: Key of value in dict (optional)
+        index: Index of value in dict (optional)
+        value: Value in dict (optional)
+        default: Default value (if none -> PersistentUDict.default) (optional)
+
+        Raises:
+        ValueError: You defined 0 or 2 or 3 params (from `key`, `index` and `value`)
+        IndexError: index is bigger that length of dict
+        """
+        if [key, index, value].count(None) != 2:
+            raise ValueError('Please define one of key, index and value params.')
+
+        if default == _ClassDefault:
+            default = self.__default
+
+        if value is not None:
+            return next((k for k, v in self if v == value), default)
+        if index is not None:
+            if index > len(self):
+                raise IndexError('Index is bigger that length of PersistentUDict.')
+            return self.__load(self.__key_index()[index - 1], default)
+        return self.__load(key, default)
+
+    # Len, iterator, booleans
+    def __len__(self) -> int:
+        return self.__count
+
+    def __iter__(self) -> Iterator[tuple[KT, VT]]:
+        return (self.__record_item(offset) for offset in self.__offsets())
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if `len(self)` equals `0`
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __contains__(self, item: tuple[KT, VT] | list[KT | VT] | KT) -> bool:
+        if isinstance(item, (list, tuple)):
+            k, v = item
+            offset = self.__lookup(k)
+            return offset is not None and self.__record_value(offset) == v
+        return self.__lookup(item) is not None
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'pu{self.dictionary}'
+
+    # Comparing
+    def __cmp__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | PersistentUDict[KT, VT, Any]) -> int:
+        return len(self) - len(other)
+
+    def __eq__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | PersistentUDict[KT, VT, Any]) -> bool:
+        if isinstance(other, (UDict, PersistentUDict)):
+            other = other.dictionary
+        return self.dictionary == other
+
+    def __ne__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | PersistentUDict[KT, VT, Any]) -> bool:
+        return not self == other
+
+    # Math operations (results are regular UDicts)
+    def __add__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> UDict[KT, VT, CDV]:
+        return self.to_udict() + other
+
+    def __sub__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> UDict[KT, VT, CDV]:
+        return self.to_udict() - other
+
+    def __mul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        return self.to_udict() * other
+
+    def __truediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        return self.to_udict() / other
+
+    def __neg__(self) -> UDict[KT, VT, CDV]:
+        return -self.to_udict()
+
+    # In-place math operations (they change files)
+    def __iadd__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> PersistentUDict[KT, VT, CDV]:
+        self.update(other)
+        return self
+
+    def __isub__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> PersistentUDict[KT, VT, CDV]:
+        if isinstance(other, (UDict, PersistentUDict)):
+            other = other.dictionary
+        for k, v in other.items():
+            if (k, v) in self:
+                self.__remove(k)
+        return self
+
+    def __imul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> PersistentUDict[KT, VT, CDV]:
+        if isinstance(other, (int, float)):
+            for k, v in self.items:
+                self.__store(k, v * other)
+            return self
+
+        if isinstance(other, (UDict, PersistentUDict)):
+            other = other.dictionary
+        for k, v in other.items():
+            self.__store(k, self.__value(k) * v)
+        return self
+
+    def __itruediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> PersistentUDict[KT, VT, CDV]:
+        if isinstance(other, (int, float)):
+            for k, v in self.items:
+                self.__store(k, v / other)
+            return self
+
+        if isinstance(other, (UDict, PersistentUDict)):
+            other = other.dictionary
+        for k, v in other.items():
+            self.__store(k, self.__value(k) / v)
+        return self
@@ -0,0 +1,250 @@
+"""
+Compact binary format for UDict, Stack and their contents.
+
+Every value is written as 1-byte tag and payload. Lists of ints or floats (for example, values of numeric dicts)
+are written as raw buffer of `array.array`, so they are converted without loops in Python.
+Values of unknown types are pickled, so data from untrusted sources must not be read: unpickling can execute
+any code.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sys
+from array import array
+from struct import Struct
+from typing import Any
+
+from ufpy.udict import UDict # pylint: disable=cyclic-import
+from ufpy.ustl.stack import Stack
+
+__all__ = (
+    'to_bytes',
+    'from_bytes',
+)
+
+_MAGIC = b'UFB\x01'
+
+_NONE, _TRUE, _FALSE = b'N', b'T', b'F'
+_INT, _BIG_INT, _FLOAT = b'i', b'I', b'f'
+_STR, _BYTES, _PICKLE = b's', b'b', b'p'
+_LIST, _TUPLE, _DICT = b'l', b't', b'd'
+_UDICT, _STACK = b'u', b'S'
+_ARRAY = b'a' # followed by typecode of array
+
+_INT_TYPECODES = ('b', 'h', 'i', 'q') # the smallest of them which fits all ints is used
+
+_LEN = Struct('<I')
+_INT64 = Struct('<q')
+_FLOAT64 = Struct('<d')
+
+_BIG_ENDIAN = sys.byteorder == 'big' # arrays are stored in little-endian order
+
+_CONSTANTS = {_NONE: None, _TRUE: True, _FALSE: False}
+
+
+def _array_typecode(values: list | tuple) -> str | None:
+    types = set(map(type, values))
+    if types == {float}:
+        return 'd'
+    if types == {int}:
+        lo, hi = min(values), max(values)
+        for typecode in _INT_TYPECODES:
+            bits = array(typecode).itemsize * 8 - 1
+            if -2 ** bits <= lo and hi < 2 ** bits:
+                return typecode
+    return None
+
+
+class _Writer:
+    """
+    Writes objects to bytes in ufpy binary format
+    """
+    def __init__(self):
+        self.__buffer = bytearray(_MAGIC)
+
+    def getvalue(self) -> bytes:
+        """
+        Written bytes
+        """
+        return bytes(self.__buffer)
+
+    def __sized(self, tag: bytes, data: bytes) -> None:
+        self.__buffer += tag
+        self.__buffer += _LEN.pack(len(data))
+        self.__buffer += data
+
+    def __sequence(self, tag: bytes, values: list | tuple) -> None:
+        self.__buffer += tag
+        typecode = _array_typecode(values)
+        if typecode:
+            a = array(typecode, values)
+            if _BIG_ENDIAN:
+                a.byteswap()
+            self.__buffer += _ARRAY
+            self.__sized(typecode.encode(), a.tobytes())
+            return
+
+        self.__buffer += _LIST
+        self.__buffer += _LEN.pack(len(values))
+        for v in values:
+            self.write(v)
+
+    def __dictionary(self, d: dict) -> None:
+        self.__buffer += _DICT
+        self.__sequence(b'', tuple(d.keys()))
+        self.__sequence(b'', tuple(d.values()))
+
+    def write(self, o: Any) -> None: # pylint: disable=too-many-branches
+        """
+        Writes object
+        """
+        t = type(o)
+        if o is None:
+            self.__buffer += _NONE
+        elif t is bool:
+            self.__buffer += _TRUE if o else _FALSE
+        elif t is int:
+            if -2 ** 63 <= o < 2 ** 63:
+                self.__buffer += _INT
+                self.__buffer += _INT64.pack(o)
+            else:
+                self.__sized(_BIG_INT, o.to_bytes((o.bit_length() + 8) // 8, 'little', signed=True))
+        elif t is float:
+            self.__buffer += _FLOAT
+            self.__buffer += _FLOAT64.pack(o)
+        elif t is str:
+            self.__sized(_STR, o.encode('utf-8'))
+        elif t is bytes:
+            self.__sized(_BYTES, o)
+        elif t is list:
+            self.__sequence(_LIST, o)
+        elif t is tuple:
+            self.__sequence(_TUPLE, o)
+        elif t is dict:
+            self.__dictionary(o)
+        elif t is UDict:
+            dictionary, default, index_values, _ = o.__getstate__()
+            self.__buffer += _UDICT
+            self.write(default)
+            self.write(index_values)
+            self.__dictionary(dictionary)
+        elif t is Stack:
+            self.__buffer += _STACK
+            self.write(o.typecode)
+            self.__sequence(b'', o.elements)
+        else:
+            self.__sized(_PICKLE, pickle.dumps(o, pickle.HIGHEST_PROTOCOL))
+
+
+class _Reader:
+    """
+    Reads objects from bytes in ufpy binary format
+    """
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.__data = memoryview(data)
+        if self.__data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("Data isn't in ufpy binary format.")
+        self.__position = len(_MAGIC)
+
+    @property
+    def at_end(self) -> bool:
+        """
+        True if all data is read
+        """
+        return self.__position == len(self.__data)
+
+    def __skip(self, n: int) -> int:
+        # Returns position before skipped bytes
+        if self.__position + n > len(self.__data):
+            raise ValueError('Data is truncated.')
+        self.__position += n
+        return self.__position - n
+
+    def __tag(self) -> bytes:
+        position = self.__skip(1)
+        return bytes(self.__data[position:position + 1])
+
+    def __unpack(self, s: Struct) -> Any:
+        value, = s.unpack_from(self.__data, self.__skip(s.size))
+        return value
+
+    def __chunk(self) -> memoryview:
+        n = self.__unpack(_LEN)
+        position = self.__skip(n)
+        return self.__data[position:position + n]
+
+    def __sequence(self) -> list:
+        if self.__tag() == _ARRAY:
+            a = array(self.__tag().decode())
+            a.frombytes(self.__chunk())
+            if _BIG_ENDIAN:
+                a.byteswap()
+            return a.tolist()
+        return [self.read() for _ in range(self.__unpack(_LEN))]
+
+    def __dictionary(self) -> dict:
+        keys = self.__sequence()
+        return dict(zip(keys, self.__sequence()))
+
+    def read(self) -> Any: # pylint: disable=too-many-return-statements
+        """
+        Reads object
+
+        Raises:
+        ValueError: Data is corrupted
+        """
+        tag = self.__tag()
+        if tag in _CONSTANTS:
+            return _CONSTANTS[tag]
+        if tag == _INT:
+            return self.__unpack(_INT64)
+        if tag == _FLOAT:
+            return self.__unpack(_FLOAT64)
+        if tag == _BIG_INT:
+            return int.from_bytes(self.__chunk(), 'little', signed=True)
+        if tag == _STR:
+            return str(self.__chunk(), 'utf-8')
+        if tag == _BYTES:
+            return bytes(self.__chunk())
+        if tag == _PICKLE:
+            return pickle.loads(self.__chunk())
+        if tag == _LIST:
+            return self.__sequence()
+        if tag == _TUPLE:
+            return tuple(self.__sequence())
+        if tag == _DICT:
+            return self.__dictionary()
+        if tag == _UDICT:
+            default, index_values = self.read(), self.read()
+            return UDict(self.read(), default=default, index_values=index_values)
+        if tag == _STACK:
+            typecode = self.read()
+            return Stack(iterable=self.__sequence(), typecode=typecode)
+        raise ValueError(f'Unknown tag: {tag!r}. Data is corrupted.')
+
+
+def to_bytes(o: Any) -> bytes:
+    """
+    Converts object (UDict, Stack, dict, list, etc.) to bytes in ufpy binary format.
+    Values of unknown types are pickled
+    """
+    writer = _Writer()
+    writer.write(o)
+    return writer.getvalue()
+
+
+def from_bytes(data: bytes | bytearray | memoryview) -> Any:
+    """
+    Converts bytes in ufpy binary format to object.
+    Don't use it with data from untrusted sources: values of unknown types are unpickled, and unpickling
+    can execute any code
+
+    Raises:
+    ValueError: Data isn't in ufpy binary format or it is truncated or corrupted
+    """
+    reader = _Reader(data)
+    o = reader.read()
+    if not reader.at_end:
+        raise ValueError('Unexpected data after object. Data is corrupted.')
+    return o
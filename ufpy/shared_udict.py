@@ -0,0 +1,626 @@
+"""
+SharedUDict is a UDict-like class which keeps its items in shared memory, so several processes can use one dict
+without copying it.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+from contextlib import nullcontext
+from functools import partial
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from typing import Any, ContextManager, Generic, Iterator, TypeVar
+
+from ufpy.cmp import cmp_generator
+from ufpy.persistent_udict import _dump, _hash
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict, _ClassDefault
+from ufpy.utils import expand_values_for_several_keys, get_positions_from_slice_or_int
+
+__all__ = (
+    'SharedUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+# Shared memory: header, hash table with open addressing (linear probing) and records (key length, value length,
+# key, value). Size of shared memory doesn't change, so other processes never have to attach again
+_MAGIC = b'UFPYSHM1'
+_U64 = Struct('<Q')
+_SLOTS, _COUNT, _USED, _SEQ, _END, _GARBAGE, _VERSION = range(8, 64, 8) # offsets of header fields after magic
+_HEADER_SIZE = 64
+_SLOT = Struct('<QQQ') # hash of key, offset of record, seq (order of adding)
+_RECORD = Struct('<II')
+_EMPTY = 0
+_DELETED = 2 ** 64 - 1
+_MIN_CAPACITY = 64
+_MIN_SIZE = 64 * 1024
+
+
+_created: set[str] = set() # names of shared memory created in this process (it is tracked for owner)
+
+
+def _attach(name: str) -> SharedMemory:
+    # Resource tracker unlinks tracked memory when process exits, so attached memory mustn't be tracked
+    try:
+        return SharedMemory(name, track=False) # pylint: disable=unexpected-keyword-arg
+    except TypeError: # before Python 3.13
+        memory = SharedMemory(name)
+    if os.name == 'posix' and memory._name not in _created: # pylint: disable=protected-access
+        resource_tracker.unregister(memory._name, 'shared_memory') # pylint: disable=protected-access
+    return memory
+
+
+# pylint: disable=protected-access
+@cmp_generator
+class SharedUDict(Generic[KT, VT, CDV]): # pylint: disable=too-many-instance-attributes
+    """
+    UDict which keeps its hash index and items in one block of shared memory
+    (`multiprocessing.shared_memory`). Other processes attach to it by name and read values
+    without copying all dict.
+
+    Process which created SharedUDict (owner) can read and change it. Other processes attach with `attach()`:
+    without lock they can only read it, with owner's `lock` they can also change it.
+    Pickled SharedUDict (for example, argument of `Pool.map()`) is attached read-only in other process.
+    Read-only SharedUDicts don't use lock, so they are consistent only while nobody changes the dict.
+
+    Size of shared memory is fixed: SharedUDict can contain only `capacity` items and `size` bytes
+    of pickled keys and values. Values must be picklable. Keys are compared like in dict, but they can be only None,
+    bool, int, float, str, bytes and tuples or frozensets of them (see `PersistentUDict`). Like in UDict,
+    first index is 1.
+    """
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] = None, *, capacity: int = None,
+            size: int = None, lock: Any = None, default: CDV = None, **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Items which are added to SharedUDict (optional, you can use kwargs instead of it)
+        capacity: Maximal count of items (optional, by default twice as many as initial items, but not less than 64)
+        size: Size of memory for keys and values in bytes (optional, by default twice as many as initial items use,
+        but not less than 64 KiB)
+        lock: Lock for processes which change SharedUDict (optional, by default `multiprocessing.RLock()`.
+        If processes are started with other start method, use `RLock()` of its context)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: capacity or size isn't positive
+        TypeError: Unsupported type of key
+        """
+        if isinstance(dictionary, (UDict, SharedUDict)):
+            dictionary = dictionary.dictionary
+        records = [(k, _hash(k), _dump(k), _dump(v)) for k, v in (dictionary or kwargs).items()]
+
+        if capacity is None:
+            capacity = max(_MIN_CAPACITY, len(records) * 2)
+        if size is None:
+            size = max(_MIN_SIZE, sum(_RECORD.size + len(k) + len(v) for _, _, k, v in records) * 2)
+        if capacity <= 0 or size <= 0:
+            raise ValueError('capacity and size must be positive.')
+
+        slots = 1
+        while slots * 2 // 3 < capacity:
+            slots *= 2
+
+        memory = SharedMemory(create=True, size=_HEADER_SIZE + slots * _SLOT.size + size)
+        _created.add(memory._name) # pylint: disable=protected-access
+        memory.buf[:8] = _MAGIC
+        _U64.pack_into(memory.buf, _SLOTS, slots)
+        _U64.pack_into(memory.buf, _END, _HEADER_SIZE + slots * _SLOT.size)
+
+        self.__setup(memory, lock or multiprocessing.RLock(), default)
+        self.__owner = True
+        for record in records:
+            self.__put(*record)
+
+    @classmethod
+    def attach(cls, name: str, *, lock: Any = None, default: CDV = None) -> SharedUDict[KT, VT, CDV]:
+        """
+        Attaches to SharedUDict which is created in other process
+
+        Parameters:
+        name: Name of SharedUDict's shared memory (`SharedUDict.name`)
+        lock: Lock of SharedUDict (`SharedUDict.lock`). If it isn't defined, SharedUDict is read-only (optional)
+        default: Value that is returned for missing keys (optional)
+
+        Raises:
+        ValueError: Shared memory isn't SharedUDict's memory
+        """
+        memory = _attach(name)
+        if memory.buf[:8] != _MAGIC:
+            memory.close()
+            raise ValueError(f"{name} isn't SharedUDict's shared memory.")
+
+        self = cls.__new__(cls)
+        self.__setup(memory, lock, default)
+        self.__owner = False
+        return self
+
+    def __setup(self, memory: SharedMemory, lock: Any, default: CDV) -> None:
+        self.__memory = memory
+        self.__buf = memory.buf
+        self.__lock = lock
+        self.__default = default
+        self.__slots = self.__field(_SLOTS)
+        self.__records = _HEADER_SIZE + self.__slots * _SLOT.size # offset of first record
+        self.__keys: list[KT] | None = None # positional index, built lazily
+        self.__keys_version = -1
+
+    def __reduce__(self):
+        return partial(SharedUDict.attach, default=self.__default), (self.name,)
+
+    # shared memory
+    def __guard(self) -> ContextManager:
+        if self.__lock is None:
+            return nullcontext()
+        return self.__lock
+
+    def __check_writable(self) -> None:
+        if self.__lock is None:
+            raise TypeError("SharedUDict is read-only. Use attach() with lock to change it.")
+
+    def __field(self, field: int) -> int:
+        return _U64.unpack_from(self.__buf, field)[0]
+
+    def __set_field(self, field: int, value: int) -> None:
+        _U64.pack_into(self.__buf, field, value)
+
+    def close(self) -> None:
+        """
+        Detaches from shared memory. SharedUDict can't be used after closing
+        """
+        self.__buf = None
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys shared memory. It must be called once (usually by owner) when all processes don't need dict
+        """
+        if os.name == 'posix':
+            # Attached processes could unregister memory in resource tracker which is shared with owner,
+            # but unlink() unregisters it again
+            resource_tracker.register(self.__memory._name, 'shared_memory') # pylint: disable=protected-access
+        self.__memory.unlink()
+
+    def __enter__(self) -> SharedUDict[KT, VT, CDV]:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+        if self.__owner:
+            self.unlink()
+
+    # records
+    def __record_size(self, offset: int) -> int:
+        key_size, value_size = _RECORD.unpack_from(self.__buf, offset)
+        return _RECORD.size + key_size + value_size
+
+    def __record_key(self, offset: int) -> memoryview:
+        key_size, _ = _RECORD.unpack_from(self.__buf, offset)
+        return self.__buf[offset + _RECORD.size:offset + _RECORD.size + key_size]
+
+    def __record_value(self, offset: int) -> VT:
+        key_size, value_size = _RECORD.unpack_from(self.__buf, offset)
+        start = offset + _RECORD.size + key_size
+        return pickle.loads(self.__buf[start:start + value_size])
+
+    def __record_item(self, offset: int) -> tuple[KT, VT]:
+        return pickle.loads(self.__record_key(offset)), self.__record_value(offset)
+
+    def __append(self, key: bytes, value: bytes) -> int:
+        size = _RECORD.size + len(key) + len(value)
+        if self.__field(_END) + size > len(self.__buf):
+            self.__compact()
+            if self.__field(_END) + size > len(self.__buf):
+                raise MemoryError(f'SharedUDict is full: there is no space for {size} bytes.')
+
+        offset = self.__field(_END)
+        _RECORD.pack_into(self.__buf, offset, len(key), len(value))
+        start = offset + _RECORD.size
+        self.__buf[start:start + len(key)] = key
+        self.__buf[start + len(key):offset + size] = value
+        self.__set_field(_END, offset + size)
+        return offset
+
+    def __compact(self) -> None:
+        # Moves records to start of memory, so old records of changed and deleted items are removed
+        end = self.__records
+        for offset, slot in sorted((offset, slot) for slot, _, offset, _ in self.__table()):
+            size = self.__record_size(offset)
+            if offset != end:
+                self.__buf[end:end + size] = bytes(self.__buf[offset:offset + size])
+                position = self.__slot_position(slot)
+                key_hash, _, seq = _SLOT.unpack_from(self.__buf, position)
+                _SLOT.pack_into(self.__buf, position, key_hash, end, seq)
+            end += size
+        self.__set_field(_END, end)
+        self.__set_field(_GARBAGE, 0)
+
+    # hash index
+    @staticmethod
+    def __slot_position(slot: int) -> int:
+        return _HEADER_SIZE + slot * _SLOT.size
+
+    def __slot_offset(self, slot: int) -> int:
+        return _SLOT.unpack_from(self.__buf, self.__slot_position(slot))[1]
+
+    def __find(self, key: KT, key_hash: int) -> tuple[int, bool]:
+        # Returns slot of key and True or slot where key can be inserted and False.
+        # Equal keys can have different pickled bytes, so keys with the same hash are unpickled and compared
+        slot = key_hash % self.__slots
+        free = -1
+        while True:
+            slot_hash, offset, _ = _SLOT.unpack_from(self.__buf, self.__slot_position(slot))
+            if offset == _EMPTY:
+                return (slot if free < 0 else free), False
+            if offset == _DELETED:
+                if free < 0:
+                    free = slot
+            elif slot_hash == key_hash and pickle.loads(self.__record_key(offset)) == key:
+                return slot, True
+            slot = (slot + 1) % self.__slots
+
+    def __table(self) -> Iterator[tuple[int, int, int, int]]:
+        # Slot, hash, offset and seq of all items
+        table = self.__buf[_HEADER_SIZE:self.__records]
+        return (
+            (slot, key_hash, offset, seq) for slot, (key_hash, offset, seq) in enumerate(_SLOT.iter_unpack(table))
+            if offset not in (_EMPTY, _DELETED)
+        )
+
+    def __offsets(self) -> list[int]:
+        # Offsets of records of all items in order of adding
+        return [offset for _, offset in sorted((seq, offset) for _, _, offset, seq in self.__table())]
+
+    def __rehash(self) -> None:
+        # Removes deleted slots from hash table
+        live = [(key_hash, offset, seq) for _, key_hash, offset, seq in self.__table()]
+        self.__buf[_HEADER_SIZE:self.__records] = bytes(self.__records - _HEADER_SIZE)
+        for key_hash, offset, seq in live:
+            slot = key_hash % self.__slots
+            while self.__slot_offset(slot) != _EMPTY:
+                slot = (slot + 1) % self.__slots
+            _SLOT.pack_into(self.__buf, self.__slot_position(slot), key_hash, offset, seq)
+        self.__set_field(_USED, len(live))
+
+    # items
+    def __lookup(self, key: KT) -> int | None:
+        slot, found = self.__find(key, _hash(key))
+        return self.__slot_offset(slot) if found else None
+
+    def __load(self, key: KT, default: DV) -> VT | DV:
+        with self.__guard():
+            offset = self.__lookup(key)
+            return default if offset is None else self.__record_value(offset)
+
+    def __value(self, key: KT) -> VT:
+        with self.__guard():
+            offset = self.__lookup(key)
+            if offset is None:
+                raise KeyError(key)
+            return self.__record_value(offset)
+
+    def __put(self, key: KT, key_hash: int, raw_key: bytes, value: bytes) -> None:
+        slot, found = self.__find(key, key_hash)
+        if not found and self.__slot_offset(slot) == _EMPTY and self.__field(_USED) + 1 > self.capacity:
+            if self.__field(_COUNT) + 1 > self.capacity:
+                raise MemoryError(f'SharedUDict is full: it can contain only {self.capacity} items.')
+            self.__rehash()
+            slot, found = self.__find(key, key_hash)
+
+        offset = self.__append(raw_key, value)
+        position = self.__slot_position(slot)
+        if found:
+            _, old, seq = _SLOT.unpack_from(self.__buf, position)
+            self.__set_field(_GARBAGE, self.__field(_GARBAGE) + self.__record_size(old))
+        else:
+            if self.__slot_offset(slot) == _EMPTY:
+                self.__set_field(_USED, self.__field(_USED) + 1)
+            seq = self.__field(_SEQ)
+            self.__set_field(_SEQ, seq + 1)
+            self.__set_field(_COUNT, self.__field(_COUNT) + 1)
+            self.__set_field(_VERSION, self.__field(_VERSION) + 1)
+        _SLOT.pack_into(self.__buf, position, key_hash, offset, seq)
+
+    def __store(self, key: KT, value: VT) -> None:
+        self.__check_writable()
+        record = key, _hash(key), _dump(key), _dump(value)
+        with self.__guard():
+            self.__put(*record)
+
+    def __remove(self, key: KT) -> None:
+        self.__check_writable()
+        key_hash = _hash(key)
+        with self.__guard():
+            slot, found = self.__find(key, key_hash)
+            if not found:
+                raise KeyError(key)
+
+            position = self.__slot_position(slot)
+            self.__set_field(_GARBAGE, self.__field(_GARBAGE) + self.__record_size(self.__slot_offset(slot)))
+            _SLOT.pack_into(self.__buf, position, 0, _DELETED, 0)
+            self.__set_field(_COUNT, self.__field(_COUNT) - 1)
+            self.__set_field(_VERSION, self.__field(_VERSION) + 1)
+
+    def update(self, other: AnyDict[KT, VT] | UDict[KT, VT, Any] | SharedUDict[KT, VT, Any]) -> None:
+        """
+        Updates SharedUDict with items of other dict
+
+        Raises:
+        TypeError: SharedUDict is read-only or type of key isn't supported
+        MemoryError: SharedUDict is full
+        """
+        self.__check_writable()
+        if isinstance(other, (UDict, SharedUDict)):
+            other = other.dictionary
+        records = [(k, _hash(k), _dump(k), _dump(v)) for k, v in other.items()]
+        with self.__guard():
+            for record in records:
+                self.__put(*record)
+
+    # properties
+    @property
+    def name(self) -> str:
+        """
+        Name of shared memory. Use it with `SharedUDict.attach()` in other processes
+        """
+        return self.__memory.name
+
+    @property
+    def lock(self) -> Any:
+        """
+        Lock which is used by all processes which change SharedUDict (`None` for read-only SharedUDict).
+        Pass it to other processes when they are started
+        """
+        return self.__lock
+
+    @property
+    def readonly(self) -> bool:
+        """
+        `True` if SharedUDict can't be changed in this process
+        """
+        return self.__lock is None
+
+    @property
+    def capacity(self) -> int:
+        """
+        Maximal count of items
+        """
+        return self.__slots * 2 // 3
+
+    @property
+    def size(self) -> int:
+        """
+        Size of memory for keys and values in bytes
+        """
+        return len(self.__buf) - self.__records
+
+    @property
+    def garbage(self) -> int:
+        """
+        Size of old records in bytes. They are removed when there is no space for new records
+        """
+        return self.__field(_GARBAGE)
+
+    @property
+    def dictionary(self) -> dict[KT, VT]:
+        """
+        Copy of all SharedUDict's items in a regular Python dictionary (all values are loaded)
+        """
+        return dict(self.items)
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys
+        """
+        return self.__key_index().copy()
+
+    @property
+    def values(self) -> list[VT]:
+        """
+        All dict's values
+        """
+        with self.__guard():
+            return [self.__record_value(offset) for offset in self.__offsets()]
+
+    @property
+    def items(self) -> list[tuple[KT, VT]]:
+        """
+        All dict's items
+        """
+        with self.__guard():
+            return [self.__record_item(offset) for offset in self.__offsets()]
+
+    @property
+    def default(self) -> CDV:
+        """
+        The value that will be returned when .get() function or the [] operator are called
+        if the entered key is not in the SharedUDict
+        """
+        return self.__default
+
+    @default.setter
+    def default(self, value: CDV):
+        self.__default = value
+
+    def to_udict(self) -> UDict[KT, VT, CDV]:
+        """
+        Loads all items to UDict
+        """
+        return UDict(self.dictionary, default=self.__default)
+
+    # get/set/del items
+    def __key_index(self) -> list[KT]:
+        with self.__guard():
+            version = self.__field(_VERSION)
+            if self.__keys is None or self.__keys_version != version:
+                self.__keys = [pickle.loads(self.__record_key(offset)) for offset in self.__offsets()]
+                self.__keys_version = version
+            return self.__keys
+
+    def __get_keys_from_slice_or_int(self, key: KT | int | slice) -> list[KT]:
+        positions = get_positions_from_slice_or_int(key, self, 'SharedUDict')
+        if positions is None:
+            return [key]
+        keys = self.__key_index()
+        return [keys[i] for i in positions]
+
+    def __getitem__(self, key: KT | int | slice) -> VT | list[VT] | CDV:
+        l = [self.__load(k, self.__default) for k in self.__get_keys_from_slice_or_int(key)]
+        return l if len(l) > 1 else l[0]
+
+    def __setitem__(self, key: KT | int | slice, value: VT | list[VT]) -> None:
+        keys = self.__get_keys_from_slice_or_int(key)
+        values = expand_values_for_several_keys(value, len(keys))
+
+        for k, v in zip(keys, values):
+            self.__store(k, v)
+
+    def __delitem__(self, key: KT | int | slice) -> None:
+        for k in self.__get_keys_from_slice_or_int(key):
+            self.__remove(k)
+
+    def get(
+            self, *, key: KT = None, index: int = None, value: VT = None, default: DV = _ClassDefault
+    ) -> KT | VT | CDV | DV:
+        """
+        Get a value with key or it's index.
+
+        If value is defined, returns key
+
+        Parameters:
+        key: Key of value in dict (optional)
+        index: Index of value in dict (optional)
+        value: Value in dict (optional)
+        default: Default value (if none -> SharedUDict.default) (optional)
+
+        Raises:
+        ValueError: You defined 0 or 2 or 3 params (from `key`, `index` and `value`)
+        IndexError: index is bigger that length of dict
+        """
+        if [key, index, value].count(None) != 2:
+            raise ValueError('Please define one of key, index and value params.')
+
+        if default == _ClassDefault:
+            default = self.__default
+
+        if value is not None:
+            return next((k for k, v in self if v == value), default)
+        if index is not None:
+            if index > len(self):
+                raise IndexError('Index is bigger that length of SharedUDict.')
+            return self.__load(self.__key_index()[index - 1], default)
+        return self.__load(key, default)
+
+    # Len, iterator, booleans
+    def __len__(self) -> int:
+        return self.__field(_COUNT)
+
+    def __iter__(self) -> Iterator[tuple[KT, VT]]:
+        return iter(self.items)
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if `len(self)` equals `0`
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __contains__(self, item: tuple[KT, VT] | list[KT | VT] | KT) -> bool:
+        if isinstance(item, (list, tuple)):
+            k, v = item
+            with self.__guard():
+                offset = self.__lookup(k)
+                return offset is not None and self.__record_value(offset) == v
+        with self.__guard():
+            return self.__lookup(item) is not None
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'shu{self.dictionary}'
+
+    # Comparing
+    def __cmp__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SharedUDict[KT, VT, Any]) -> int:
+        return len(self) - len(other)
+
+    def __eq__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SharedUDict[KT, VT, Any]) -> bool:
+        if isinstance(other, (UDict, SharedUDict)):
+            other = other.dictionary
+        return self.dictionary == other
+
+    def __ne__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SharedUDict[KT, VT, Any]) -> bool:
+        return not self == other
+
+    # Math operations (results are regular UDicts)
+    def __add__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> UDict[KT, VT, CDV]:
+        return self.to_udict() + other
+
+    def __sub__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> UDict[KT, VT, CDV]:
+        return self.to_udict() - other
+
+    def __mul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        return self.to_udict() * other
+
+    def __truediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        return self.to_udict() / other
+
+    def __neg__(self) -> UDict[KT, VT, CDV]:
+        return -self.to_udict()
+
+    # In-place math operations (they change shared memory)
+    def __iadd__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> SharedUDict[KT, VT, CDV]:
+        self.update(other)
+        return self
+
+    def __isub__(self, other: dict[KT, VT] | UDict[KT, VT, Any]) -> SharedUDict[KT, VT, CDV]:
+        if isinstance(other, (UDict, SharedUDict)):
+            other = other.dictionary
+        with self.__guard():
+            for k, v in other.items():
+                if (k, v) in self:
+                    self.__remove(k)
+        return self
+
+    def __imul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> SharedUDict[KT, VT, CDV]:
+        with self.__guard():
+            if isinstance(other, (int, float)):
+                for k, v in self.items:
+                    self.__store(k, v * other)
+                return self
+
+            if isinstance(other, (UDict, SharedUDict)):
+                other = other.dictionary
+            for k, v in other.items():
+                self.__store(k, self.__value(k) * v)
+        return self
+
+    def __itruediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> SharedUDict[KT, VT, CDV]:
+        with self.__guard():
+            if isinstance(other, (int, float)):
+                for k, v in self.items:
+                    self.__store(k, v / other)
+                return self
+
+            if isinstance(other, (UDict, SharedUDict)):
+                other = other.dictionary
+            for k, v in other.items():
+                self.__store(k, self.__value(k) / v)
+        return self
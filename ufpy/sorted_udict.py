@@ -0,0 +1,405 @@
+"""
+SortedUDict is a UDict-like class which keeps its keys sorted.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Generic, Iterator, overload, TypeVar
+
+from ufpy.cmp import cmp_generator
+from ufpy.math_op import i_generator
+from ufpy.typ import AnyDict
+from ufpy.udict import UDict
+from ufpy.utils import expand_values_for_several_keys, get_positions_from_slice_or_int
+
+__all__ = (
+    'SortedUDict',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+CDV = TypeVar('CDV')
+DV = TypeVar('DV')
+
+# If batch adds more keys than this, keys are re-sorted (timsort merges sorted runs) instead of inserting one by one
+_BATCH_INSERT_LIMIT = 8
+
+
+@cmp_generator
+@i_generator
+class SortedUDict(Generic[KT, VT, CDV]):
+    """
+    UDict which keeps its keys sorted. New keys are inserted in their place with binary search,
+    so dict doesn't need to be sorted again after updates.
+
+    Like in UDict, first index is 1.
+    """
+    @overload
+    def __init__(self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]): ...
+    @overload
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any], *, default: CDV = None,
+            key: Callable[[KT], Any] = None, reverse: bool = False
+    ): ...
+    @overload
+    def __init__(self, **kwargs: VT): ...
+    @overload
+    def __init__(self, *, default: CDV = None, key: Callable[[KT], Any] = None, reverse: bool = False, **kwargs: VT):
+        ...
+
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any] = None, *,
+            default: CDV = None, key: Callable[[KT], Any] = None, reverse: bool = False, **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for SortedUDict (optional, you can use kwargs instead of it)
+        default: Value that is returned for missing keys (optional)
+        key: Function which returns comparison key for dict's key, like in `sorted()` (optional)
+        reverse: If `True`, keys are sorted in descending order (optional)
+        """
+        if isinstance(dictionary, (UDict, SortedUDict)):
+            dictionary = dictionary.dictionary
+        self.__dict: dict[KT, VT] = dict(dictionary or kwargs)
+        self.__default = default
+        self.__key = key
+        self.__reverse = reverse
+        self.__keys: list[KT] = sorted(self.__dict, key=key) # always ascending, reverse is applied on access
+
+    @classmethod
+    def __from_sorted(
+            cls, dictionary: dict[KT, VT], keys: list[KT], default: CDV, key: Callable[[KT], Any], reverse: bool
+    ) -> SortedUDict[KT, VT, CDV]:
+        new = cls.__new__(cls)
+        new.__dict = dictionary
+        new.__default = default
+        new.__key = key
+        new.__reverse = reverse
+        new.__keys = keys
+        return new
+
+    def __copy_with(self, dictionary: dict[KT, VT], keys: list[KT] = None) -> SortedUDict[KT, VT, CDV]:
+        keys = self.__keys.copy() if keys is None else keys
+        return self.__from_sorted(dictionary, keys, self.__default, self.__key, self.__reverse)
+
+    # properties
+    @property
+    def dictionary(self) -> dict[KT, VT]:
+        """
+        SortedUDict's dictionary (copy in sorted order)
+        """
+        return {k: self.__dict[k] for k in self.__ordered_keys()}
+
+    @property
+    def keys(self) -> list[KT]:
+        """
+        All dict's keys in sorted order
+        """
+        return list(self.__ordered_keys())
+
+    @property
+    def values(self) -> list[VT]:
+        """
+        All dict's values in order of keys
+        """
+        return [self.__dict[k] for k in self.__ordered_keys()]
+
+    @property
+    def items(self) -> list[tuple[KT, VT]]:
+        """
+        All dict's items in order of keys
+        """
+        return list(self)
+
+    @property
+    def default(self) -> CDV:
+        """
+        The value that will be returned when .get() function or the [] operator are called
+        if the entered key is not in the SortedUDict
+        """
+        return self.__default
+
+    @default.setter
+    def default(self, value: CDV):
+        self.__default = value
+
+    @property
+    def key(self) -> Callable[[KT], Any] | None:
+        """
+        Function which returns comparison key for dict's key
+        """
+        return self.__key
+
+    @property
+    def is_reversed(self) -> bool:
+        """
+        `True` if keys are sorted in descending order
+        """
+        return self.__reverse
+
+    def to_udict(self) -> UDict[KT, VT, CDV]:
+        """
+        Converts SortedUDict to UDict (with keys in sorted order)
+        """
+        return UDict(self.dictionary, default=self.__default)
+
+    def copy(self) -> SortedUDict[KT, VT, CDV]:
+        """
+        Returns copy of SortedUDict
+        """
+        return self.__copy_with(self.__dict.copy())
+
+    def __copy__(self) -> SortedUDict[KT, VT, CDV]:
+        return self.copy()
+
+    def reverse(self) -> SortedUDict[KT, VT, CDV]:
+        """
+        Reverses order of keys (ascending <-> descending) and returns SortedUDict. Works in O(1)
+        """
+        self.__reverse = not self.__reverse
+        return self
+
+    def reversed(self) -> SortedUDict[KT, VT, CDV]:
+        """
+        Returns SortedUDict with reversed order of keys, but doesn't change it
+        """
+        return self.__from_sorted(
+            self.__dict.copy(), self.__keys.copy(), self.__default, self.__key, not self.__reverse
+        )
+
+    def __invert__(self) -> SortedUDict[KT, VT, CDV]:
+        return self.reversed()
+
+    def __reversed__(self) -> SortedUDict[KT, VT, CDV]:
+        return self.reversed()
+
+    # sorted keys
+    def __ordered_keys(self) -> Iterator[KT]:
+        return reversed(self.__keys) if self.__reverse else iter(self.__keys)
+
+    def __sort_key(self, key: KT) -> Any:
+        return self.__key(key) if self.__key else key
+
+    def __key_at(self, position: int) -> KT:
+        return self.__keys[-1 - position if self.__reverse else position]
+
+    def __insert(self, key: KT) -> None:
+        insort(self.__keys, key, key=self.__key)
+
+    def __remove(self, key: KT) -> None:
+        i = bisect_left(self.__keys, self.__sort_key(key), key=self.__key)
+        while self.__keys[i] != key: # different keys can have equal comparison keys
+            i += 1
+        del self.__keys[i]
+
+    def rank(self, key: KT) -> int:
+        """
+        Returns count of keys which go before `key` in SortedUDict. `key` doesn't have to be in dict.
+        Time complexity is O(log n)
+        """
+        if self.__reverse:
+            return len(self) - bisect_right(self.__keys, self.__sort_key(key), key=self.__key)
+        return bisect_left(self.__keys, self.__sort_key(key), key=self.__key)
+
+    def select(self, rank: int) -> KT:
+        """
+        Returns key which has `rank` keys before it (`select(rank(k)) == k`). Time complexity is O(1)
+        """
+        return self.__key_at(rank)
+
+    def irange(
+            self, lo: KT = None, hi: KT = None, inclusive: tuple[bool, bool] = (True, True)
+    ) -> Iterator[KT]:
+        """
+        Iterates keys from `lo` to `hi` in order of SortedUDict.
+
+        Parameters:
+        lo: Minimal key (if none -> there is no minimum) (optional)
+        hi: Maximal key (if none -> there is no maximum) (optional)
+        inclusive: Include `lo` and `hi` keys or not (optional)
+        """
+        start, stop = 0, len(self.__keys)
+        if lo is not None:
+            bisect = bisect_left if inclusive[0] else bisect_right
+            start = bisect(self.__keys, self.__sort_key(lo), key=self.__key)
+        if hi is not None:
+            bisect = bisect_right if inclusive[1] else bisect_left
+            stop = bisect(self.__keys, self.__sort_key(hi), key=self.__key)
+
+        if self.__reverse:
+            return (self.__keys[i] for i in range(stop - 1, start - 1, -1))
+        return (self.__keys[i] for i in range(start, stop))
+
+    def update(self, other: AnyDict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> None:
+        """
+        Updates SortedUDict with items of other dict. Big batches of new keys are merged with sorted keys at once
+        """
+        if isinstance(other, (UDict, SortedUDict)):
+            other = other.dictionary
+
+        new_keys = [k for k in other if k not in self.__dict]
+        self.__dict.update(other)
+        if len(new_keys) > _BATCH_INSERT_LIMIT:
+            self.__keys.extend(new_keys)
+            self.__keys.sort(key=self.__key)
+        else:
+            for k in new_keys:
+                self.__insert(k)
+
+    # get/set/del items
+    def __get_keys_from_slice_or_int(self, key: KT | int | slice) -> list[KT]:
+        positions = get_positions_from_slice_or_int(key, self.__dict, 'SortedUDict')
+        if positions is None:
+            return [key]
+        return [self.__key_at(i) for i in positions]
+
+    def __getitem__(self, key: KT | int | slice) -> VT | list[VT] | CDV:
+        l = [self.__dict.get(k, self.__default) for k in self.__get_keys_from_slice_or_int(key)]
+        return l if len(l) > 1 else l[0]
+
+    def __setitem__(self, key: KT | int | slice, value: VT | list[VT]) -> None:
+        keys = self.__get_keys_from_slice_or_int(key)
+        values = expand_values_for_several_keys(value, len(keys))
+
+        for k, v in zip(keys, values):
+            if k not in self.__dict:
+                self.__insert(k)
+            self.__dict[k] = v
+
+    def __delitem__(self, key: KT | int | slice) -> None:
+        for k in self.__get_keys_from_slice_or_int(key):
+            del self.__dict[k]
+            self.__remove(k)
+
+    # get
+    def get(
+            self, *, key: KT = None, index: int = None, value: VT = None, default: DV = None
+    ) -> KT | VT | CDV | DV:
+        """
+        Get a value with key or it's index.
+
+        If value is defined, returns key
+
+        Parameters:
+        key: Key of value in dict (optional)
+        index: Index of value in dict (optional)
+        value: Value in dict (optional)
+        default: Default value (if none -> SortedUDict.default) (optional)
+
+        Raises:
+        ValueError: You defined 0 or 2 or 3 params (from `key`, `index` and `value`)
+        IndexError: index is bigger that length of dict
+        """
+        if [key, index, value].count(None) != 2:
+            raise ValueError('Please define one of key, index and value params.')
+
+        if default is None:
+            default = self.__default
+
+        if value is not None:
+            return next((k for k in self.__ordered_keys() if self.__dict[k] == value), default)
+        if index is not None:
+            if index > len(self):
+                raise IndexError('Index is bigger that length of SortedUDict.')
+            return self.__dict[self.__key_at(index - 1)]
+        return self.__dict.get(key, default)
+
+    # Len, iterator, booleans
+    def __len__(self) -> int:
+        return len(self.__dict)
+
+    def __iter__(self) -> Iterator[tuple[KT, VT]]:
+        return ((k, self.__dict[k]) for k in self.__ordered_keys())
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if `len(self)` equals `0`
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __contains__(self, item: tuple[KT, VT] | list[KT | VT] | KT) -> bool:
+        if isinstance(item, (list, tuple)):
+            k, v = item
+            return k in self.__dict and self.__dict[k] == v
+        return item in self.__dict
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'su{self.dictionary}'
+
+    # Comparing
+    def __cmp__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> int:
+        return len(self) - len(other)
+
+    def __eq__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> bool:
+        if isinstance(other, (UDict, SortedUDict)):
+            other = other.dictionary
+        return self.__dict == other
+
+    def __ne__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> bool:
+        return not self == other
+
+    # Math operations
+    def __add__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> SortedUDict[KT, VT, CDV]:
+        """
+        Combines SortedUDict with other dict
+        """
+        new = self.copy()
+        new.update(other)
+        return new
+
+    def __iadd__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> SortedUDict[KT, VT, CDV]:
+        self.update(other)
+        return self
+
+    def __sub__(self, other: dict[KT, VT] | UDict[KT, VT, Any] | SortedUDict[KT, VT, Any]) -> SortedUDict[KT, VT, CDV]:
+        """
+        Subtracts other dict from SortedUDict
+        """
+        if isinstance(other, (UDict, SortedUDict)):
+            other = other.dictionary
+
+        deleted = {k for k, v in other.items() if k in self.__dict and self.__dict[k] == v}
+        return self.__copy_with(
+            {k: v for k, v in self.__dict.items() if k not in deleted},
+            [k for k in self.__keys if k not in deleted]
+        )
+
+    def __mul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> SortedUDict[KT, VT, CDV]:
+        """
+        Multiplies each value by another value with the same key or all values by integer or float number
+        """
+        if isinstance(other, (UDict, SortedUDict)):
+            other = other.dictionary
+        if isinstance(other, (int, float)):
+            return self.__copy_with({k: v * other for k, v in self.__dict.items()})
+
+        new_dict = self.__dict.copy()
+        for k, v in other.items():
+            new_dict[k] *= v
+        return self.__copy_with(new_dict)
+
+    def __truediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, Any] | float | int
+    ) -> SortedUDict[KT, VT, CDV]:
+        """
+        Divides each value by another value with the same key or all values by integer or float number
+        """
+        if isinstance(other, (UDict, SortedUDict)):
+            other = other.dictionary
+        if isinstance(other, (int, float)):
+            return self.__copy_with({k: v / other for k, v in self.__dict.items()})
+
+        new_dict = self.__dict.copy()
+        for k, v in other.items():
+            new_dict[k] /= v
+        return self.__copy_with(new_dict)
+
+    def __neg__(self) -> SortedUDict[KT, VT, CDV]:
+        return self.__copy_with({k: -v for k, v in self.__dict.items()})
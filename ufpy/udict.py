@@ -4,48 +4,451 @@ UDict is a class for simplyfing working with python dictionaries.
 
 from __future__ import annotations
 
-from typing import Generic, Iterator, overload, TypeVar, Callable
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from numbers import Number
+from operator import itemgetter, mul, truediv
+from os import cpu_count
+from types import MappingProxyType
+from typing import Any, Generic, Iterable, Iterator, Literal, NamedTuple, overload, TypeVar, Callable, Sequence
 
 from ufpy.cmp import cmp_generator
 from ufpy.math_op import i_generator, r_generator
 from ufpy.typ import AnyDict, AnyCollection
-from ufpy.utils import set_items_for_several_keys, get_items_for_several_keys, del_items_for_several_keys
+from ufpy.utils import (
+    set_items_for_several_keys, get_items_for_several_keys, del_items_for_several_keys,
+    get_positions_from_slice_or_int, expand_values_for_several_keys
+)
 
 __all__ = (
     'UDict',
+    'UDictKeysView',
+    'UDictValuesView',
+    'UDictItemsView',
+    'FrozenUDict',
+    'UDictDiff',
+    'MISSING',
 )
 
 KT = TypeVar('KT')
 VT = TypeVar('VT')
 CDV = TypeVar('CDV')
 DV = TypeVar('DV')
+T = TypeVar('T')
 
 class _ClassDefault: # pylint: disable=too-few-public-methods
     ...
 
+def _counted(method: Callable[..., T]) -> Callable[..., T]:
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.version += 1
+    return wrapper
+
+
+class _ExposedDict(dict[KT, VT]):
+    """
+    Dictionary of UDict which is returned by `UDict.dictionary`, so it can be changed outside UDict.
+    It counts its changes, so UDict knows when its indexes must be rebuilt
+    """
+    __slots__ = ('version',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    __setitem__ = _counted(dict.__setitem__)
+    __delitem__ = _counted(dict.__delitem__)
+    __ior__ = _counted(dict.__ior__)
+    pop = _counted(dict.pop)
+    popitem = _counted(dict.popitem)
+    setdefault = _counted(dict.setdefault)
+    update = _counted(dict.update)
+    clear = _counted(dict.clear)
+
+
+class _Pending: # pylint: disable=too-few-public-methods
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _LazyDict(MutableMapping[KT, VT]):
+    """
+    Dictionary which computes its values with function on first access (it is used by `UDict.map(mode='lazy')`)
+    """
+    def __init__(self, data: dict[KT, VT | _Pending], func: Callable[[KT, VT], VT]):
+        self.__data = data
+        self.__func = func
+        self.version = 0 # count of changes (see `_ExposedDict`)
+
+    def __getitem__(self, key: KT) -> VT:
+        value = self.__data[key]
+        if isinstance(value, _Pending):
+            value = self.__func(key, value.value)
+            self.__data[key] = value
+        return value
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        self.__data[key] = value
+        self.version += 1
+
+    def __delitem__(self, key: KT) -> None:
+        del self.__data[key]
+        self.version += 1
+
+    def __iter__(self) -> Iterator[KT]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self.__data
+
+    def copy(self) -> _LazyDict[KT, VT]:
+        """
+        Returns copy of dictionary. Values which aren't computed yet aren't computed while copying
+        """
+        return _LazyDict(self.__data.copy(), self.__func)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+_VERSIONED = (_ExposedDict, _LazyDict) # dictionaries which count their changes
+
+
+type _Step = tuple[Literal['map', 'add', 'sub', 'mul', 'truediv', 'reverse', 'sort'], object]
+
+
+class _ChainDict(Mapping[KT, VT]):
+    """
+    Read-only dictionary which is result of chain of operations with other dictionary (it is used by UDict's math
+    operations, `reversed()` and `sorted()`). Base dictionary isn't copied (UDict passes a copy only if
+    its dictionary can be changed outside it): all operations are applied on first access, so intermediate
+    dictionaries aren't created and `'map'` operations which follow each other are applied in one pass.
+    Operands are validated by UDict before they are added to chain.
+    """
+    def __init__(self, base: AnyDict[KT, VT], steps: tuple[_Step, ...]):
+        self.__base = base
+        self.__steps = steps
+        self.__data: AnyDict[KT, VT] | None = None
+        self.__owned = False # True if nobody else uses computed dictionary
+
+    @property
+    def pending(self) -> bool:
+        """
+        True if operations aren't applied yet
+        """
+        return self.__data is None
+
+    @property
+    def data(self) -> AnyDict[KT, VT]:
+        """
+        Computed dictionary. Don't change it
+        """
+        if self.__data is None:
+            self.__data, self.__owned = self.__compute()
+            self.__base = self.__steps = None
+        return self.__data
+
+    def then(self, op: str, arg: object = None) -> _ChainDict[KT, VT]:
+        """
+        Returns new chain with one more operation
+        """
+        if self.__data is None:
+            return _ChainDict(self.__base, self.__steps + ((op, arg),))
+        return _ChainDict(self.__data, ((op, arg),))
+
+    def share(self) -> None:
+        """
+        Marks computed dictionary as used by someone else, so `own()` will copy it
+        """
+        self.__owned = False
+
+    def own(self) -> AnyDict[KT, VT]:
+        """
+        Returns computed dictionary which can be changed (copy of it if it is used by someone else)
+        """
+        data = self.data
+        if self.__owned:
+            self.__owned = False
+            return data
+        return data.copy()
+
+    def __compute(self) -> tuple[AnyDict[KT, VT], bool]:
+        data, owned = self.__base, False
+        funcs: list[Callable[[KT, VT], VT]] = []
+        for op, arg in self.__steps + ((None, None),):
+            if op == 'map':
+                funcs.append(arg)
+                continue
+            if funcs:
+                data, owned = self.__map(data, funcs, owned), True
+                funcs = []
+
+            if op == 'reverse':
+                data, owned = {k: data[k] for k in reversed(list(data))}, True
+            elif op == 'sort':
+                data, owned = {k: data[k] for k in sorted(data)}, True
+            elif op is not None:
+                if not owned:
+                    data, owned = data.copy(), True
+                self.__apply(data, op, arg)
+        return data, owned
+
+    @staticmethod
+    def __map(data: AnyDict[KT, VT], funcs: list[Callable[[KT, VT], VT]], owned: bool) -> AnyDict[KT, VT]:
+        if len(funcs) == 1:
+            func = funcs[0]
+        else:
+            def func(k: KT, v: VT) -> VT:
+                for f in funcs:
+                    v = f(k, v)
+                return v
+
+        if not owned:
+            return {k: func(k, v) for k, v in data.items()}
+        for k, v in data.items():
+            data[k] = func(k, v)
+        return data
+
+    @staticmethod
+    def __apply(data: AnyDict[KT, VT], op: str, other: AnyDict[KT, VT]) -> None:
+        if op == 'add':
+            data.update(other)
+        elif op == 'sub':
+            for k, v in other.items():
+                if k in data and data[k] == v:
+                    del data[k]
+        elif op == 'mul':
+            for k, v in other.items():
+                data[k] *= v
+        else:
+            for k, v in other.items():
+                data[k] /= v
+
+    def __getitem__(self, key: KT) -> VT:
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[KT]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, key: KT) -> bool:
+        if self.__data is None and all(op != 'sub' for op, _ in self.__steps):
+            # Only 'add' adds keys and only 'sub' deletes them, so operations aren't applied
+            return key in self.__base or any(key in arg for op, arg in self.__steps if op == 'add')
+        return key in self.data
+
+    def get(self, key: KT, default: DV = None) -> VT | DV:
+        return self.data.get(key, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    def copy(self) -> AnyDict[KT, VT]:
+        """
+        Returns copy of computed dictionary
+        """
+        return self.data.copy()
+
+    def __eq__(self, other: object) -> bool:
+        return self.data == (other.data if isinstance(other, _ChainDict) else other)
+
+    def __repr__(self) -> str:
+        return repr(self.data)
+
+
+class _UDictView(Sequence[T], ABC):
+    """
+    Base class for live views of UDict. Views don't copy dictionary, so every change of UDict is visible in them.
+    Unlike UDict, first index in views is 0 (like in lists returned by `keys`, `values` and `items`)
+    """
+    def __init__(self, get_dict: Callable[[], dict[KT, VT]], get_keys: Callable[[], list[KT]]):
+        self.__get_dict = get_dict
+        self.__get_keys = get_keys
+
+    @property
+    def _dictionary(self) -> dict[KT, VT]:
+        return self.__get_dict()
+
+    def _key(self, index: int) -> KT:
+        return self.__get_keys()[index]
+
+    @abstractmethod
+    def _item(self, key: KT) -> T:
+        """
+        Returns element of view for key
+        """
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self._item(k) for k in self.__get_keys()[index]]
+        return self._item(self._key(index))
+
+    def __len__(self) -> int:
+        return len(self._dictionary)
+
+    def __eq__(self, other: Sequence[T]) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)})'
+
+
+class UDictKeysView(_UDictView[KT]):
+    """
+    Live view of UDict's keys
+    """
+    def _item(self, key: KT) -> KT:
+        return key
+
+    def __iter__(self) -> Iterator[KT]:
+        return iter(self._dictionary)
+
+    def __reversed__(self) -> Iterator[KT]:
+        return reversed(self._dictionary.keys())
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self._dictionary
+
+
+class UDictValuesView(_UDictView[VT]):
+    """
+    Live view of UDict's values
+    """
+    def _item(self, key: KT) -> VT:
+        return self._dictionary[key]
+
+    def __iter__(self) -> Iterator[VT]:
+        return iter(self._dictionary.values())
+
+    def __reversed__(self) -> Iterator[VT]:
+        return reversed(self._dictionary.values())
+
+    def __contains__(self, value: VT) -> bool:
+        return value in self._dictionary.values()
+
+
+class UDictItemsView(_UDictView[tuple[KT, VT]]):
+    """
+    Live view of UDict's items
+    """
+    def _item(self, key: KT) -> tuple[KT, VT]:
+        return key, self._dictionary[key]
+
+    def __iter__(self) -> Iterator[tuple[KT, VT]]:
+        return iter(self._dictionary.items())
+
+    def __reversed__(self) -> Iterator[tuple[KT, VT]]:
+        return reversed(self._dictionary.items())
+
+    def __contains__(self, item: tuple[KT, VT]) -> bool:
+        k, v = item
+        d = self._dictionary
+        return k in d and d[k] == v
+
+
+class _Missing: # pylint: disable=too-few-public-methods
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+MISSING: Any = _Missing()
+"""
+Value of missing key in `UDict.merge()`
+"""
+
+
+class UDictDiff(NamedTuple):
+    """
+    Result of `UDict.diff()`
+    """
+    added: UDict
+    """Items which are only in other dict"""
+    removed: UDict
+    """Items which are only in UDict"""
+    changed: UDict
+    """Keys with different values: key -> (old value, new value) or UDictDiff, if both values are UDicts"""
+
+    def is_empty(self) -> bool:
+        """
+        Returns `True` if dicts are equal
+        """
+        return not (self.added or self.removed or self.changed)
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+
+# pylint: disable=protected-access,too-many-lines
 @cmp_generator
 @i_generator
 @r_generator
-class UDict(Generic[KT, VT, CDV]):
+class UDict(Generic[KT, VT, CDV]): # pylint: disable=too-many-public-methods
     """
     Class for simplifying working with dicts in Python.
     
     Online docs: https://honey-team.github.io/ufpy-website/main/useful_classes/udict
     """
+    # UDicts are often used as small records, so instances don't have __dict__
+    __slots__ = ('__dict', '__default', '__keys', '__index_values', '__values_index', '__cow', '__version')
+
     @overload
     def __init__(self, dictionary: AnyDict[KT, VT]): ...
     @overload
     def __init__(self, dictionary: AnyDict[KT, VT], *, default: CDV): ...
     @overload
+    def __init__(self, dictionary: AnyDict[KT, VT], *, default: CDV = None, index_values: bool): ...
+    @overload
     def __init__(self, **kwargs: VT): ...
     @overload
     def __init__(self, *, default: CDV, **kwargs: VT): ...
+    @overload
+    def __init__(self, *, default: CDV = None, index_values: bool, **kwargs: VT): ...
 
-    def __init__(self, dictionary: AnyDict[KT, VT] = None, *, default: CDV = None, **kwargs: VT):
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] = None, *, default: CDV = None, index_values: bool = False,
+            **kwargs: VT
+    ):
+        """
+        Parameters:
+        dictionary: Dictionary for UDict (optional, you can use kwargs instead of it)
+        default: Value that is returned for missing keys (optional)
+        index_values: If `True`, UDict keeps a value -> key index, so `get(value=...)` is O(1)
+        for hashable values (optional)
+        """
+        self.__cow = False # dictionary is shared with other UDicts, so it must be copied before changing
         if isinstance(dictionary, UDict):
-            dictionary = dictionary.dictionary
+            shared = dictionary.__share()
+            self.__cow = shared is dictionary.__dict
+            dictionary = shared
+        elif dictionary:
+            dictionary = dict(dictionary) # changes of caller's dictionary aren't visible in UDict and vice versa
         self.__dict = dictionary or kwargs
         self.__default = default
+        self.__keys: list[KT] | None = None # positional index, built lazily
+        self.__version = 0 # version of exposed dictionary which indexes are built for
+        self.__index_values = index_values
+        self.__values_index: dict[VT, dict[KT, None]] | None = None # value -> keys index, built lazily
 
     # dictionary
     @property
@@ -56,13 +459,23 @@ class UDict(Generic[KT, VT, CDV]):
         Online docs:
         https://honey-team.github.io/ufpy-website/main/useful_classes/udict/#property-settable-dictionary-dictkt-vt
         """
+        self.__own()
+        if type(self.__dict) is dict: # pylint: disable=unidiomatic-typecheck
+            # The dictionary can be changed outside UDict, so it is replaced with dictionary which counts changes
+            self.__dict = _ExposedDict(self.__dict)
+            self.__version = 0
         return self.__dict
 
     @dictionary.setter
     def dictionary(self, value: AnyDict[KT, VT]):
         if isinstance(value, UDict):
-            value = value.dictionary
-        self.__dict = value
+            self.__dict = value.__share()
+            self.__cow = self.__dict is value.__dict
+        else:
+            self.__dict = dict(value)
+            self.__cow = False
+        self.__keys = None
+        self.__values_index = None
 
     # keys
     @property
@@ -76,7 +489,10 @@ class UDict(Generic[KT, VT, CDV]):
 
     @keys.setter
     def keys(self, value: AnyCollection[KT]):
-        self.__dict = dict(list(zip(value, self.values)))
+        self.__dict = dict(zip(value, self.__dict.values()))
+        self.__cow = False
+        self.__keys = None
+        self.__values_index = None
 
     # values
     @property
@@ -91,7 +507,10 @@ class UDict(Generic[KT, VT, CDV]):
 
     @values.setter
     def values(self, value: AnyCollection[VT]):
-        self.__dict = dict(list(zip(self.keys, value)))
+        self.__dict = dict(zip(self.__dict.keys(), value))
+        self.__cow = False
+        self.__keys = None
+        self.__values_index = None
 
     # items
     @property
@@ -102,11 +521,36 @@ class UDict(Generic[KT, VT, CDV]):
         Online docs:
         https://honey-team.ru/ufpy-website/main/useful_classes/udict/#property-settable-items-listtuplekt-vt
         """
-        return list(zip(self.keys, self.values))
+        return list(self.__dict.items())
 
     @items.setter
     def items(self, value: AnyCollection[tuple[KT, VT] | list[KT | VT]]):
         self.__dict = dict(value)
+        self.__cow = False
+        self.__keys = None
+        self.__values_index = None
+
+    # views
+    @property
+    def keys_view(self) -> UDictKeysView[KT]:
+        """
+        Live view of dict's keys. Unlike `keys`, it doesn't copy keys into a new list
+        """
+        return UDictKeysView(lambda: self.__dict, self.__key_index)
+
+    @property
+    def values_view(self) -> UDictValuesView[VT]:
+        """
+        Live view of dict's values. Unlike `values`, it doesn't copy values into a new list
+        """
+        return UDictValuesView(lambda: self.__dict, self.__key_index)
+
+    @property
+    def items_view(self) -> UDictItemsView[KT, VT]:
+        """
+        Live view of dict's items. Unlike `items`, it doesn't copy items into a new list
+        """
+        return UDictItemsView(lambda: self.__dict, self.__key_index)
 
     # default
     @property
@@ -134,14 +578,147 @@ class UDict(Generic[KT, VT, CDV]):
         Online docs:
         https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__call__func-callablekt-vt-vt-udictkt-vt-cdv
         """
-        new_dict = self.__dict
-        for k, v in self:
-            new_dict[k] = func(k, v)
-        return UDict(new_dict, default=self.__default)
+        return self.map(func)
+
+    def map(
+            self, func: Callable[[KT, VT], VT], *, mode: Literal['serial', 'lazy', 'thread', 'process'] = 'serial',
+            workers: int = None, chunksize: int = None
+    ) -> UDict[KT, VT, CDV]:
+        """
+        Generate new UDict with function. UDict isn't changed.
+
+        Parameters:
+        func: First argument of function is key, second is value. Returns new value
+        mode: How values are computed (optional):
+            `'serial'` - one by one in current thread,
+            `'lazy'` - on first access to value,
+            `'thread'` - in thread pool,
+            `'process'` - in process pool (`func` must be picklable)
+        workers: Count of threads or processes (if none -> count of CPUs) (optional)
+        chunksize: Count of items sent to process at once in `'process'` mode (if none -> chosen automatically)
+        (optional)
+
+        Raises:
+        ValueError: Unknown mode
+        """
+        if mode == 'serial':
+            return self.__wrap({k: func(k, v) for k, v in self.__dict.items()}, self.__default)
+        if mode == 'lazy':
+            return self.__wrap(_LazyDict({k: _Pending(v) for k, v in self.__dict.items()}, func), self.__default)
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown mode: {mode!r}. Use 'serial', 'lazy', 'thread' or 'process'.")
+
+        keys, values = list(self.__dict.keys()), list(self.__dict.values())
+        workers = workers or cpu_count() or 1
+        if mode == 'thread':
+            with ThreadPoolExecutor(workers) as executor:
+                new_values = executor.map(func, keys, values)
+                return self.__wrap(dict(zip(keys, new_values)), self.__default)
+
+        if chunksize is None:
+            chunksize = max(1, len(keys) // (workers * 4))
+        with ProcessPoolExecutor(workers) as executor:
+            new_values = executor.map(func, keys, values, chunksize=chunksize)
+            return self.__wrap(dict(zip(keys, new_values)), self.__default)
+
+    @staticmethod
+    def __wrap(dictionary: AnyDict[KT, VT], default: DV = None) -> UDict[KT, VT, DV]:
+        # New UDict with dictionary which isn't used by anyone else, so it isn't copied
+        new = UDict(default=default)
+        new.__dict = dictionary # pylint: disable=unused-private-member
+        return new
+
+    # copy-on-write
+    def __share(self) -> AnyDict[KT, VT]:
+        # Dictionary will be used by other UDict, so both UDicts must copy it before changing.
+        # Exposed dictionary can be changed outside UDict, so other UDict gets copy of it
+        if isinstance(self.__dict, _VERSIONED):
+            return self.__dict.copy()
+        self.__cow = True
+        if isinstance(self.__dict, _ChainDict):
+            self.__dict.share()
+        return self.__dict
+
+    def __own(self) -> None:
+        # Called before changing of dictionary: shared dictionary is copied (only once)
+        if self.__cow:
+            d = self.__dict
+            self.__dict = d.own() if isinstance(d, _ChainDict) else d.copy()
+            self.__cow = False
+        self.__check_version()
+
+    # indexes of exposed dictionary
+    def __check_version(self) -> None:
+        # Exposed dictionary can be changed outside UDict, so indexes are dropped if it was changed
+        d = self.__dict
+        if isinstance(d, _VERSIONED) and d.version != self.__version:
+            self.__keys = None
+            self.__values_index = None
+            self.__version = d.version
+
+    def __sync_version(self) -> None:
+        # Called after changing of dictionary by UDict: its changes are already applied to indexes
+        if isinstance(self.__dict, _VERSIONED):
+            self.__version = self.__dict.version
+
+    def __derive(self, op: str, arg: object = None, default: DV = None) -> UDict[KT, VT, DV]:
+        # New UDict shares dictionary with this UDict. Operation is applied on first access to new UDict
+        # together with all operations which are added to it before
+        base = self.__share()
+        new = UDict(default=default)
+        # pylint: disable=unused-private-member
+        new.__dict = base.then(op, arg) if isinstance(base, _ChainDict) else _ChainDict(base, ((op, arg),))
+        new.__cow = True
+        return new
+
+    @staticmethod
+    def __operand(other: AnyDict[KT, VT] | UDict[KT, VT, CDV]) -> AnyDict[KT, VT]:
+        if isinstance(other, UDict):
+            return other.__share()
+        if not isinstance(other, Mapping):
+            raise TypeError(f"Unsupported operand type for UDict: '{type(other).__name__}'.")
+        return dict(other) # dict can be changed before operation is applied
+
+    def __check_keys(self, other: AnyDict[KT, VT]) -> None:
+        # Keys of pending chain are checked without applying of its operations
+        for k in other:
+            if k not in self.__dict:
+                raise KeyError(k)
+
+    @staticmethod
+    def __check_numbers(other: AnyDict[KT, VT] | Number) -> None:
+        values = other.values() if isinstance(other, Mapping) else (other,)
+        for v in values:
+            if not isinstance(v, Number):
+                raise TypeError(f"Unsupported operand type for UDict's values: '{type(v).__name__}'.")
+
+    def __check_math(self, other: AnyDict[KT, VT] | Number, op: Callable[[VT, VT], VT]) -> None:
+        # Operations are applied on first access, so errors are found before adding of operation to chain:
+        # values of operand must be numbers, and operation is tried once for every pair of types of values
+        self.__check_numbers(other)
+        data = self.__dict
+        if isinstance(data, _LazyDict) or isinstance(data, _ChainDict) and data.pending:
+            return # values aren't computed yet, they are checked when they are computed
+        if isinstance(other, Mapping):
+            pairs = ((data[k], v) for k, v in other.items())
+        else:
+            pairs = zip(data.values(), repeat(other))
+        tried = set()
+        for a, b in pairs:
+            if (type(a), type(b)) not in tried:
+                tried.add((type(a), type(b)))
+                op(a, b)
+
+    @staticmethod
+    def __check_divisor(other: AnyDict[KT, VT] | Number) -> None:
+        # NumPy zero scalars raise error too (NumPy itself returns inf), so result doesn't depend on type of zero
+        values = other.values() if isinstance(other, Mapping) else (other,)
+        if any(isinstance(v, Number) and v == 0 for v in values):
+            raise ZeroDivisionError('division by zero')
 
     # reverse integers
     def __neg__(self) -> UDict[KT, VT, CDV]:
-        return self(lambda k, v: -v)
+        return self.__derive('map', lambda k, v: -v, self.__default)
 
     # reverse
     def reverse(self) -> UDict[KT, VT, CDV]:
@@ -150,7 +727,10 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#reverse-udictkt-vt-cdv
         """
-        self.__dict = self.reversed().dictionary
+        keys = self.__key_index()
+        keys.reverse()
+        self.__dict = {k: self.__dict[k] for k in keys}
+        self.__cow = False
         return self
 
     def reversed(self) -> UDict[KT, VT, CDV]:
@@ -159,8 +739,7 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#reversed-udictkt-vt-cdv
         """
-        keys, values = list(self.__dict.keys())[::-1], list(self.__dict.values())[::-1]
-        return UDict(dict(list(zip(keys, values))))
+        return self.__derive('reverse')
 
     def __invert__(self) -> UDict[KT, VT, CDV]:
         return self.reversed()
@@ -175,7 +754,10 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#sort-udictkt-vt-cdv
         """
-        self.__dict = self.sorted().dictionary
+        keys = sorted(self.__dict.keys())
+        self.__dict = {k: self.__dict[k] for k in keys}
+        self.__cow = False
+        self.__keys = keys
         return self
 
     def sorted(self) -> UDict[KT, VT, CDV]:
@@ -184,25 +766,23 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#sorted-udictkt-vt-cdv
         """
-        keys = sorted(list(self.__dict.keys()))
-        values = get_items_for_several_keys(self.__dict, keys)
-        return UDict(dict(list(zip(keys, values))))
+        return self.__derive('sort')
 
     # get/set/del items
+    def __key_index(self) -> list[KT]:
+        # Keys in order of dictionary. It is updated by UDict's methods, so we need to rebuild it only if
+        # dictionary was changed outside UDict
+        self.__check_version()
+        if self.__keys is None:
+            self.__keys = list(self.__dict.keys())
+        return self.__keys
+
     def __get_keys_from_slice_or_int(self, key: KT | int | slice) -> list[KT]:
-        if isinstance(key, int) and key not in self.__dict:
-            if key == 0:
-                raise IndexError("You can't use 0 as index in UDict. Use 1 index instead.")
-            return [list(self.__dict.keys())[key - 1]]
-        if isinstance(key, slice):
-            start, stop, step = key.indices(len(self) + 1)
-            if start == 0:
-                start += 1
-            if stop == len(self) + 1:
-                stop -= 1
-            indexes = list(range(start, stop + 1, step))
-            return [list(self.__dict.keys())[i - 1] for i in indexes]
-        return [key]
+        positions = get_positions_from_slice_or_int(key, self.__dict, 'UDict')
+        if positions is None:
+            return [key]
+        keys = self.__key_index()
+        return [keys[i] for i in positions]
 
     def __getitem__(self, key: KT | int | slice) -> UDict[KT, VT, DV] | VT:
         keys = self.__get_keys_from_slice_or_int(key)
@@ -211,20 +791,90 @@ class UDict(Generic[KT, VT, CDV]):
         return l if len(l) > 1 else l[0]
 
     def __setitem__(self, key: KT | int | slice, value: VT | list[VT]) -> None:
+        self.__own()
         keys = self.__get_keys_from_slice_or_int(key)
 
-        # Ensure 'values' is always a list for consistent processing
-        values = value if isinstance(value, (list, tuple)) else [value]
-
-        if len(keys) > len(values):
-            values.extend([values[-1] for _ in range(len(keys) - len(values) + 1)])
-
+        values = expand_values_for_several_keys(value, len(keys))
+
+        # Index of keys isn't rebuilt here: it is built lazily on next positional access
+        index = self.__keys
+        for k, v in zip(keys, values):
+            if k not in self.__dict:
+                if index is not None:
+                    index.append(k)
+            elif self.__values_index is not None:
+                self.__unindex_value(k, self.__dict[k])
+            if self.__values_index is not None:
+                self.__index_value(k, v)
         self.__dict = set_items_for_several_keys(self.__dict, keys, values)
+        self.__sync_version()
 
     def __delitem__(self, key: KT | int | slice) -> None:
-        keys = self.__get_keys_from_slice_or_int(key)
-
+        self.__own()
+        positions = get_positions_from_slice_or_int(key, self.__dict, 'UDict')
+
+        if positions is None:
+            keys = [key]
+            # Deleting of last key is O(1). Finding of other key's position is O(n), so the index is dropped
+            # and rebuilt only on next positional access
+            if self.__keys is not None and key in self.__dict:
+                if self.__keys[-1] == key:
+                    self.__keys.pop()
+                else:
+                    self.__keys = None
+        else:
+            index = self.__key_index()
+            keys = [index[i] for i in positions]
+            for i in sorted({i % len(index) for i in positions}, reverse=True):
+                del index[i]
+
+        if self.__values_index is not None:
+            for k in keys:
+                if k in self.__dict:
+                    self.__unindex_value(k, self.__dict[k])
         self.__dict = del_items_for_several_keys(self.__dict, keys)
+        self.__sync_version()
+
+    # value -> keys index
+    def __index_value(self, key: KT, value: VT) -> None:
+        try:
+            self.__values_index.setdefault(value, {})[key] = None
+        except TypeError: # unhashable values aren't indexed
+            pass
+
+    def __unindex_value(self, key: KT, value: VT) -> None:
+        try:
+            keys = self.__values_index.get(value)
+        except TypeError:
+            return
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self.__values_index[value]
+
+    def __get_key_by_value(self, value: VT, default: DV) -> KT | DV:
+        if self.__index_values:
+            self.__check_version()
+            if self.__values_index is None:
+                self.__values_index = {}
+                for k, v in self.__dict.items():
+                    self.__index_value(k, v)
+            try:
+                keys = self.__values_index.get(value)
+            except TypeError:
+                pass # unhashable value, search it without index
+            else:
+                if not keys:
+                    return default
+                if len(keys) == 1:
+                    return next(iter(keys))
+                # Several keys have this value, so we need the first of them in UDict's order
+                return next(k for k in self.__dict if k in keys)
+
+        for k, v in self.__dict.items():
+            if v == value:
+                return k
+        return default
 
     # get
     @overload
@@ -286,11 +936,100 @@ class UDict(Generic[KT, VT, CDV]):
             default = self.__default
 
         if value:
-            if value not in self.values:
-                return default
-            i = self.values.index(value)
-            return self.keys[i]
-        return self.__dict.get(self.keys[index-1], default) if index else self.__dict.get(key, default)
+            return self.__get_key_by_value(value, default)
+        return self.__dict.get(self.__key_index()[index-1], default) if index else self.__dict.get(key, default)
+
+    # bulk operations
+    def __changed(self, length: int) -> None:
+        # Positional index is rebuilt only if keys were added or deleted, order of old keys isn't changed
+        if len(self.__dict) != length:
+            self.__keys = None
+        self.__values_index = None
+        self.__sync_version()
+
+    def get_many(self, keys: Iterable[KT], default: DV = _ClassDefault) -> list[VT | CDV | DV]:
+        """
+        Returns values of several keys. Integers are always keys (not indexes).
+
+        Parameters:
+        keys: Keys (any iterable, for example, list or NumPy array)
+        default: Value for missing keys (if none -> UDict.default) (optional)
+        """
+        if isinstance(keys, (list, tuple)) and len(keys) > 1:
+            try:
+                return list(itemgetter(*keys)(self.__dict))
+            except KeyError:
+                pass
+
+        if default == _ClassDefault:
+            default = self.__default
+        return list(map(self.__dict.get, keys, repeat(default)))
+
+    def update_many(
+            self, keys: Iterable[KT] | AnyDict[KT, VT] | UDict[KT, VT, CDV] | Iterable[tuple[KT, VT]],
+            values: Iterable[VT] = None
+    ) -> None:
+        """
+        Sets values of several keys at once. Integers are always keys (not indexes).
+
+        Parameters:
+        keys: Keys (any iterable, for example, list or NumPy array) or dict / iterable of items, if values
+        aren't defined
+        values: Values of keys (optional)
+
+        Raises:
+        ValueError: Count of keys isn't equal to count of values
+        """
+        if isinstance(keys, UDict):
+            keys = keys.__dict
+        items = keys if values is None else zip(keys, values, strict=True)
+
+        self.__own()
+        length = len(self.__dict)
+        try:
+            self.__dict.update(items)
+        finally:
+            self.__changed(length)
+
+    def pop_many(self, keys: Iterable[KT], default: DV = _ClassDefault) -> list[VT | DV]:
+        """
+        Deletes several keys and returns their values. Integers are always keys (not indexes).
+
+        Parameters:
+        keys: Keys (any iterable, for example, list or NumPy array)
+        default: Value for missing keys. If it isn't defined, KeyError is raised for missing keys (optional)
+        """
+        self.__own()
+        length = len(self.__dict)
+        try:
+            if default == _ClassDefault:
+                return list(map(self.__dict.pop, keys))
+            return list(map(self.__dict.pop, keys, repeat(default)))
+        finally:
+            self.__changed(length)
+
+    def setdefault_many(
+            self, keys: Iterable[KT] | AnyDict[KT, VT] | UDict[KT, VT, CDV], default: VT = None
+    ) -> list[VT]:
+        """
+        Sets values of several keys if they are missing and returns values of all keys.
+        Integers are always keys (not indexes).
+
+        Parameters:
+        keys: Keys (any iterable, for example, list or NumPy array) or dict with values for missing keys
+        default: Value for missing keys, if `keys` isn't dict (optional)
+        """
+        if isinstance(keys, UDict):
+            keys = keys.__dict
+
+        self.__own()
+        length = len(self.__dict)
+        try:
+            if isinstance(keys, Mapping):
+                return list(map(self.__dict.setdefault, keys.keys(), keys.values()))
+            return list(map(self.__dict.setdefault, keys, repeat(default)))
+        finally:
+            self.__changed(length)
 
     # Len, iterator and reversed version
     def __len__(self) -> int:
@@ -355,6 +1094,52 @@ class UDict(Generic[KT, VT, CDV]):
         """
         return hash(self.__repr__())
 
+    # Serialization
+    def __getstate__(self) -> tuple[dict[KT, VT], CDV, bool, dict[str, Any] | None]:
+        d = self.__dict
+        if type(d) is not dict: # pylint: disable=unidiomatic-typecheck
+            d = dict(d.items()) # pending operations are applied, so only plain dict is pickled
+        return d, self.__default, self.__index_values, getattr(self, '__dict__', None)
+
+    def __setstate__(self, state: tuple[dict[KT, VT], CDV, bool, dict[str, Any] | None]) -> None:
+        self.__dict, self.__default, self.__index_values, attrs = state
+        self.__keys = None
+        self.__values_index = None
+        self.__cow = False
+        self.__version = 0
+        if attrs:
+            self.__dict__.update(attrs) # attributes of subclasses without __slots__
+
+    def to_bytes(self) -> bytes:
+        """
+        Converts UDict to bytes in compact binary format. Lists of ints and floats are stored as raw arrays,
+        values of unknown types are pickled.
+        """
+        from ufpy.serialize import to_bytes # pylint: disable=import-outside-toplevel
+        return to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> UDict[KT, VT, CDV]:
+        """
+        Converts bytes from `to_bytes()` to UDict. Don't use it with data from untrusted sources
+        (values of unknown types are unpickled)
+
+        Raises:
+        ValueError: Data isn't in ufpy binary format or it is corrupted
+        TypeError: Data doesn't contain UDict
+        """
+        from ufpy.serialize import from_bytes # pylint: disable=import-outside-toplevel
+        o = from_bytes(data)
+        if not isinstance(o, cls):
+            raise TypeError(f"Data contains '{type(o).__name__}', not '{cls.__name__}'.")
+        return o
+
+    def freeze(self) -> FrozenUDict[KT, VT, CDV]:
+        """
+        Returns immutable copy of UDict (FrozenUDict)
+        """
+        return FrozenUDict(self.__dict, default=self.__default)
+
     # Comparing
     def __cmp__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> int:
         """
@@ -373,9 +1158,84 @@ class UDict(Generic[KT, VT, CDV]):
         https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__eq__other-dictkt-vt-udictkt-vt-cdv-bool
         """
         if isinstance(other, UDict):
-            other = other.dictionary
+            other = other.__dict
         return self.__dict == other
 
+    # diff and merge
+    def diff(self, other: AnyDict[KT, VT] | UDict[KT, VT, Any]) -> UDictDiff:
+        """
+        Returns difference between UDict and other dict: added, removed and changed items.
+        If values of key are UDicts in both dicts, difference of them is returned as changed value.
+        Time complexity is O(n), equal dicts are compared without loops in Python
+        """
+        a = self.__dict
+        b = other.__dict if isinstance(other, UDict) else other
+
+        if a == b:
+            return UDictDiff(UDict(), UDict(), UDict())
+
+        if a.keys() == b.keys():
+            added, removed = {}, {}
+        else:
+            added = {k: v for k, v in b.items() if k not in a}
+            removed = {k: v for k, v in a.items() if k not in b}
+
+        changed = {}
+        for k, v in a.items():
+            w = b.get(k, MISSING)
+            if w is MISSING or v is w or v == w:
+                continue
+            changed[k] = v.diff(w) if isinstance(v, UDict) and isinstance(w, UDict) else (v, w)
+        return UDictDiff(self.__wrap(added), self.__wrap(removed), self.__wrap(changed))
+
+    def merge(
+            self, base: AnyDict[KT, VT] | UDict[KT, VT, Any], other: AnyDict[KT, VT] | UDict[KT, VT, Any],
+            resolver: Callable[[KT, VT, VT, VT], VT] = None
+    ) -> UDict[KT, VT, CDV]:
+        """
+        Three-way merge: applies changes between `base` and UDict and changes between `base` and `other` to `base`.
+        Returns new UDict, UDict isn't changed. If values of key are UDicts in both dicts, they are merged too.
+
+        Parameters:
+        base: Common version of UDict and other dict
+        other: Other version of dict
+        resolver: Function which returns value of key, which is changed differently in UDict and `other`.
+        Its arguments are key, base value, UDict's value and other value. Values of missing keys are `MISSING`.
+        Resolver can return `MISSING` to delete key (optional)
+
+        Raises:
+        ValueError: Key is changed differently and resolver isn't defined
+        """
+        ours = self.__dict
+        base = base.__dict if isinstance(base, UDict) else base
+        theirs = other.__dict if isinstance(other, UDict) else other
+
+        result = {}
+        for k, v in ours.items():
+            value = self.__merge_values(k, base.get(k, MISSING), v, theirs.get(k, MISSING), resolver)
+            if value is not MISSING:
+                result[k] = value
+        for k, v in theirs.items():
+            if k not in ours:
+                value = self.__merge_values(k, base.get(k, MISSING), MISSING, v, resolver)
+                if value is not MISSING:
+                    result[k] = value
+        return self.__wrap(result, self.__default)
+
+    @staticmethod
+    def __merge_values(key: KT, base: VT, ours: VT, theirs: VT, resolver: Callable[[KT, VT, VT, VT], VT]) -> VT:
+        if ours is theirs or ours == theirs:
+            return ours
+        if base is ours or base == ours:
+            return theirs
+        if base is theirs or base == theirs:
+            return ours
+        if isinstance(ours, UDict) and isinstance(theirs, UDict):
+            return ours.merge(base if isinstance(base, UDict) else {}, theirs, resolver)
+        if resolver is None:
+            raise ValueError(f'Conflict in key {key!r}: {ours!r} and {theirs!r}. Please define resolver.')
+        return resolver(key, base, ours, theirs)
+
     # Math operations
     def __add__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> UDict[KT, VT, CDV]:
         # pylint: disable=line-too-long
@@ -384,14 +1244,7 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__add__other-dictkt-vt-udictkt-vt-cdv-udictkt-vt-cdv
         """
-        new_dict = self.__dict.copy()
-
-        if isinstance(other, UDict):
-            other: dict[KT, VT] = other.dictionary
-
-        for k, v in other.items():
-            new_dict[k] = v
-        return UDict(new_dict)
+        return self.__derive('add', self.__operand(other))
 
     def __sub__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> UDict[KT, VT, CDV]:
         # pylint: disable=line-too-long
@@ -400,14 +1253,7 @@ class UDict(Generic[KT, VT, CDV]):
 
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__sub__other-dictkt-vt-udictkt-vt-cdv-udictkt-vt-cdv
         """
-        new_dict = self.__dict.copy()
-        if isinstance(other, UDict):
-            other: dict[KT, VT] = other.dictionary
-
-        for k, v in other.items():
-            if new_dict.get(k) == v:
-                del new_dict[k]
-        return UDict(new_dict)
+        return self.__derive('sub', self.__operand(other))
 
     def __mul__(
             self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
@@ -415,20 +1261,21 @@ class UDict(Generic[KT, VT, CDV]):
         """
         Multiplies each value by another value with the same key or all values by integer or float number
 
+        Raises:
+        KeyError: Key of other dict isn't in UDict
+        TypeError: Other isn't number or dict of numbers, or values don't support operation with it
+
         Online docs:
         https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__mul__other-dictkt-float-int-udictkt-float-int-dv-float-int-udictkt-supportsmul-cdv
         """
-        new_dict = self.__dict.copy()
-
-        if isinstance(other, UDict):
-            other: dict[KT, VT] = other.dictionary
-        if isinstance(other, (int, float)):
-            other = {k: other for k in new_dict.keys()}
-
-        for k, v in other.items():
-            new_dict[k] *= v
+        if isinstance(other, Number):
+            self.__check_math(other, mul)
+            return self.__derive('map', lambda k, v: v * other)
 
-        return UDict(new_dict)
+        other = self.__operand(other)
+        self.__check_keys(other)
+        self.__check_math(other, mul)
+        return self.__derive('mul', other)
 
     def __truediv__(
             self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
@@ -437,16 +1284,201 @@ class UDict(Generic[KT, VT, CDV]):
         """
         Divides each value by another value with the same key or all values by integer or float number
 
+        Raises:
+        KeyError: Key of other dict isn't in UDict
+        TypeError: Other isn't number or dict of numbers, or values don't support operation with it
+        ZeroDivisionError: Divisor is 0
+
         Online docs: https://honey-team.ru/ufpy-website/main/useful_classes/udict/#__truediv__other-dictkt-float-int-udictkt-float-int-dv-float-int-udictkt-supportstruediv-cdv
         """
-        new_dict = self.__dict.copy()
+        if isinstance(other, Number):
+            self.__check_divisor(other)
+            self.__check_math(other, truediv)
+            return self.__derive('map', lambda k, v: v / other)
+
+        other = self.__operand(other)
+        self.__check_keys(other)
+        self.__check_divisor(other)
+        self.__check_math(other, truediv)
+        return self.__derive('truediv', other)
+
+    # In-place math operations
+    def __iadd__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> UDict[KT, VT, CDV]:
+        """
+        Updates UDict with items of another UDict / dict in place
+        """
+        self.__own()
+        if isinstance(other, UDict):
+            other: dict[KT, VT] = other.__dict
+
+        if self.__keys is not None:
+            self.__keys.extend(k for k in other if k not in self.__dict)
+        self.__dict.update(other)
+        self.__values_index = None
+        self.__sync_version()
+        return self
 
+    def __isub__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> UDict[KT, VT, CDV]:
+        """
+        Deletes items of another UDict / dict from UDict in place
+        """
+        self.__own()
         if isinstance(other, UDict):
-            other: dict[KT, VT] = other.dictionary
-        if isinstance(other, (int, float)):
-            other = {k: other for k in new_dict.keys()}
+            other: dict[KT, VT] = other.__dict
 
         for k, v in other.items():
-            new_dict[k] /= v
+            if k in self.__dict and self.__dict[k] == v:
+                del self.__dict[k]
+                self.__keys = None
+        self.__values_index = None
+        self.__sync_version()
+        return self
+
+    def __imath(self, other: AnyDict[KT, VT] | UDict[KT, VT, DV] | Number, op: Callable[[VT, VT], VT]) -> None:
+        # New values are computed before changing of dictionary, so it isn't changed partly on error
+        self.__own()
+        if isinstance(other, UDict):
+            other: dict[KT, VT] = other.__dict
+        elif not isinstance(other, (Mapping, Number)):
+            raise TypeError(f"Unsupported operand type for UDict: '{type(other).__name__}'.")
+
+        self.__check_numbers(other)
+        if op is truediv:
+            self.__check_divisor(other)
+        if isinstance(other, Number):
+            values = {k: op(v, other) for k, v in self.__dict.items()}
+        else:
+            self.__check_keys(other)
+            values = {k: op(self.__dict[k], v) for k, v in other.items()}
+        self.__dict.update(values) # keys aren't added, so positional index stays valid
+        self.__values_index = None
+        self.__sync_version()
+
+    def __imul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        """
+        Multiplies each value by another value with the same key or all values by integer or float number in place
+
+        Raises:
+        KeyError: Key of other dict isn't in UDict
+        TypeError: Other isn't number or dict of numbers, or values don't support operation with it
+        """
+        self.__imath(other, mul)
+        return self
+
+    def __itruediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
+    ) -> UDict[KT, VT, CDV]:
+        """
+        Divides each value by another value with the same key or all values by integer or float number in place
+
+        Raises:
+        KeyError: Key of other dict isn't in UDict
+        TypeError: Other isn't number or dict of numbers, or values don't support operation with it
+        ZeroDivisionError: Divisor is 0
+        """
+        self.__imath(other, truediv)
+        return self
+
+
+class FrozenUDict(UDict[KT, VT, CDV]):
+    """
+    Immutable UDict. Its hash is computed from its items only once, so FrozenUDict is cheap to use as a dict key
+    or as a set member. All its values must be hashable.
+
+    Methods which change UDict raise `TypeError`, assignment math operators (`+=`, `-=`, `*=`, `/=`)
+    return new FrozenUDict.
+    """
+    __slots__ = ('__frozen', '__hash')
+
+    def __init__(
+            self, dictionary: AnyDict[KT, VT] = None, *, default: CDV = None, index_values: bool = False,
+            **kwargs: VT
+    ):
+        super().__init__(dictionary, default=default, index_values=index_values, **kwargs)
+        # pylint: disable=no-member
+        self._UDict__own() # dictionary of other UDict is copied
+        self.__frozen = MappingProxyType(self._UDict__dict)
+        self.__hash: int | None = None
+
+    def __setstate__(self, state: tuple[dict[KT, VT], CDV, bool, dict[str, Any] | None]) -> None:
+        super().__setstate__(state)
+        self.__frozen = MappingProxyType(state[0])
+        self.__hash = None
+
+    # Read-only properties
+    @property
+    def dictionary(self) -> MappingProxyType[KT, VT]:
+        """
+        Read-only proxy of FrozenUDict's dictionary
+        """
+        return self.__frozen
+
+    keys = property(UDict.keys.fget, doc=UDict.keys.__doc__)
+    values = property(UDict.values.fget, doc=UDict.values.__doc__)
+    items = property(UDict.items.fget, doc=UDict.items.__doc__)
+    default = property(UDict.default.fget, doc=UDict.default.__doc__)
+
+    def __immutable(self, *_, **__):
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setitem__ = __immutable
+    __delitem__ = __immutable
+    reverse = __immutable
+    sort = __immutable
+    update_many = __immutable
+    pop_many = __immutable
+    setdefault_many = __immutable
+
+    def __call__(self, func: Callable[[KT, VT], VT]) -> FrozenUDict[KT, VT, CDV]:
+        return FrozenUDict({k: func(k, v) for k, v in self}, default=self.default)
+
+    def freeze(self) -> FrozenUDict[KT, VT, CDV]:
+        return self
+
+    # Hash and comparing
+    def __hash__(self) -> int:
+        """
+        Returns hash of FrozenUDict's items. It is computed only once
+        """
+        if self.__hash is None:
+            self.__hash = hash(frozenset(self.__frozen.items()))
+        return self.__hash
+
+    def __eq__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> bool:
+        if isinstance(other, FrozenUDict):
+            try:
+                if hash(self) != hash(other):
+                    return False
+            except TypeError: # unhashable values, so only items are compared
+                pass
+        return super().__eq__(other)
+
+    def __ne__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return f'f{super().__repr__()}'
+
+    # Math operations return new FrozenUDict
+    def __add__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> FrozenUDict[KT, VT, CDV]:
+        return FrozenUDict(super().__add__(other), default=self.default)
+
+    def __sub__(self, other: dict[KT, VT] | UDict[KT, VT, CDV]) -> FrozenUDict[KT, VT, CDV]:
+        return FrozenUDict(super().__sub__(other), default=self.default)
+
+    def __mul__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
+    ) -> FrozenUDict[KT, VT, CDV]:
+        return FrozenUDict(super().__mul__(other), default=self.default)
+
+    def __truediv__(
+            self, other: dict[KT, float | int] | UDict[KT, float | int, DV] | float | int
+    ) -> FrozenUDict[KT, VT, CDV]:
+        return FrozenUDict(super().__truediv__(other), default=self.default)
 
-        return UDict(new_dict)
+    __radd__ = __iadd__ = __add__
+    __rsub__ = __isub__ = __sub__
+    __rmul__ = __imul__ = __mul__
+    __rtruediv__ = __itruediv__ = __truediv__
@@ -3,3 +3,7 @@ Library with some useful classes, function from C++ STL, but in Python
 """
 
 from ufpy.ustl.stack import *
+from ufpy.ustl.aggregate_stack import *
+from ufpy.ustl.frozen_stack import *
+from ufpy.ustl.concurrent_stack import *
+from ufpy.ustl.spill_stack import *
@@ -0,0 +1,217 @@
+"""
+Stack which tracks minimum, maximum and sum of its elements
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, TypeVar
+
+from ufpy.math_op import r_generator
+from ufpy.typ import AnyCollection, NumberLiteral
+from ufpy.ustl.stack import Stack
+
+__all__ = (
+    'AggregateStack',
+)
+
+T = TypeVar('T')
+
+
+@r_generator
+class AggregateStack(Stack[T]):
+    """
+    Stack which keeps auxiliary monotonic stacks of minimums and maximums and prefix sums of elements,
+    so `min()`, `max()`, `sum()` and `mean()` work in O(1).
+
+    Elements must be comparable and support `+` (for example, numbers).
+    `push()`, `pop()` and changing or deleting of `top` update aggregates in O(1),
+    other changes (`remove()`, `elements = ...`, `*=` and etc.) recompute them in O(n).
+    Don't change list from `elements` property in place, because aggregates aren't updated in this case.
+    """
+    __slots__ = ('__mins', '__maxs', '__sums')
+
+    def __init__(self, *elements: T, iterable: Iterable[T] = None, typed: bool = False, typecode: str = None):
+        """
+        :param elements: Elements of stack
+        :param iterable: Elements of stack (you can use it instead of elements)
+        :param typed: If True, elements are kept in `array.array` (see `Stack`)
+        :param typecode: Typecode of `array.array` for typed stack
+        :raises ValueError: Typecode can't be detected
+        """
+        super().__init__(*elements, iterable=iterable, typed=typed, typecode=typecode)
+        self.__rebuild()
+
+    # aggregates
+    def __push_aggregates(self, v: T) -> None:
+        mins, maxs, sums = self.__mins, self.__maxs, self.__sums
+        # Equal values are pushed too, so the minimum (maximum) is kept after popping of one of them
+        if not mins or v <= mins[-1]:
+            mins.append(v)
+        if not maxs or v >= maxs[-1]:
+            maxs.append(v)
+        sums.append(sums[-1] + v if sums else v)
+
+    def __pop_aggregates(self, v: T) -> None:
+        if v == self.__mins[-1]:
+            self.__mins.pop()
+        if v == self.__maxs[-1]:
+            self.__maxs.pop()
+        self.__sums.pop()
+
+    def __rebuild(self) -> None:
+        self.__mins, self.__maxs, self.__sums = [], [], []
+        for v in self.elements: # pylint: disable=not-an-iterable
+            self.__push_aggregates(v)
+
+    def min(self) -> T | None:
+        """
+        Minimal element of stack (`None` if stack is empty). Works in O(1)
+        """
+        return self.__mins[-1] if self.__mins else None
+
+    def max(self) -> T | None:
+        """
+        Maximal element of stack (`None` if stack is empty). Works in O(1)
+        """
+        return self.__maxs[-1] if self.__maxs else None
+
+    def sum(self) -> T | int:
+        """
+        Sum of elements of stack (0 if stack is empty). Works in O(1)
+        """
+        return self.__sums[-1] if self.__sums else 0
+
+    def mean(self) -> float | None:
+        """
+        Arithmetic mean of elements of stack (`None` if stack is empty). Works in O(1)
+        """
+        return self.__sums[-1] / len(self.__sums) if self.__sums else None
+
+    # elements
+    @Stack.elements.setter
+    def elements(self, value: Iterable[T]):
+        Stack.elements.fset(self, value) # pylint: disable=no-member
+        self.__rebuild()
+
+    @elements.deleter
+    def elements(self):
+        Stack.elements.fdel(self) # pylint: disable=no-member
+        self.__rebuild()
+
+    # top
+    @Stack.top.setter
+    def top(self, value: T):
+        old = self.pop()
+        try:
+            self.push(value)
+        except Exception:
+            self.push(old)
+            raise
+
+    @top.deleter
+    def top(self):
+        self.pop()
+
+    # public methods
+    def pop(self) -> T:
+        """
+        Remove and return top element.
+
+        :return: Removed element
+        """
+        v = super().pop()
+        self.__pop_aggregates(v)
+        return v
+
+    def push(self, *items: T) -> AggregateStack[T]:
+        """
+        Append items to stack.
+
+        :return: This stack
+        """
+        return self.extend(items)
+
+    def extend(self, items: Iterable[T]) -> AggregateStack[T]:
+        """
+        Append items from iterable to stack. Stack isn't changed if some item can't be added.
+
+        :return: This stack
+        """
+        n = len(self)
+        elements = self.elements
+        try:
+            super().extend(items)
+            # Values are read from stack, because typed stack can convert them (for example, int to float)
+            for v in elements[n:]:
+                self.__push_aggregates(v)
+        except Exception:
+            while len(self.__sums) > n:
+                self.__pop_aggregates(elements[len(self.__sums) - 1])
+            del elements[n:]
+            raise
+        return self
+
+    def remove(self, *items: T) -> AggregateStack[T]:
+        """
+        Remove elements from stack (first occurrence of every element).
+
+        :return: This stack
+        :raises ValueError: Element isn't in stack
+        """
+        try:
+            return super().remove(*items)
+        finally:
+            self.__rebuild()
+
+    def remove_many(self, items: Iterable[T]) -> AggregateStack[T]:
+        """
+        Remove elements from stack. Every element is removed as many times as it is in items.
+
+        :return: This stack
+        :raises ValueError: Element isn't in stack
+        """
+        try:
+            return super().remove_many(items)
+        finally:
+            self.__rebuild()
+
+    # copying
+    def copy(self) -> AggregateStack[T]:
+        return AggregateStack(iterable=self.elements[:], typecode=self.typecode)
+
+    # serialization
+    def __setstate__(self, state: tuple[list[T]]) -> None:
+        super().__setstate__(state)
+        self.__rebuild()
+
+    # math operations
+    def __mul__(
+        self, other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> AggregateStack[T]:
+        s = super().__mul__(other)
+        return AggregateStack(iterable=s.elements, typecode=s.typecode)
+
+    def __truediv__(
+        self, other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> AggregateStack[T]:
+        s = super().__truediv__(other)
+        return AggregateStack(iterable=s.elements, typecode=s.typecode)
+
+    def __imul__(
+        self, other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> AggregateStack[T]:
+        try:
+            return super().__imul__(other)
+        finally:
+            self.__rebuild()
+
+    def __itruediv__(
+        self, other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> AggregateStack[T]:
+        try:
+            return super().__itruediv__(other)
+        finally:
+            self.__rebuild()
+
+    def __repr__(self) -> str:
+        return f'a{super().__repr__()}'
@@ -0,0 +1,430 @@
+"""
+Thread-safe and asyncio stacks for producers and consumers
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from functools import partial
+from queue import Empty, Full
+from threading import Condition, RLock
+from time import monotonic
+from typing import Callable, Generic, Iterable, TypeVar
+
+from ufpy.ustl.stack import Stack
+
+__all__ = (
+    'ConcurrentStack',
+    'AsyncStack',
+)
+
+T = TypeVar('T')
+
+
+class _Signal: # pylint: disable=too-few-public-methods
+    """
+    Condition with count of threads which wait for it
+    """
+    __slots__ = ('condition', 'waiters')
+
+    def __init__(self, lock: RLock):
+        self.condition = Condition(lock)
+        self.waiters = 0
+
+    def notify(self, n: int = 1) -> None:
+        """
+        Wakes up to n waiting threads. Lock isn't acquired if nobody waits
+        """
+        if self.waiters:
+            with self.condition:
+                self.condition.notify(n)
+
+
+def _deadline(timeout: float | None) -> float | None:
+    if timeout is not None and timeout < 0:
+        raise ValueError('timeout must be a non-negative number.')
+    return None if timeout is None else monotonic() + timeout
+
+
+class ConcurrentStack(Generic[T]):
+    """
+    Thread-safe LIFO stack for producers and consumers. Elements are kept in `Stack`.
+
+    `pop()` waits for elements if stack is empty. If `maxsize` is defined, `push()` waits for free place
+    if stack is full. Both of them support `block=False` and `timeout` like in `queue.Queue`.
+
+    `pop()` and `push()` of unbounded stack don't use locks (appending and popping of list are atomic),
+    lock is used only to wait for elements or free place. Pushes of bounded stack use lock to keep size limit.
+    """
+    __slots__ = ('__stack', '__elements', '__maxsize', '__lock', '__not_empty', '__not_full')
+
+    def __init__(self, *elements: T, iterable: Iterable[T] = None, maxsize: int = 0):
+        """
+        :param elements: Elements of stack
+        :param iterable: Elements of stack (you can use it instead of elements)
+        :param maxsize: Maximal count of elements (0 -> unbounded stack)
+        :raises ValueError: maxsize is negative or count of elements is greater than maxsize
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must not be negative.')
+
+        self.__stack = Stack(*elements, iterable=iterable)
+        self.__elements: list[T] = self.__stack.elements
+        if maxsize and len(self.__elements) > maxsize:
+            raise ValueError('Count of elements is greater than maxsize.')
+
+        self.__maxsize = maxsize
+        self.__lock = RLock()
+        self.__not_empty = _Signal(self.__lock)
+        self.__not_full = _Signal(self.__lock)
+
+    # properties
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximal count of elements (0 for unbounded stack)
+        """
+        return self.__maxsize
+
+    @property
+    def elements(self) -> list[T]:
+        """
+        Copy of elements of stack
+        """
+        return self.__elements[:]
+
+    @property
+    def top(self) -> T | None:
+        """
+        Top element of stack (`None` if stack is empty)
+        """
+        try:
+            return self.__elements[-1]
+        except IndexError:
+            return None
+
+    def to_stack(self) -> Stack[T]:
+        """
+        Converts ConcurrentStack to Stack (snapshot of elements)
+        """
+        return self.__stack.copy()
+
+    # waiting
+    @staticmethod
+    def __wait(signal: _Signal, attempt: Callable[[], bool], block: bool, deadline: float | None) -> bool:
+        # Calls attempt() until it succeeds. Lock must be acquired.
+        # Waiter is counted before the first attempt, so push() and pop() without lock don't miss it
+        signal.waiters += 1
+        try:
+            while not attempt():
+                remaining = None if deadline is None else deadline - monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    return False
+                signal.condition.wait(remaining)
+            return True
+        finally:
+            signal.waiters -= 1
+
+    # push
+    def __append_bounded(self, v: T) -> bool:
+        # All pushes of bounded stack use lock, so size can't be greater than maxsize
+        if len(self.__elements) < self.__maxsize:
+            self.__elements.append(v)
+            return True
+        return False
+
+    def push(self, *items: T, block: bool = True, timeout: float = None) -> ConcurrentStack[T]:
+        """
+        Append items to stack. If stack is bounded and full, waits for free place.
+
+        :param block: If False, doesn't wait and raises `queue.Full` if stack is full
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: This stack
+        :raises queue.Full: Stack is still full after timeout (items before it are pushed)
+        """
+        if not self.__maxsize:
+            self.__elements.extend(items)
+            self.__not_empty.notify(len(items))
+            return self
+        return self.push_many(items, block=block, timeout=timeout)
+
+    def push_many(self, items: Iterable[T], *, block: bool = True, timeout: float = None) -> ConcurrentStack[T]:
+        """
+        Append items from iterable to stack. If stack is bounded and full, waits for free place.
+
+        :param block: If False, doesn't wait and raises `queue.Full` if stack is full
+        :param timeout: Maximal time of waiting in seconds for all items (None -> infinite)
+        :return: This stack
+        :raises queue.Full: Stack is still full after timeout (items before it are pushed)
+        """
+        if not self.__maxsize:
+            return self.push(*items)
+
+        deadline = _deadline(timeout)
+        with self.__lock:
+            for v in items:
+                if not self.__wait(self.__not_full, partial(self.__append_bounded, v), block, deadline):
+                    raise Full
+                self.__not_empty.notify()
+        return self
+
+    # pop
+    def pop(self, *, block: bool = True, timeout: float = None) -> T:
+        """
+        Remove and return top element. If stack is empty, waits for element.
+
+        :param block: If False, doesn't wait and raises `queue.Empty` if stack is empty
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: Removed element
+        :raises queue.Empty: Stack is still empty after timeout
+        """
+        try:
+            v = self.__elements.pop()
+        except IndexError:
+            return self.pop_many(1, block=block, timeout=timeout)[0]
+        self.__not_full.notify()
+        return v
+
+    def pop_many(self, n: int, *, block: bool = True, timeout: float = None) -> list[T]:
+        """
+        Remove and return up to n top elements (from top to bottom). If stack is empty, waits for the first element.
+
+        :param block: If False, doesn't wait and raises `queue.Empty` if stack is empty
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: Removed elements
+        :raises queue.Empty: Stack is still empty after timeout
+        :raises ValueError: n isn't positive
+        """
+        if n <= 0:
+            raise ValueError('n must be positive.')
+        deadline = _deadline(timeout)
+        elements = self.__elements
+        result = []
+
+        def pop() -> bool:
+            while len(result) < n:
+                try:
+                    result.append(elements.pop())
+                except IndexError:
+                    break
+            return bool(result)
+
+        if not pop():
+            with self.__lock:
+                if not self.__wait(self.__not_empty, pop, block, deadline):
+                    raise Empty
+        self.__not_full.notify(len(result))
+        return result
+
+    # Booleans
+    def __len__(self) -> int:
+        return len(self.__stack)
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if stack is empty
+        """
+        return not self.__elements
+
+    def is_full(self) -> bool:
+        """
+        Returns True if stack is bounded and full
+        """
+        return bool(self.__maxsize) and len(self.__elements) >= self.__maxsize
+
+    def __bool__(self) -> bool:
+        return bool(self.__elements)
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'cc{self.__stack!r}'
+
+
+class AsyncStack(Generic[T]):
+    """
+    LIFO stack for asyncio producers and consumers. Elements are kept in `Stack`.
+
+    `pop()` waits for elements if stack is empty. If `maxsize` is defined, `push()` waits for free place
+    if stack is full. Use `pop_nowait()` and `push_nowait()` to not wait.
+    It is not thread-safe, use it in one event loop.
+    """
+    __slots__ = ('__stack', '__elements', '__maxsize', '__pop_waiters', '__push_waiters')
+
+    def __init__(self, *elements: T, iterable: Iterable[T] = None, maxsize: int = 0):
+        """
+        :param elements: Elements of stack
+        :param iterable: Elements of stack (you can use it instead of elements)
+        :param maxsize: Maximal count of elements (0 -> unbounded stack)
+        :raises ValueError: maxsize is negative or count of elements is greater than maxsize
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must not be negative.')
+
+        self.__stack = Stack(*elements, iterable=iterable)
+        self.__elements: list[T] = self.__stack.elements
+        if maxsize and len(self.__elements) > maxsize:
+            raise ValueError('Count of elements is greater than maxsize.')
+
+        self.__maxsize = maxsize
+        self.__pop_waiters: deque[asyncio.Future[None]] = deque()
+        self.__push_waiters: deque[asyncio.Future[None]] = deque()
+
+    # properties
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximal count of elements (0 for unbounded stack)
+        """
+        return self.__maxsize
+
+    @property
+    def elements(self) -> list[T]:
+        """
+        Copy of elements of stack
+        """
+        return self.__elements[:]
+
+    @property
+    def top(self) -> T | None:
+        """
+        Top element of stack (`None` if stack is empty)
+        """
+        return self.__elements[-1] if self.__elements else None
+
+    def to_stack(self) -> Stack[T]:
+        """
+        Converts AsyncStack to Stack (snapshot of elements)
+        """
+        return self.__stack.copy()
+
+    # waiting
+    @staticmethod
+    def __wake(waiters: deque[asyncio.Future[None]], n: int = 1) -> None:
+        while n and waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                n -= 1
+
+    async def __wait(self, waiters: deque[asyncio.Future[None]]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.__wake(waiters) # task was woken and cancelled, so the next task is woken instead of it
+            raise
+
+    # push
+    def push_nowait(self, *items: T) -> AsyncStack[T]:
+        """
+        Append items to stack without waiting.
+
+        :return: This stack
+        :raises asyncio.QueueFull: Stack doesn't have place for all items (nothing is pushed)
+        """
+        if self.__maxsize and len(self.__elements) + len(items) > self.__maxsize:
+            raise asyncio.QueueFull
+        self.__elements.extend(items)
+        self.__wake(self.__pop_waiters, len(items))
+        return self
+
+    async def push(self, *items: T, timeout: float = None) -> AsyncStack[T]:
+        """
+        Append items to stack. If stack is bounded and full, waits for free place.
+
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: This stack
+        :raises TimeoutError: Stack is still full after timeout (items before it are pushed)
+        """
+        return await self.push_many(items, timeout=timeout)
+
+    async def push_many(self, items: Iterable[T], *, timeout: float = None) -> AsyncStack[T]:
+        """
+        Append items from iterable to stack. If stack is bounded and full, waits for free place.
+
+        :param timeout: Maximal time of waiting in seconds for all items (None -> infinite)
+        :return: This stack
+        :raises TimeoutError: Stack is still full after timeout (items before it are pushed)
+        """
+        if not self.__maxsize:
+            return self.push_nowait(*items)
+
+        async with asyncio.timeout(timeout):
+            for v in items:
+                while self.is_full():
+                    await self.__wait(self.__push_waiters)
+                self.__elements.append(v)
+                self.__wake(self.__pop_waiters)
+        return self
+
+    # pop
+    def pop_nowait(self) -> T:
+        """
+        Remove and return top element without waiting.
+
+        :return: Removed element
+        :raises asyncio.QueueEmpty: Stack is empty
+        """
+        if not self.__elements:
+            raise asyncio.QueueEmpty
+        v = self.__elements.pop()
+        self.__wake(self.__push_waiters)
+        return v
+
+    async def pop(self, *, timeout: float = None) -> T:
+        """
+        Remove and return top element. If stack is empty, waits for element.
+
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: Removed element
+        :raises TimeoutError: Stack is still empty after timeout
+        """
+        return (await self.pop_many(1, timeout=timeout))[0]
+
+    async def pop_many(self, n: int, *, timeout: float = None) -> list[T]:
+        """
+        Remove and return up to n top elements (from top to bottom). If stack is empty, waits for the first element.
+
+        :param timeout: Maximal time of waiting in seconds (None -> infinite)
+        :return: Removed elements
+        :raises TimeoutError: Stack is still empty after timeout
+        :raises ValueError: n isn't positive
+        """
+        if n <= 0:
+            raise ValueError('n must be positive.')
+        elements = self.__elements
+        if not elements:
+            async with asyncio.timeout(timeout):
+                while not elements:
+                    await self.__wait(self.__pop_waiters)
+
+        result = elements[:-n - 1:-1]
+        del elements[-n:]
+        self.__wake(self.__push_waiters, len(result))
+        return result
+
+    # Booleans
+    def __len__(self) -> int:
+        return len(self.__stack)
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if stack is empty
+        """
+        return not self.__elements
+
+    def is_full(self) -> bool:
+        """
+        Returns True if stack is bounded and full
+        """
+        return bool(self.__maxsize) and len(self.__elements) >= self.__maxsize
+
+    def __bool__(self) -> bool:
+        return bool(self.__elements)
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'ac{self.__stack!r}'
@@ -0,0 +1,191 @@
+"""
+Immutable stack with structural sharing
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Iterable, Iterator, TypeVar
+
+from ufpy.ustl.stack import Stack
+
+__all__ = (
+    'FrozenStack',
+)
+
+T = TypeVar('T')
+T2 = TypeVar('T2')
+
+_Node = tuple # (value, next node) or None for empty stack
+
+
+class FrozenStack(Generic[T]):
+    """
+    Immutable (persistent) stack. It is a linked list of `(value, next)` nodes, so new versions share elements
+    with old ones: `push()` and `pop()` return new stack in O(1) time and memory, and old stack stays valid.
+
+    Hash is computed only once, so FrozenStack can be used as a dict key or as a set member
+    (all its elements must be hashable in this case).
+    """
+    __slots__ = ('__node', '__len', '__hash')
+
+    def __init__(self, *elements: T, iterable: Iterable[T] = None):
+        """
+        :param elements: Elements of stack (from bottom to top)
+        :param iterable: Elements of stack (you can use it instead of elements)
+        """
+        node, n = None, 0
+        for v in (elements if iterable is None else iterable):
+            node, n = (v, node), n + 1
+        self.__node: _Node | None = node
+        self.__len = n
+        self.__hash: int | None = None
+
+    @classmethod
+    def __new_version(cls, node: _Node | None, n: int) -> FrozenStack[T]:
+        new = cls.__new__(cls)
+        new.__node, new.__len, new.__hash = node, n, None # pylint: disable=unused-private-member
+        return new
+
+    # elements
+    @property
+    def elements(self) -> list[T]:
+        """
+        New list with elements of stack (from bottom to top). Works in O(n)
+        """
+        elements = list(self)
+        elements.reverse()
+        return elements
+
+    @property
+    def top(self) -> T | None:
+        """
+        Top element of stack (`None` if stack is empty)
+        """
+        return self.__node[0] if self.__node else None
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates elements from top to bottom
+        """
+        node = self.__node
+        while node:
+            v, node = node
+            yield v
+
+    # new versions
+    def push(self, *items: T) -> FrozenStack[T]:
+        """
+        Returns new stack with items appended to this stack. Works in O(k), where k is count of items
+
+        :return: New stack
+        """
+        return self.extend(items)
+
+    def extend(self, items: Iterable[T]) -> FrozenStack[T]:
+        """
+        Returns new stack with items from iterable appended to this stack
+
+        :return: New stack
+        """
+        node, n = self.__node, self.__len
+        for v in items:
+            node, n = (v, node), n + 1
+        return self.__new_version(node, n)
+
+    def pop(self) -> FrozenStack[T]:
+        """
+        Returns new stack without top element. Works in O(1). Use `top` property to get top element
+
+        :return: New stack
+        :raises IndexError: Stack is empty
+        """
+        if not self.__node:
+            raise IndexError('pop from empty stack')
+        return self.__new_version(self.__node[1], self.__len - 1)
+
+    def clear(self) -> FrozenStack[T]:
+        """
+        Returns empty stack
+
+        :return: New stack
+        """
+        return self.__new_version(None, 0)
+
+    def to_stack(self) -> Stack[T]:
+        """
+        Converts FrozenStack to mutable Stack
+        """
+        return Stack(iterable=self.elements)
+
+    def freeze(self) -> FrozenStack[T]:
+        """
+        Returns this stack (it is already frozen)
+        """
+        return self
+
+    # copying
+    def copy(self) -> FrozenStack[T]:
+        """
+        Returns this stack, because it is immutable
+        """
+        return self
+
+    def __copy__(self) -> FrozenStack[T]:
+        return self
+
+    # serialization
+    def __getstate__(self) -> tuple[list[T]]:
+        # Elements are saved as list, because pickling of deep nested nodes can exceed recursion limit
+        return (self.elements,)
+
+    def __setstate__(self, state: tuple[list[T]]) -> None:
+        self.__init__(iterable=state[0])
+
+    # math operations
+    def __add__(self, other: Stack[T2] | FrozenStack[T2] | list[T2] | tuple[T2, ...] | T2) -> FrozenStack[T | T2]:
+        if isinstance(other, (Stack, FrozenStack)):
+            return self.extend(other.elements)
+        if isinstance(other, (list, tuple)):
+            return self.extend(other)
+        return self.push(other)
+
+    # Booleans
+    def __len__(self) -> int:
+        return self.__len
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if stack is empty
+        """
+        return self.__len == 0
+
+    def __bool__(self) -> bool:
+        return self.__len != 0
+
+    # Hash and comparing
+    def __hash__(self) -> int:
+        """
+        Returns hash of FrozenStack's elements. It is computed only once
+        """
+        if self.__hash is None:
+            self.__hash = hash(tuple(self))
+        return self.__hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Stack):
+            return other == self
+        if not isinstance(other, FrozenStack):
+            return NotImplemented
+        # pylint: disable=protected-access
+        if self.__len != other.__len:
+            return False
+        a, b = self.__node, other.__node
+        while a is not b: # shared tails aren't compared
+            if a[0] != b[0]:
+                return False
+            a, b = a[1], b[1]
+        return True
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'fs{self.elements}'
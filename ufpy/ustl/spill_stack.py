@@ -0,0 +1,239 @@
+"""
+Stack which keeps its bottom elements in a file when they don't fit in memory
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from os import PathLike
+from tempfile import TemporaryFile
+from typing import BinaryIO, Generic, Iterable, TypeVar
+
+from ufpy.ustl.stack import Stack
+
+__all__ = (
+    'SpillStack',
+)
+
+T = TypeVar('T')
+
+
+class SpillStack(Generic[T]):
+    """
+    Stack with limited count of elements in memory. If count of elements in memory is greater than `capacity`,
+    `segment` bottom elements are written to temporary file in ufpy binary format (see `to_bytes()`).
+    When all elements in memory are popped, the last written segment is read back.
+
+    Segments are written one after another at the end of file, and the last segment is read first,
+    so file is always written and read sequentially. `push()`, `pop()`, `top` and `len()` work in O(1) amortised.
+    Temporary file is deleted when stack is closed or garbage collected.
+
+    Elements of unknown types are pickled when they are written to file.
+    """
+    __slots__ = ('__hot', '__segments', '__spilled', '__capacity', '__segment', '__directory', '__file')
+
+    def __init__(
+            self, *elements: T, iterable: Iterable[T] = None, capacity: int = 1_000_000, segment: int = None,
+            directory: str | PathLike = None
+    ):
+        """
+        :param elements: Elements of stack
+        :param iterable: Elements of stack (you can use it instead of elements)
+        :param capacity: Maximal count of elements in memory
+        :param segment: Count of elements which are written to file at once (capacity // 2 by default).
+        It can't be greater than capacity // 2, otherwise every few pushes after `pop()` would read and write
+        the same segment again
+        :param directory: Directory of temporary file (default temporary directory by default)
+        :raises ValueError: capacity is less than 2 or segment isn't between 1 and capacity // 2
+        """
+        if capacity < 2:
+            raise ValueError('capacity must be at least 2.')
+        if segment is None:
+            segment = capacity // 2
+        if not 0 < segment <= capacity // 2:
+            raise ValueError('segment must be positive and not greater than half of capacity.')
+
+        self.__hot: list[T] = [] # top elements in memory
+        self.__segments: list[tuple[int, int, int]] = [] # (offset, size in bytes, count of elements) in file
+        self.__spilled = 0
+        self.__capacity = capacity
+        self.__segment = segment
+        self.__directory = directory
+        self.__file: BinaryIO | None = None # file is created at first spill
+
+        self.extend(elements if iterable is None else iterable)
+
+    # properties
+    @property
+    def capacity(self) -> int:
+        """
+        Maximal count of elements in memory
+        """
+        return self.__capacity
+
+    @property
+    def segment(self) -> int:
+        """
+        Count of elements which are written to file at once
+        """
+        return self.__segment
+
+    @property
+    def spilled(self) -> int:
+        """
+        Count of elements in file
+        """
+        return self.__spilled
+
+    @property
+    def elements(self) -> list[T]:
+        """
+        All elements of stack (from bottom to top). Reads all file, so it works in O(n)
+        """
+        from ufpy.serialize import from_bytes # pylint: disable=import-outside-toplevel
+        elements = []
+        if self.__segments:
+            self.__file.seek(0)
+            for _, size, _ in self.__segments:
+                elements.extend(from_bytes(self.__file.read(size)))
+        elements.extend(self.__hot)
+        return elements
+
+    def to_stack(self) -> Stack[T]:
+        """
+        Converts SpillStack to Stack (all elements are loaded to memory)
+        """
+        return Stack(iterable=self.elements)
+
+    # file
+    def __spill(self) -> None:
+        from ufpy.serialize import to_bytes # pylint: disable=import-outside-toplevel
+        if self.__file is None:
+            self.__file = TemporaryFile(dir=self.__directory) # pylint: disable=consider-using-with
+
+        n = self.__segment
+        data = to_bytes(self.__hot[:n])
+        offset = sum(self.__segments[-1][:2]) if self.__segments else 0
+        self.__file.seek(offset)
+        self.__file.write(data)
+        self.__segments.append((offset, len(data), n))
+        self.__spilled += n
+        del self.__hot[:n]
+
+    def __page_in(self) -> bool:
+        # Reads the last segment if there are no elements in memory. Returns False if stack is empty
+        if self.__hot:
+            return True
+        if not self.__segments:
+            return False
+
+        from ufpy.serialize import from_bytes # pylint: disable=import-outside-toplevel
+        offset, size, n = self.__segments.pop()
+        self.__file.seek(offset)
+        self.__hot = from_bytes(self.__file.read(size))
+        self.__file.truncate(offset)
+        self.__spilled -= n
+        return True
+
+    def close(self) -> None:
+        """
+        Deletes all elements and temporary file
+        """
+        self.clear()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> SpillStack[T]:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    # top
+    @property
+    def top(self) -> T | None:
+        """
+        Top element of stack (`None` if stack is empty)
+        """
+        return self.__hot[-1] if self.__page_in() else None
+
+    @top.setter
+    def top(self, value: T):
+        self.__page_in()
+        self.__hot[-1] = value
+
+    @top.deleter
+    def top(self):
+        self.pop()
+
+    # public methods
+    def push(self, *items: T) -> SpillStack[T]:
+        """
+        Append items to stack.
+
+        :return: This stack
+        """
+        self.__hot.extend(items)
+        while len(self.__hot) > self.__capacity:
+            self.__spill()
+        return self
+
+    def extend(self, items: Iterable[T]) -> SpillStack[T]:
+        """
+        Append items from iterable to stack. Items are read by segments, so iterable can be bigger than memory.
+
+        :return: This stack
+        """
+        items = iter(items)
+        while chunk := list(islice(items, self.__segment)):
+            self.push(*chunk)
+        return self
+
+    def pop(self) -> T:
+        """
+        Remove and return top element.
+
+        :return: Removed element
+        :raises IndexError: Stack is empty
+        """
+        if not self.__page_in():
+            raise IndexError('pop from empty stack')
+        return self.__hot.pop()
+
+    def clear(self) -> SpillStack[T]:
+        """
+        Remove all elements from stack
+
+        :return: This stack
+        """
+        self.__hot = []
+        self.__segments.clear()
+        self.__spilled = 0
+        if self.__file is not None:
+            self.__file.truncate(0)
+        return self
+
+    # Booleans
+    def __len__(self) -> int:
+        return self.__spilled + len(self.__hot)
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if stack is empty
+        """
+        return len(self) == 0
+
+    def __bool__(self) -> bool:
+        return not self.is_empty()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SpillStack):
+            other = other.to_stack()
+        if isinstance(other, Stack):
+            return self.to_stack() == other
+        return NotImplemented
+
+    # Transform to other types
+    def __repr__(self) -> str:
+        return f'sp{self.to_stack()!r}'
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from array import array, typecodes
+from collections import Counter
+from itertools import repeat
+from operator import mul, truediv
 from typing import Generic, TypeVar, Iterable, Callable
 
+import numpy as np
+
 from ufpy.cmp import cmp_generator
 from ufpy.math_op import r_generator, i_generator
 from ufpy.typ import AnyCollection, NumberLiteral, SupportsMul, SupportsTrueDiv, Empty
@@ -16,19 +22,47 @@ __all__ = (
 T = TypeVar("T")
 T2 = TypeVar("T2") # pylint: disable=invalid-name
 
-def _convert_to_stack(other: Stack[T] | AnyCollection[T] | T) -> Stack[T]:
-    if isinstance(other, Stack):
-        return other
-    if isinstance(other, (list, tuple)):
-        return Stack(iterable=other)
-    return Stack(other)
-
-def _convert_to_list_for_mul_and_div(other: Stack[T] | AnyCollection[T] | T, __len: int = None) -> list[T]:
+def _convert_to_elements(other: Stack[T] | AnyCollection[T] | T) -> AnyCollection[T]:
     if isinstance(other, Stack):
         return other.elements
     if isinstance(other, (list, tuple)):
-        return list(other)
-    return [other for _ in range(__len)]
+        return other
+    return other,
+
+def _detect_typecode(elements: Iterable[T]) -> str | None:
+    # Ints are stored as int64, floats (and ints together with floats) as float64
+    types = set(map(type, elements))
+    if types == {int}:
+        return 'q'
+    if types and types <= {int, float}:
+        return 'd'
+    return None
+
+def _to_array(values: np.ndarray, typecode: str) -> array | list:
+    # Result of NumPy operation is copied to array.array (or list, if array.array doesn't support its dtype)
+    if values.dtype != np.dtype(typecode):
+        typecode = values.dtype.char
+        if typecode not in typecodes:
+            return values.tolist()
+    result = array(typecode)
+    result.frombytes(memoryview(values).cast('B'))
+    return result
+
+def _overflows(ufunc: np.ufunc, a: np.ndarray, b: object, dtype: np.dtype) -> bool:
+    # NumPy integer operations silently wrap around, so result is checked in float64. It can be a bit inexact
+    # near bounds of integer type, but such results are just computed again with Python ints
+    if dtype.kind not in 'iu':
+        return False
+    info = np.iinfo(dtype)
+    with np.errstate(all='ignore'):
+        approx = ufunc(a, b, dtype=np.float64)
+    return bool((approx < info.min).any() or (approx > info.max).any())
+
+
+def _check_divisor(ufunc: np.ufunc, operand: object) -> None:
+    # NumPy returns inf or nan for division by zero, but typed stacks must work as other stacks
+    if ufunc is np.true_divide and not np.all(operand):
+        raise ZeroDivisionError('division by zero')
 
 @cmp_generator
 @i_generator
@@ -36,24 +70,61 @@ def _convert_to_list_for_mul_and_div(other: Stack[T] | AnyCollection[T] | T, __l
 class Stack(Generic[T]):
     """
     Class for simplifying working with stacks in Python.
+
+    Typed stack (`typed=True` or `typecode=...`) keeps numbers in `array.array` instead of list,
+    so every int or float uses 8 bytes instead of a Python object.
     """
-    def __init__(self, *elements: T, iterable: Iterable[T] = None):
-        if iterable:
+    __slots__ = ('__elements',)
+
+    def __init__(self, *elements: T, iterable: Iterable[T] = None, typed: bool = False, typecode: str = None):
+        """
+        :param elements: Elements of stack
+        :param iterable: Elements of stack (you can use it instead of elements)
+        :param typed: If True, elements are kept in `array.array`. Its typecode is detected by elements:
+        `'q'` for ints and `'d'` for floats
+        :param typecode: Typecode of `array.array` for typed stack (for example, `'i'` or `'f'`)
+        :raises ValueError: Typecode can't be detected (stack is empty or not all elements are ints or floats)
+        """
+        if iterable is not None:
             elements = iterable
-        self.__elements = list(elements) if elements else []
+        if typed and typecode is None:
+            elements = list(elements)
+            typecode = _detect_typecode(elements)
+            if typecode is None:
+                raise ValueError("Can't detect typecode: elements must be ints or floats. Please define typecode.")
+        if typecode is not None:
+            self.__elements = array(typecode, elements)
+        else:
+            self.__elements = list(elements)
 
     # elements
     @property
-    def elements(self) -> list[T]:
+    def elements(self) -> list[T] | array:
+        """
+        Elements of stack (list or `array.array` for typed stack)
+        """
         return self.__elements
 
     @elements.setter
     def elements(self, value: Iterable[T]):
-        self.__elements = list(value)
+        self.__elements = self.__new_elements(value)
 
     @elements.deleter
     def elements(self):
-        self.__elements.clear()
+        del self.__elements[:]
+
+    def __new_elements(self, value: Iterable[T]) -> list[T] | array:
+        # Container of the same type for new elements
+        if self.typecode is None:
+            return list(value)
+        return array(self.typecode, value)
+
+    @property
+    def typecode(self) -> str | None:
+        """
+        Typecode of `array.array` for typed stack (`None` for untyped stack)
+        """
+        return self.__elements.typecode if isinstance(self.__elements, array) else None
 
     # top
     @property
@@ -74,6 +145,23 @@ class Stack(Generic[T]):
         del self.__elements[-1]
 
     # public methods
+    def __remove_counts(self, items: list[T]) -> tuple[Counter[T], list[T], int]:
+        # Returns counts of items which aren't found, kept elements and count of not found items
+        counts = Counter(items)
+        elements = self.__elements
+        kept = []
+        left = len(items)
+        for i, v in enumerate(elements):
+            if left == 0:
+                kept.extend(elements[i:])
+                break
+            if counts[v]:
+                counts[v] -= 1
+                left -= 1
+            else:
+                kept.append(v)
+        return counts, kept, left
+
     def pop(self) -> T:
         """
         Remove and return top element.
@@ -83,17 +171,64 @@ class Stack(Generic[T]):
         return self.__elements.pop()
 
     def push(self, *items: T) -> Stack[T]:
-        """Append items to stack"""
+        """
+        Append items to stack.
+
+        :return: This stack
+        """
         self.__elements.extend(items)
-        return Stack(iterable=self.__elements)
+        return self
+
+    def extend(self, items: Iterable[T]) -> Stack[T]:
+        """
+        Append items from iterable to stack.
+
+        :return: This stack
+        """
+        self.__elements.extend(items)
+        return self
 
     def remove(self, *items: T) -> Stack[T]:
         """
-        Remove elements from stack
+        Remove elements from stack (first occurrence of every element).
+
+        :return: This stack
+        :raises ValueError: Element isn't in stack
         """
-        for i in items:
-            self.__elements.remove(i)
-        return Stack(iterable=self.__elements)
+        if not items:
+            return self
+        if len(items) == 1:
+            self.__elements.remove(items[0])
+            return self
+        return self.remove_many(items)
+
+    def remove_many(self, items: Iterable[T]) -> Stack[T]:
+        """
+        Remove elements from stack. Every element is removed as many times as it is in items
+        (first occurrences are removed). It works in O(n + k) for hashable elements.
+        Stack isn't changed if some element isn't in stack.
+
+        :return: This stack
+        :raises ValueError: Element isn't in stack
+        """
+        items = list(items)
+        if not items:
+            return self
+        try:
+            counts, kept, left = self.__remove_counts(items)
+        except TypeError: # unhashable elements
+            # Elements are removed from copy, so stack isn't changed if some element isn't in it
+            kept = list(self.__elements)
+            for i in items:
+                kept.remove(i)
+        else:
+            if left:
+                missing = next(k for k, c in counts.items() if c)
+                raise ValueError(f'{missing!r} is not in stack')
+
+        # List from `elements` property is changed in place too
+        self.__elements[:] = kept if self.typecode is None else self.__new_elements(kept)
+        return self
 
     def clear(self) -> Empty[Stack]:
         del self.elements
@@ -101,48 +236,147 @@ class Stack(Generic[T]):
 
     # copying
     def copy(self) -> Stack[T]:
-        return Stack(iterable=self.__elements.copy())
+        return Stack(iterable=self.__elements[:], typecode=self.typecode)
 
     def __copy__(self):
         return self.copy()
 
+    def freeze(self) -> FrozenStack[T]:
+        """
+        Returns immutable copy of stack. New versions of it (after push and pop) share elements
+
+        :return: FrozenStack with the same elements
+        """
+        from ufpy.ustl.frozen_stack import FrozenStack
+        return FrozenStack(iterable=self.__elements)
+
+    # serialization
+    def __getstate__(self) -> tuple[list[T]]:
+        return (self.__elements,) # not empty tuple, so __setstate__ is called for empty stack too
+
+    def __setstate__(self, state: tuple[list[T]]) -> None:
+        self.__elements, = state
+
+    def to_bytes(self) -> bytes:
+        """
+        Converts stack to bytes in compact binary format. Ints and floats are stored as raw arrays,
+        elements of unknown types are pickled.
+        """
+        from ufpy.serialize import to_bytes
+        return to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> Stack[T]:
+        """
+        Converts bytes from `to_bytes()` to stack. Don't use it with data from untrusted sources
+        (elements of unknown types are unpickled)
+
+        :raises ValueError: Data isn't in ufpy binary format or it is corrupted
+        :raises TypeError: Data doesn't contain stack
+        """
+        from ufpy.serialize import from_bytes
+        o = from_bytes(data)
+        if not isinstance(o, cls):
+            raise TypeError(f"Data contains '{type(o).__name__}', not '{cls.__name__}'.")
+        return o
+
     # call
     def __call__(self, func: Callable[[int, T], T2]) -> Stack[T2]:
-        elements = self.__elements.copy()
-        for i, v in enumerate(elements):
-            elements[i] = func(i, v)
+        elements = [func(i, v) for i, v in enumerate(self.__elements)]
+        if self.typecode is not None:
+            # Typecode is detected again, because results can have other type (for example, int / int is float)
+            return Stack(iterable=elements, typecode=_detect_typecode(elements) if elements else self.typecode)
         return Stack(iterable=elements)
 
     # math operations
+    def __operand(self, other: Stack[T2] | AnyCollection[T2] | np.ndarray | T2) -> tuple[object, bool]:
+        # Returns operand and True if it's a scalar. Sequences are cut to length of stack
+        if isinstance(other, Stack):
+            other = other.elements
+        if not isinstance(other, (list, tuple, array, np.ndarray)):
+            return other, True
+        if len(other) < len(self.__elements):
+            raise IndexError('Operand is shorter than stack.')
+        return other[:len(self.__elements)], False
+
+    def __math(
+        self, other: Stack[T2] | AnyCollection[T2] | np.ndarray | T2, op: Callable[[T, T2], T], ufunc: np.ufunc
+    ) -> list[T] | array:
+        # Typed stacks are computed with NumPy without copying, other stacks with `map()` (without Python closures).
+        # Scalar operand isn't repeated to list
+        other, scalar = self.__operand(other)
+        elements = self.__elements
+        if isinstance(elements, array):
+            view, operand = np.frombuffer(elements, dtype=elements.typecode), other if scalar else np.asarray(other)
+            _check_divisor(ufunc, operand)
+            result = ufunc(view, operand)
+            if not _overflows(ufunc, view, operand, result.dtype):
+                return _to_array(result, elements.typecode)
+            # Python ints don't overflow, so array raises OverflowError only if result doesn't fit in it (like push)
+            operand = np.asarray(operand).tolist()
+            return array(result.dtype.char, map(op, elements, repeat(operand) if scalar else operand))
+        return list(map(op, elements, repeat(other) if scalar else other))
+
+    def __imath(
+        self, other: Stack[T2] | AnyCollection[T2] | np.ndarray | T2, op: Callable[[T, T2], T], ufunc: np.ufunc
+    ) -> Stack[T]:
+        elements = self.__elements
+        if isinstance(elements, array):
+            operand, scalar = self.__operand(other)
+            operand = operand if scalar else np.asarray(operand)
+            _check_divisor(ufunc, operand)
+            view = np.frombuffer(elements, dtype=elements.typecode)
+            try:
+                # Result is written to the same array if its type isn't changed and it doesn't overflow
+                if not _overflows(ufunc, view, operand, view.dtype):
+                    ufunc(view, operand, out=view)
+                    return self
+            except TypeError:
+                pass
+            del view
+            self.__elements = self.__math(other, op, ufunc)
+        else:
+            elements[:] = self.__math(other, op, ufunc)
+        return self
+
+    @staticmethod
+    def __from_elements(elements: list[T] | array) -> Stack[T]:
+        new = Stack()
+        new.__elements = elements
+        return new
+
     def __add__(self, other: Stack[T2] | AnyCollection[T2] | T2) -> Stack[T | T2]:
-        other = _convert_to_stack(other)
-        result = self.copy()
-        return result.push(*other.elements)
+        return self.copy().extend(_convert_to_elements(other))
 
     def __sub__(self, other: Stack[T] | AnyCollection[T] | T) -> Stack[T]:
-        other = _convert_to_stack(other)
-        result = self.copy()
-        return result.remove(*other.elements)
+        return self.copy().remove_many(_convert_to_elements(other))
 
     def __mul__(
         self: Stack[SupportsMul], other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
     ) -> Stack[SupportsMul]:
-        other = _convert_to_list_for_mul_and_div(other, len(self))
-
-        def mul(i: int, v: SupportsMul) -> SupportsMul:
-            return v * other[i]
-
-        return self(mul)
+        return self.__from_elements(self.__math(other, mul, np.multiply))
 
     def __truediv__(
         self: Stack[SupportsTrueDiv], other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
     ) -> Stack[SupportsTrueDiv]:
-        other = _convert_to_list_for_mul_and_div(other, len(self))
+        return self.__from_elements(self.__math(other, truediv, np.true_divide))
+
+    # in-place math operations
+    def __iadd__(self, other: Stack[T] | AnyCollection[T] | T) -> Stack[T]:
+        return self.extend(_convert_to_elements(other))
 
-        def div(i: int, v: SupportsTrueDiv) -> SupportsTrueDiv:
-            return v / other[i]
+    def __isub__(self, other: Stack[T] | AnyCollection[T] | T) -> Stack[T]:
+        return self.remove_many(_convert_to_elements(other))
 
-        return self(div)
+    def __imul__(
+        self: Stack[SupportsMul], other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> Stack[SupportsMul]:
+        return self.__imath(other, mul, np.multiply)
+
+    def __itruediv__(
+        self: Stack[SupportsTrueDiv], other: Stack[NumberLiteral] | AnyCollection[NumberLiteral] | NumberLiteral
+    ) -> Stack[SupportsTrueDiv]:
+        return self.__imath(other, truediv, np.true_divide)
 
     # Booleans
     def __len__(self) -> int:
@@ -155,8 +389,11 @@ class Stack(Generic[T]):
         return not self.is_empty()
 
     def __eq__(self, other: Stack[T2]) -> bool:
-        return self.elements == other.elements
+        a, b = self.__elements, other.elements
+        if type(a) is not type(b):
+            return len(a) == len(b) and all(x == y for x, y in zip(a, b))
+        return a == b
 
     # Transform to other types
     def __repr__(self) -> str:
-        return f's{self.__elements}'
+        return f's{self.__elements if self.typecode is None else self.__elements.tolist()}'
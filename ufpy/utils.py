@@ -9,6 +9,8 @@ __all__ = (
     'get_items_for_several_keys',
     'set_items_for_several_keys',
     'del_items_for_several_keys',
+    'get_positions_from_slice_or_int',
+    'expand_values_for_several_keys',
     'is_iterable',
     'avg',
     'mdn',
@@ -16,9 +18,10 @@ __all__ = (
 )
 
 from functools import reduce
+from itertools import repeat
 from operator import mul as op_mul
 from collections import Counter
-from typing import TypeVar, Iterable, TYPE_CHECKING
+from typing import Collection, TypeVar, Iterable, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -38,7 +41,7 @@ def get_items_for_several_keys(o: SupportsGet[KT, VT], keys: AnyCollection[KT],
     """
     Get items for several keys. You can also specify default value if key is missing
     """
-    return [o.get(k, default) for k in keys]
+    return list(map(o.get, keys, repeat(default)))
 
 
 def set_items_for_several_keys(
@@ -47,6 +50,9 @@ def set_items_for_several_keys(
     """
     Set items for several keys
     """
+    if isinstance(o, dict):
+        o.update(zip(keys, values))
+        return o
     for k, v in zip(keys, values):
         o[k] = v
     return o
@@ -61,6 +67,37 @@ def del_items_for_several_keys(o: SupportsDelItem[KT, VT], keys: AnyCollection[K
     return o
 
 
+def get_positions_from_slice_or_int(key: KT | int | slice, o: Collection[KT], name: str) -> list[int] | None:
+    """
+    Get 0-based positions for 1-based int index or slice of dict-like object.
+    Returns None if key isn't index or slice (int which is a key of object isn't index).
+    `name` is used in error message
+    """
+    if isinstance(key, int) and key not in o:
+        if key == 0:
+            raise IndexError(f"You can't use 0 as index in {name}. Use 1 index instead.")
+        return [key - 1]
+    if isinstance(key, slice):
+        size = len(o)
+        start, stop, step = key.indices(size + 1)
+        if start == 0:
+            start += 1
+        if stop == size + 1:
+            stop -= 1
+        return [i - 1 for i in range(start, stop + 1, step)]
+    return None
+
+
+def expand_values_for_several_keys(value: VT | list[VT] | tuple[VT, ...], count: int) -> list[VT]:
+    """
+    Make list of values for several keys. If there are less values than keys, the last value is repeated
+    """
+    values = list(value) if isinstance(value, (list, tuple)) else [value]
+    if count > len(values):
+        values.extend([values[-1]] * (count - len(values)))
+    return values
+
+
 def is_iterable(o: object) -> bool:
     """
     Check that object is iterable